@@ -0,0 +1,213 @@
+# content/ab_results.py
+
+"""Hourly A/B test rollups and the statistics served from them.
+
+:class:`~content.models.VariantHourlyRollup` rows are kept current as the
+visit counts buffered by ``variant_visit_buffer`` are flushed
+(:func:`add_visits`) and as conversions are recorded (:func:`add_conversion`),
+so reading a test's results sums a few hundred hourly rows instead of
+counting raw visits.
+:func:`rebuild_rollups` recomputes them from ``VariantVisit`` when needed,
+one test per transaction. Hours within ``REBUILD_GRACE`` of now are left
+alone, because counts for visits already saved may still be buffered. Increments and rebuilds both lock the variant rows
+they touch, so a rebuild never races a flush or conversion: increments wait
+for it and then add to the rebuilt rows. Migration 0020 backfills existing
+visits the same way.
+
+Each variant is compared with the control (the first variant created) using
+a two-proportion z-test; conversion rates carry Wilson score intervals.
+"""
+
+import math
+from collections import Counter, defaultdict
+from datetime import timedelta, timezone as dt_timezone
+from statistics import NormalDist
+
+from django.db import IntegrityError, transaction
+from django.db.models import Count, F, Sum
+from django.db.models.functions import TruncHour
+from django.utils import timezone
+
+from .models import ABTest, Variant, VariantHourlyRollup, VariantVisit
+
+DEFAULT_ALPHA = 0.05
+# Longer than a visit count normally waits in an ingest buffer.
+REBUILD_GRACE = timedelta(minutes=10)
+
+
+def truncate_hour(moment):
+    """Return the start of the UTC hour containing ``moment``."""
+    return moment.astimezone(dt_timezone.utc).replace(minute=0, second=0, microsecond=0)
+
+
+def _lock_variants(queryset):
+    """Lock variant rows against a concurrent rebuild; call inside a transaction."""
+    list(queryset.select_for_update().order_by('pk').values_list('pk', flat=True))
+
+
+def _increment(variant_id, hour, field, amount):
+    lookup = {'variant_id': variant_id, 'hour': hour}
+    if VariantHourlyRollup.objects.filter(**lookup).update(**{field: F(field) + amount}):
+        return
+    try:
+        with transaction.atomic():
+            VariantHourlyRollup.objects.create(**lookup, **{field: amount})
+    except IntegrityError:
+        # Another worker created the row first.
+        VariantHourlyRollup.objects.filter(**lookup).update(**{field: F(field) + amount})
+
+
+def add_visits(visits):
+    """Count newly inserted ``VariantVisit`` instances into their hours."""
+    counts = Counter((visit.variant_id, truncate_hour(visit.timestamp)) for visit in visits)
+    _lock_variants(Variant.objects.filter(pk__in={variant_id for variant_id, _ in counts}))
+    for (variant_id, hour), amount in counts.items():
+        _increment(variant_id, hour, 'visits', amount)
+
+
+def add_conversion(variant_id, moment):
+    _lock_variants(Variant.objects.filter(pk=variant_id))
+    _increment(variant_id, truncate_hour(moment), 'conversions', 1)
+
+
+def count_hours(visits):
+    """Return ``{(variant_id, hour): {'visits': n, 'conversions': n}}`` for ``visits``."""
+    counts = defaultdict(lambda: {'visits': 0, 'conversions': 0})
+    grouped_visits = (
+        visits.annotate(bucket=TruncHour('timestamp', tzinfo=dt_timezone.utc))
+        .values('variant_id', 'bucket')
+        .annotate(total=Count('id'))
+        .order_by()
+    )
+    for row in grouped_visits:
+        counts[(row['variant_id'], row['bucket'])]['visits'] = row['total']
+    grouped_conversions = (
+        visits.filter(converted=True, conversion_timestamp__isnull=False)
+        .annotate(bucket=TruncHour('conversion_timestamp', tzinfo=dt_timezone.utc))
+        .values('variant_id', 'bucket')
+        .annotate(total=Count('id'))
+        .order_by()
+    )
+    for row in grouped_conversions:
+        counts[(row['variant_id'], row['bucket'])]['conversions'] = row['total']
+    return counts
+
+
+def rebuild_rollups(tests=None):
+    """Recompute rollups from raw visits.
+
+    Each test is rebuilt in its own transaction while its variant rows are
+    locked, so visit flushes and conversions for it wait and then count on
+    top of the rebuilt rows instead of being lost or counted twice. Hours
+    starting within ``REBUILD_GRACE`` of now keep their live counts.
+
+    Args:
+        tests: Optional iterable of ``ABTest`` to limit the rebuild to
+
+    Returns:
+        int: Number of rollup rows written
+    """
+    if tests is None:
+        tests = ABTest.objects.all()
+
+    cutoff = truncate_hour(timezone.now() - REBUILD_GRACE)
+    written = 0
+    for test in tests:
+        with transaction.atomic():
+            _lock_variants(Variant.objects.filter(ab_test=test))
+            counts = {
+                key: totals
+                for key, totals in count_hours(
+                    VariantVisit.objects.filter(variant__ab_test=test)
+                ).items()
+                if key[1] < cutoff
+            }
+            VariantHourlyRollup.objects.filter(variant__ab_test=test, hour__lt=cutoff).delete()
+            VariantHourlyRollup.objects.bulk_create(
+                [
+                    VariantHourlyRollup(variant_id=variant_id, hour=hour, **totals)
+                    for (variant_id, hour), totals in counts.items()
+                ],
+                batch_size=1000,
+            )
+        written += len(counts)
+    return written
+
+
+def wilson_interval(successes, trials, alpha=DEFAULT_ALPHA):
+    """Return the Wilson score interval for ``successes / trials``."""
+    if not trials:
+        return 0.0, 0.0
+    z = NormalDist().inv_cdf(1 - alpha / 2)
+    rate = successes / trials
+    denominator = 1 + z * z / trials
+    centre = (rate + z * z / (2 * trials)) / denominator
+    margin = z * math.sqrt(rate * (1 - rate) / trials + z * z / (4 * trials * trials)) / denominator
+    return max(0.0, centre - margin), min(1.0, centre + margin)
+
+
+def two_proportion_z_test(control_conversions, control_visits, conversions, visits):
+    """Return ``(z, two-sided p-value)`` comparing a variant with the control.
+
+    Returns ``(None, None)`` while either side has no visits.
+    """
+    if not control_visits or not visits:
+        return None, None
+    pooled = (control_conversions + conversions) / (control_visits + visits)
+    standard_error = math.sqrt(pooled * (1 - pooled) * (1 / control_visits + 1 / visits))
+    if not standard_error:
+        return 0.0, 1.0
+    z = (conversions / visits - control_conversions / control_visits) / standard_error
+    return z, 2 * (1 - NormalDist().cdf(abs(z)))
+
+
+def summarize_test(test, alpha=DEFAULT_ALPHA):
+    """Return per-variant results for ``test`` computed from its rollups."""
+    variants = sorted(test.variants.all(), key=lambda variant: variant.pk)
+    totals = {
+        row['variant']: row
+        for row in VariantHourlyRollup.objects.filter(variant__ab_test=test)
+        .values('variant')
+        .annotate(visits=Sum('visits'), conversions=Sum('conversions'))
+        .order_by()
+    }
+
+    results = []
+    control = None
+    for variant in variants:
+        row = totals.get(variant.pk, {})
+        visits = row.get('visits') or 0
+        conversions = row.get('conversions') or 0
+        low, high = wilson_interval(conversions, visits, alpha)
+        result = {
+            'id': variant.pk,
+            'name': variant.name,
+            'traffic_percentage': variant.traffic_percentage,
+            'visits': visits,
+            'conversions': conversions,
+            'conversion_rate': conversions / visits if visits else 0.0,
+            'confidence_interval': [low, high],
+            'is_control': control is None,
+        }
+        if control is None:
+            control = result
+        else:
+            z, p_value = two_proportion_z_test(
+                control['conversions'], control['visits'], conversions, visits
+            )
+            control_rate = control['conversion_rate']
+            result.update(
+                z_score=z,
+                p_value=p_value,
+                significant=p_value is not None and p_value < alpha,
+                lift=(result['conversion_rate'] - control_rate) / control_rate
+                if control_rate
+                else None,
+            )
+        results.append(result)
+
+    return {
+        'test': test.pk,
+        'confidence_level': 1 - alpha,
+        'variants': results,
+    }
@@ -0,0 +1,201 @@
+# content/ab_testing.py
+
+"""Deterministic A/B variant assignment with cached test configuration.
+
+Landing page traffic arrives in bursts, so assignment must not touch the
+database or the session. Active test configuration is loaded once per worker
+into :class:`ActiveTestCache` and reloaded when :data:`ab_test_version` moves
+(bumped by the ``ABTest``/``Variant`` signal handlers) or after
+``CONFIG_TTL`` seconds.
+
+A visitor is placed in a variant by hashing ``"<test id>:<visitor id>"`` into
+``[0, sum(traffic_percentage))`` and walking the variants' cumulative
+percentages, so the same visitor always gets the same variant in every worker
+and the assignment can be recomputed when a conversion is recorded.
+
+The site and the API are on different hosts, so a browser only sends the
+visitor cookie on credentialed requests (``credentials: 'include'``); it is
+set with ``SameSite=None; Secure`` outside ``DEBUG`` for that reason. Clients
+that can't send cookies, such as the frontend's server-side fetches, must
+forward the id in the ``X-Visitor-Id`` header (allowed and exposed through
+CORS); new ids are returned in the same header. Requests carrying neither
+get a fresh id, so their conversions can't be matched to a visit.
+
+Options come from the ``AB_TESTING`` setting (``CONFIG_TTL``,
+``VISITOR_COOKIE``, ``VISITOR_COOKIE_MAX_AGE``).
+"""
+
+import hashlib
+import re
+import threading
+import time
+import uuid
+from dataclasses import dataclass
+
+from django.conf import settings
+from django.utils import timezone
+
+from core.cache import CacheVersion
+
+from .models import ABTest
+
+DEFAULTS = {
+    'CONFIG_TTL': 60,
+    'VISITOR_COOKIE': 'nn_vid',
+    'VISITOR_COOKIE_MAX_AGE': 365 * 24 * 60 * 60,
+}
+VISITOR_HEADER = 'HTTP_X_VISITOR_ID'
+VISITOR_PARAM = 'visitor_id'
+VISITOR_ID_RE = re.compile(r'^[A-Za-z0-9_.:-]{8,100}$')
+
+ab_test_version = CacheVersion('content.ab_tests')
+
+
+def get_option(name):
+    return {**DEFAULTS, **getattr(settings, 'AB_TESTING', {})}[name]
+
+
+@dataclass(frozen=True)
+class VariantConfig:
+    id: int
+    name: str
+    content: dict
+    traffic_percentage: int
+
+
+@dataclass(frozen=True)
+class ABTestConfig:
+    """Immutable snapshot of an A/B test and its variants."""
+
+    id: int
+    landing_page_id: int
+    start_date: object
+    end_date: object
+    variants: tuple
+
+    @classmethod
+    def from_instance(cls, test):
+        variants = sorted(test.variants.all(), key=lambda variant: variant.pk)
+        return cls(
+            id=test.pk,
+            landing_page_id=test.landing_page_id,
+            start_date=test.start_date,
+            end_date=test.end_date,
+            variants=tuple(
+                VariantConfig(v.pk, v.name, v.content, v.traffic_percentage) for v in variants
+            ),
+        )
+
+    def is_running(self, now):
+        if self.start_date is None or self.start_date > now:
+            return False
+        return self.end_date is None or self.end_date > now
+
+    def assign(self, visitor_id):
+        """Return the variant ``visitor_id`` falls into, or ``None``."""
+        weighted = [v for v in self.variants if v.traffic_percentage > 0]
+        total = sum(v.traffic_percentage for v in weighted)
+        if not total:
+            return None
+        digest = hashlib.sha256(f'{self.id}:{visitor_id}'.encode()).digest()
+        bucket = int.from_bytes(digest[:8], 'big') % total
+        cumulative = 0
+        for variant in weighted:
+            cumulative += variant.traffic_percentage
+            if bucket < cumulative:
+                return variant
+        return weighted[-1]
+
+
+class ActiveTestCache:
+    """Per-process map of landing page id to its running test."""
+
+    def __init__(self):
+        self._tests = {}
+        self._version = None
+        self._loaded_at = 0.0
+        self._lock = threading.Lock()
+
+    def _is_stale(self):
+        if time.monotonic() - self._loaded_at >= get_option('CONFIG_TTL'):
+            return True
+        return self._version != ab_test_version.get()
+
+    def _load(self):
+        version = ab_test_version.get()
+        tests = {}
+        queryset = (
+            ABTest.objects.filter(is_active=True, start_date__isnull=False)
+            .prefetch_related('variants')
+            .order_by('-created_at', '-id')
+        )
+        for test in queryset:
+            # Newest active test wins, as in the original lookup.
+            tests.setdefault(test.landing_page_id, []).append(ABTestConfig.from_instance(test))
+        self._tests = tests
+        self._version = version
+        self._loaded_at = time.monotonic()
+
+    def get_running_test(self, landing_page_id):
+        if self._is_stale():
+            with self._lock:
+                if self._is_stale():
+                    self._load()
+        now = timezone.now()
+        for test in self._tests.get(landing_page_id, ()):
+            if test.is_running(now):
+                return test
+        return None
+
+    def clear(self):
+        with self._lock:
+            self._tests = {}
+            self._version = None
+            self._loaded_at = 0.0
+
+
+active_tests = ActiveTestCache()
+
+
+def assign_variant(landing_page_id, visitor_id):
+    """Return the ``VariantConfig`` to show, or ``None`` without a running test."""
+    test = active_tests.get_running_test(landing_page_id)
+    if test is None:
+        return None
+    return test.assign(visitor_id)
+
+
+def get_visitor_id(request):
+    """Return ``(visitor_id, is_new)`` for ``request``.
+
+    The id is read from the ``X-Visitor-Id`` header, the visitor cookie or the
+    ``visitor_id`` query parameter, in that order. A new random id is made when
+    none is present; callers should then persist it with
+    :func:`set_visitor_cookie`.
+    """
+    candidates = (
+        request.META.get(VISITOR_HEADER),
+        request.COOKIES.get(get_option('VISITOR_COOKIE')),
+        request.GET.get(VISITOR_PARAM),
+    )
+    for candidate in candidates:
+        if candidate and VISITOR_ID_RE.match(candidate):
+            return candidate, False
+    return uuid.uuid4().hex, True
+
+
+def set_visitor_cookie(response, visitor_id):
+    """Persist a new ``visitor_id`` in the visitor cookie and ``X-Visitor-Id``."""
+    secure = not settings.DEBUG
+    response.set_cookie(
+        get_option('VISITOR_COOKIE'),
+        visitor_id,
+        max_age=get_option('VISITOR_COOKIE_MAX_AGE'),
+        # Cross-site requests from the frontend only carry SameSite=None
+        # cookies, which browsers reject without Secure.
+        samesite='None' if secure else 'Lax',
+        secure=secure,
+        httponly=True,
+    )
+    response['X-Visitor-Id'] = visitor_id
+    return response
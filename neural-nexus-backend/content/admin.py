@@ -13,6 +13,7 @@ Models registered:
     LandingPage: Campaign landing pages
     ABTest: A/B testing configuration
     VariantVisit: A/B test variant tracking
+    TrackingEvent: Frontend analytics events
 
 Typical usage example:
     from django.contrib import admin
@@ -24,10 +25,11 @@ Typical usage example:
 """
 
 from django.contrib import admin
+from .counts import annotate_published_case_counts
 from .models import (
     Category, BlogPost, Resource, LeadMagnet, BlogAnalytics,
     Campaign, LandingPage, ABTest, Variant, VariantVisit,
-    CaseStudyCategory, CaseStudy  # Added CaseStudyCategory here
+    CaseStudyCategory, CaseStudy, TrackingEvent  # Added CaseStudyCategory here
 )
 
 @admin.register(Category)
@@ -192,9 +194,13 @@ class CaseStudyCategoryAdmin(admin.ModelAdmin):
     search_fields = ['name', 'description']
     prepopulated_fields = {'slug': ('name',)}
 
+    def get_queryset(self, request):
+        return annotate_published_case_counts(super().get_queryset(request))
+
     def case_count(self, obj):
-        return obj.case_studies.count()
-    case_count.short_description = 'Number of Cases'
+        return obj.published_case_count
+    case_count.short_description = 'Published Cases'
+    case_count.admin_order_field = 'published_case_count'
 
 @admin.register(CaseStudy)
 class CaseStudyAdmin(admin.ModelAdmin):
@@ -206,9 +212,10 @@ class CaseStudyAdmin(admin.ModelAdmin):
     search_fields = ['title', 'client_name', 'challenge', 'solution']
     prepopulated_fields = {'slug': ('title',)}
     readonly_fields = ['view_count', 'created_at', 'updated_at']
+    filter_horizontal = ['tags']
     fieldsets = (
         ('Basic Information', {
-            'fields': ('title', 'slug', 'industry', 'client_name', 'category')
+            'fields': ('title', 'slug', 'industry', 'client_name', 'category', 'tags')
         }),
         ('Content', {
             'fields': ('challenge', 'solution', 'results',
@@ -232,3 +239,24 @@ class CaseStudyAdmin(admin.ModelAdmin):
         if not change:  # If creating new object
             obj.created_by = request.user
         super().save_model(request, obj, form, change)
+
+
+@admin.register(TrackingEvent)
+class TrackingEventAdmin(admin.ModelAdmin):
+    """Read-only admin for ingested tracking events.
+
+        Attributes:
+            list_display: Event name, session and timing fields
+            list_filter: Event name and source filters
+            search_fields: Session and anonymous visitor ids
+        """
+    list_display = ['event_name', 'path', 'session_id', 'occurred_at', 'received_at']
+    list_filter = ['event_name', 'source']
+    search_fields = ['session_id', 'anonymous_id', 'path']
+    date_hierarchy = 'occurred_at'
+
+    def has_add_permission(self, request):
+        return False
+
+    def has_change_permission(self, request, obj=None):
+        return False
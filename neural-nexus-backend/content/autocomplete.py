@@ -0,0 +1,86 @@
+# content/autocomplete.py
+
+"""Typeahead suggestions for services, features, posts, case studies and tags.
+
+:data:`suggestion_index` is a :class:`core.prefix_index.SharedPrefixIndex`
+over the names and titles of active services, their features, published blog
+posts and case studies, and tags. Each worker answers lookups from its own
+copy of the index. The post_save/post_delete handlers in
+:mod:`content.signals` bump its version once the transaction commits; the
+first worker to see the new version rebuilds the index, with one query per
+source, and stores it in the cache for the others.
+
+Without a shared cache (see ``core/settings_prod.py``) a bump reaches only
+the saving worker; the others pick up changes within ``MAX_AGE`` seconds.
+
+Options come from the ``AUTOCOMPLETE`` setting (``CHECK_INTERVAL``,
+``TIMEOUT``, ``MAX_AGE``, ``MAX_RESULTS``).
+"""
+
+from django.conf import settings
+from django.db import transaction
+
+from core.prefix_index import SharedPrefixIndex, Suggestion
+from services.models import Service, ServiceFeature
+
+from .models import BlogPost, CaseStudy, Tag
+
+DEFAULTS = {
+    'CHECK_INTERVAL': 1.0,
+    'TIMEOUT': 24 * 60 * 60,
+    'MAX_AGE': 300,
+    'MAX_RESULTS': 20,
+}
+# Among matches of equal quality, services rank above content and tags.
+KIND_WEIGHTS = {
+    'service': 4,
+    'post': 3,
+    'case-study': 3,
+    'tag': 2,
+    'feature': 1,
+}
+KINDS = tuple(KIND_WEIGHTS)
+INDEXED_MODELS = (Service, ServiceFeature, BlogPost, CaseStudy, Tag)
+
+
+def get_option(name):
+    return {**DEFAULTS, **getattr(settings, 'AUTOCOMPLETE', {})}[name]
+
+
+def load_suggestions():
+    """Read every suggestable string with one query per source."""
+    sources = (
+        ('service', Service.objects.filter(is_active=True).values_list('name', 'slug')),
+        (
+            'feature',
+            ServiceFeature.objects.filter(service__is_active=True).values_list(
+                'name', 'service__slug'
+            ),
+        ),
+        ('post', BlogPost.objects.filter(status='PUBLISHED').values_list('title', 'slug')),
+        ('case-study', CaseStudy.objects.filter(status='PUBLISHED').values_list('title', 'slug')),
+        ('tag', Tag.objects.values_list('name', 'slug')),
+    )
+    for kind, rows in sources:
+        for text, slug in rows.order_by().iterator():
+            yield Suggestion(kind, text, slug, KIND_WEIGHTS[kind])
+
+
+suggestion_index = SharedPrefixIndex(
+    'content.autocomplete',
+    build=load_suggestions,
+    check_interval=get_option('CHECK_INTERVAL'),
+    timeout=get_option('TIMEOUT'),
+    max_age=get_option('MAX_AGE'),
+)
+
+
+def suggest(query, limit=10, kinds=None):
+    """Return ranked :class:`~core.prefix_index.Suggestion` objects for ``query``."""
+    limit = max(0, min(limit, get_option('MAX_RESULTS')))
+    return suggestion_index.get().search(query, limit=limit, kinds=kinds)
+
+
+def schedule_invalidation():
+    """Invalidate the index once the current transaction commits."""
+    transaction.on_commit(suggestion_index.invalidate)
@@ -0,0 +1,261 @@
+# content/counters.py
+
+"""Write-behind counters for hot integer columns such as ``view_count``.
+
+Incrementing a counter with ``UPDATE ... SET view_count = view_count + 1`` on
+every page view serialises concurrent requests on the same row. The
+:class:`CounterBuffer` accumulates increments instead and writes them in one
+batched ``UPDATE`` per model and column when it flushes.
+
+Two storage modes are available through the ``CONTENT_COUNTERS`` setting:
+
+``process``
+    Deltas are held in worker memory. A hard crash loses at most
+    ``MAX_PENDING`` increments or ``FLUSH_INTERVAL`` seconds of traffic per
+    worker; graceful exits flush first.
+
+``cache``
+    Deltas are accumulated with atomic ``incr`` in Django's cache, so they are
+    shared between workers and survive worker restarts for as long as the cache
+    keeps them. ``manage.py flush_counters --sweep`` picks up deltas left by
+    workers that died before flushing.
+
+A flush happens when ``MAX_PENDING`` increments are buffered and, with
+``BACKGROUND`` (the default), every ``FLUSH_INTERVAL`` seconds from a daemon
+thread, so an idle worker does not hold its deltas. Without it, flushes only
+happen on a later increment or at exit, which is what tests use.
+
+Typical usage example:
+    from content.counters import counter_buffer
+
+    counter_buffer.increment(CaseStudy, case_study.pk, 'view_count')
+"""
+
+import atexit
+import logging
+import os
+import threading
+import time
+from collections import defaultdict
+
+from django.conf import settings
+from django.core.cache import caches
+from django.db import DatabaseError, close_old_connections
+from django.db.models import Case, F, IntegerField, Value, When
+
+from .models import BlogPost, CaseStudy
+
+logger = logging.getLogger(__name__)
+
+DEFAULTS = {
+    'BACKEND': 'process',
+    'CACHE_ALIAS': 'default',
+    'FLUSH_INTERVAL': 30,
+    'MAX_PENDING': 500,
+    'BACKGROUND': True,
+}
+
+
+class CounterBuffer:
+    """Buffers counter increments and flushes them in batched updates.
+
+    Attributes:
+        backend (str): ``process`` or ``cache``
+        flush_interval (float): Seconds between automatic flushes
+        max_pending (int): Number of buffered increments forcing a flush
+        background (bool): Whether a daemon thread flushes every interval
+    """
+
+    key_prefix = 'counter'
+
+    def __init__(self, backend='process', cache_alias='default', flush_interval=30,
+                 max_pending=500, background=False):
+        if backend not in ('process', 'cache'):
+            raise ValueError(f"Unknown counter backend '{backend}'")
+        self.backend = backend
+        self.cache_alias = cache_alias
+        self.flush_interval = flush_interval
+        self.max_pending = max_pending
+        self.background = background
+        self._registry = {}
+        self._fields = defaultdict(set)
+        self._deltas = defaultdict(int)
+        self._buffered = 0
+        self._last_flush = time.monotonic()
+        self._lock = threading.Lock()
+        self._start_lock = threading.Lock()
+        self._thread = None
+        self._pid = None
+
+    @classmethod
+    def from_settings(cls):
+        options = {**DEFAULTS, **getattr(settings, 'CONTENT_COUNTERS', {})}
+        return cls(
+            backend=options['BACKEND'],
+            cache_alias=options['CACHE_ALIAS'],
+            flush_interval=options['FLUSH_INTERVAL'],
+            max_pending=options['MAX_PENDING'],
+            background=options['BACKGROUND'],
+        )
+
+    @property
+    def cache(self):
+        return caches[self.cache_alias]
+
+    def register(self, model, field):
+        """Declare ``model.field`` as a buffered counter so sweeps cover it."""
+        self._registry[model._meta.label] = model
+        self._fields[model._meta.label].add(field)
+        return self
+
+    def _key(self, model, pk, field):
+        return f'{self.key_prefix}:{model._meta.label_lower}:{field}:{pk}'
+
+    def increment(self, model, pk, field, amount=1):
+        """Record ``amount`` more for ``model.field`` on row ``pk``."""
+        self.register(model, field)
+        if self.background:
+            self._ensure_worker()
+        target = (model._meta.label, field, pk)
+        if self.backend == 'cache':
+            key = self._key(model, pk, field)
+            if not self.cache.add(key, amount, timeout=None):
+                self.cache.incr(key, amount)
+        with self._lock:
+            # In cache mode the local dict only tracks which keys are dirty.
+            self._deltas[target] += amount
+            self._buffered += 1
+            due = (
+                self._buffered >= self.max_pending
+                or time.monotonic() - self._last_flush >= self.flush_interval
+            )
+        if due:
+            self.flush()
+
+    def pending(self, model, pk, field):
+        """Return increments for ``model.field`` on ``pk`` not yet written."""
+        if self.backend == 'cache':
+            return self.cache.get(self._key(model, pk, field), 0)
+        with self._lock:
+            return self._deltas.get((model._meta.label, field, pk), 0)
+
+    def with_pending(self, instance, field):
+        """Add pending increments to ``instance.field`` in place and return it."""
+        current = getattr(instance, field) or 0
+        setattr(instance, field, current + self.pending(type(instance), instance.pk, field))
+        return instance
+
+    def flush(self, sweep=False):
+        """Write buffered increments to the database.
+
+        Args:
+            sweep: In cache mode, also collect deltas for every row of the
+                registered models, including ones buffered by other workers.
+
+        Returns:
+            int: Number of rows updated
+        """
+        with self._lock:
+            targets, self._deltas = self._deltas, defaultdict(int)
+            self._buffered = 0
+            self._last_flush = time.monotonic()
+
+        if self.backend == 'cache':
+            if sweep:
+                targets = self._sweep_targets(targets)
+            deltas = self._claim_from_cache(targets)
+        else:
+            deltas = targets
+
+        grouped = defaultdict(dict)
+        for (label, field, pk), amount in deltas.items():
+            if amount:
+                grouped[(label, field)][pk] = amount
+
+        updated = 0
+        for (label, field), amounts in grouped.items():
+            try:
+                updated += self._apply(self._registry[label], field, amounts)
+            except DatabaseError:
+                logger.exception("Failed to flush %s.%s counters", label, field)
+                self._restore(label, field, amounts)
+        return updated
+
+    def _ensure_worker(self):
+        # Threads do not survive fork(), so a worker inherited from the master
+        # process has to start its own.
+        if self._thread is not None and self._thread.is_alive() and self._pid == os.getpid():
+            return
+        with self._start_lock:
+            if self._thread is None or not self._thread.is_alive() or self._pid != os.getpid():
+                self._pid = os.getpid()
+                self._thread = threading.Thread(
+                    target=self._run, name='counter-flush', daemon=True
+                )
+                self._thread.start()
+
+    def _run(self):
+        while True:
+            time.sleep(self.flush_interval)
+            with self._lock:
+                idle = not self._deltas
+            if idle:
+                continue
+            try:
+                self.flush()
+            except Exception:
+                logger.exception("Counter flush failed")
+            finally:
+                close_old_connections()
+
+    def _apply(self, model, field, amounts):
+        delta = Case(
+            *[When(pk=pk, then=Value(amount)) for pk, amount in amounts.items()],
+            default=Value(0),
+            output_field=IntegerField(),
+        )
+        return model.objects.filter(pk__in=list(amounts)).update(**{field: F(field) + delta})
+
+    def _restore(self, label, field, amounts):
+        model = self._registry[label]
+        for pk, amount in amounts.items():
+            if self.backend == 'cache':
+                key = self._key(model, pk, field)
+                if not self.cache.add(key, amount, timeout=None):
+                    self.cache.incr(key, amount)
+            with self._lock:
+                self._deltas[(label, field, pk)] += amount
+
+    def _sweep_targets(self, targets):
+        targets = dict(targets)
+        for label, model in self._registry.items():
+            for pk in model.objects.values_list('pk', flat=True).iterator():
+                for field in self._fields[label]:
+                    targets.setdefault((label, field, pk), 0)
+        return targets
+
+    def _claim_from_cache(self, targets):
+        """Atomically move deltas out of the cache, keeping concurrent increments."""
+        keys = {
+            self._key(self._registry[label], pk, field): (label, field, pk)
+            for (label, field, pk) in targets
+        }
+        claimed = {}
+        for key, value in self.cache.get_many(list(keys)).items():
+            if not value:
+                continue
+            try:
+                self.cache.decr(key, value)
+            except ValueError:
+                # Evicted between get_many() and decr(); nothing left to claim.
+                continue
+            claimed[keys[key]] = value
+        return claimed
+
+
+counter_buffer = (
+    CounterBuffer.from_settings()
+    .register(BlogPost, 'view_count')
+    .register(CaseStudy, 'view_count')
+)
+atexit.register(counter_buffer.flush)
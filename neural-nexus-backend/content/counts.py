@@ -0,0 +1,44 @@
+# content/counts.py
+
+"""Grouped counts used by category navigation.
+
+:func:`published_case_counts` computes the number of published case studies
+for every category with one grouped query and caches the result until a
+case study is saved or deleted, when the signal handlers bump
+:data:`case_count_version`. Category querysets that list many categories,
+or need to sort by the count, use :func:`annotate_published_case_counts`
+instead.
+"""
+
+from django.core.cache import cache
+from django.db.models import Count, Q
+
+from core.cache import CacheVersion
+
+from .models import CaseStudy
+
+CACHE_TIMEOUT = 300
+
+case_count_version = CacheVersion('content.case_counts')
+
+
+def published_case_counts():
+    """Return ``{category_id: published case study count}``."""
+    key = f'case_counts:{case_count_version.get()}'
+    counts = cache.get(key)
+    if counts is None:
+        counts = dict(
+            CaseStudy.objects.filter(status='PUBLISHED', category__isnull=False)
+            .values_list('category')
+            .annotate(total=Count('id'))
+            .order_by()
+        )
+        cache.set(key, counts, CACHE_TIMEOUT)
+    return counts
+
+
+def annotate_published_case_counts(queryset):
+    """Annotate categories in ``queryset`` with ``published_case_count``."""
+    return queryset.annotate(
+        published_case_count=Count('case_studies', filter=Q(case_studies__status='PUBLISHED'))
+    )
@@ -0,0 +1,264 @@
+# content/ingest.py
+
+"""Batched, write-behind ingestion for high-volume append-only rows.
+
+Used for tracking events and A/B test visit counts. The frontend reports
+several tracking events per page view. Writing each row with its own
+``INSERT`` inside the request ties request latency to the database, so
+:class:`BulkInsertBuffer` queues unsaved model instances in a bounded
+in-memory queue and writes them with ``bulk_create``. A flush happens when
+``BATCH_SIZE`` rows are waiting or ``FLUSH_INTERVAL`` seconds have passed.
+
+Landing page visits are saved in the request, because a conversion posted to
+another worker has to find them. :class:`SavedRowBuffer` batches only the
+hourly rollup counts derived from them.
+
+The queue never blocks the request thread: when it is full,
+:meth:`BulkInsertBuffer.submit` raises :class:`IngestQueueFull`. The tracking
+view answers ``429 Too Many Requests`` so clients back off; the landing page
+view counts its visit into the rollups directly instead.
+
+Options come from the ``TRACKING_INGEST`` setting:
+
+``MAX_QUEUE``
+    Rows held per worker before new rows are rejected.
+``BATCH_SIZE``
+    Rows written per ``bulk_create`` and the size that triggers a flush.
+``FLUSH_INTERVAL``
+    Seconds between time-based flushes.
+``BACKGROUND``
+    Flush from a daemon thread (default). When false, flushes run inline in
+    whichever request crosses a threshold, which is what tests use.
+``MAX_ATTEMPTS``
+    Consecutive failed flushes of a batch before it is split to isolate the
+    rows the database rejects, which are logged and dropped.
+
+Rows still queued when a worker dies without running its exit hooks are lost;
+graceful exits flush first.
+
+Typical usage example:
+    from content.ingest import tracking_buffer
+
+    tracking_buffer.submit(TrackingEvent(event_name='page_view', ...))
+"""
+
+import atexit
+import logging
+import os
+import queue
+import threading
+import time
+
+from django.conf import settings
+from django.db import DatabaseError, close_old_connections, transaction
+
+from . import ab_results
+from .models import TrackingEvent, VariantVisit
+
+logger = logging.getLogger(__name__)
+
+DEFAULTS = {
+    'MAX_QUEUE': 10000,
+    'BATCH_SIZE': 500,
+    'FLUSH_INTERVAL': 2,
+    'BACKGROUND': True,
+    'MAX_ATTEMPTS': 3,
+}
+
+
+class IngestQueueFull(Exception):
+    """Raised when a buffer cannot accept more rows without blocking."""
+
+    def __init__(self, retry_after):
+        super().__init__('Ingest queue is full')
+        self.retry_after = retry_after
+
+
+class BulkInsertBuffer:
+    """Queues unsaved instances of one model and inserts them in batches.
+
+    Attributes:
+        model: Model class whose instances are buffered
+        max_queue (int): Capacity of the queue
+        batch_size (int): Rows per ``bulk_create`` call
+        flush_interval (float): Seconds between time-based flushes
+        background (bool): Whether a daemon thread performs the flushes
+        max_attempts (int): Failed flushes of a batch before bad rows are
+            isolated and dropped
+        after_insert: Optional callable receiving each inserted batch, run
+            in the same transaction as the insert
+    """
+
+    def __init__(self, model, max_queue=10000, batch_size=500, flush_interval=2,
+                 background=True, after_insert=None, max_attempts=3):
+        self.model = model
+        self.max_queue = max_queue
+        self.batch_size = batch_size
+        self.flush_interval = flush_interval
+        self.background = background
+        self.after_insert = after_insert
+        self.max_attempts = max_attempts
+        self._failures = 0
+        self._queue = queue.Queue(maxsize=max_queue)
+        self._wakeup = threading.Event()
+        self._flush_lock = threading.Lock()
+        self._start_lock = threading.Lock()
+        self._thread = None
+        self._pid = None
+        self._last_flush = time.monotonic()
+
+    @classmethod
+    def from_settings(cls, model, setting='TRACKING_INGEST', **kwargs):
+        options = {**DEFAULTS, **getattr(settings, setting, {})}
+        return cls(
+            model,
+            max_queue=options['MAX_QUEUE'],
+            batch_size=options['BATCH_SIZE'],
+            flush_interval=options['FLUSH_INTERVAL'],
+            background=options['BACKGROUND'],
+            max_attempts=options['MAX_ATTEMPTS'],
+            **kwargs,
+        )
+
+    def pending(self):
+        """Return the number of rows waiting to be written."""
+        return self._queue.qsize()
+
+    def submit(self, instance):
+        """Queue ``instance`` for insertion without blocking.
+
+        Raises:
+            IngestQueueFull: If the queue is at capacity.
+        """
+        if self.background:
+            self._ensure_worker()
+        try:
+            self._queue.put_nowait(instance)
+        except queue.Full:
+            raise IngestQueueFull(retry_after=max(1, round(self.flush_interval)))
+
+        due = (
+            self._queue.qsize() >= self.batch_size
+            or time.monotonic() - self._last_flush >= self.flush_interval
+        )
+        if due:
+            if self.background:
+                self._wakeup.set()
+            else:
+                self.flush()
+
+    def flush(self):
+        """Write every queued row to the database.
+
+        Returns:
+            int: Number of rows inserted
+        """
+        written = 0
+        with self._flush_lock:
+            self._last_flush = time.monotonic()
+            while True:
+                batch = self._drain()
+                if not batch:
+                    break
+                try:
+                    with transaction.atomic():
+                        self.write(batch)
+                except DatabaseError:
+                    logger.exception(
+                        "Failed to insert %d %s rows", len(batch), self.model._meta.label
+                    )
+                    self._failures += 1
+                    if self._failures < self.max_attempts:
+                        self._requeue(batch)
+                        break
+                    # Retrying the same batch will not help; keep what the
+                    # database accepts and drop the rest.
+                    written += self._write_isolating(batch)
+                else:
+                    written += len(batch)
+                self._failures = 0
+        return written
+
+    def _write_isolating(self, batch):
+        """Write ``batch`` in halves until the rejected rows are found and dropped."""
+        try:
+            with transaction.atomic():
+                self.write(batch)
+            return len(batch)
+        except DatabaseError:
+            if len(batch) == 1:
+                logger.error("Dropped a %s row the database rejected", self.model._meta.label)
+                return 0
+        middle = len(batch) // 2
+        return self._write_isolating(batch[:middle]) + self._write_isolating(batch[middle:])
+
+    def write(self, batch):
+        """Store one batch; runs inside the flush transaction."""
+        self.model.objects.bulk_create(batch, batch_size=self.batch_size)
+        if self.after_insert is not None:
+            self.after_insert(batch)
+
+    def _drain(self):
+        batch = []
+        while len(batch) < self.batch_size:
+            try:
+                batch.append(self._queue.get_nowait())
+            except queue.Empty:
+                break
+        return batch
+
+    def _requeue(self, batch):
+        """Put a failed batch back for the next flush, dropping what no longer fits."""
+        for position, instance in enumerate(batch):
+            try:
+                self._queue.put_nowait(instance)
+            except queue.Full:
+                logger.error(
+                    "Dropped %d %s rows after a failed flush",
+                    len(batch) - position,
+                    self.model._meta.label,
+                )
+                return
+
+    def _ensure_worker(self):
+        # Threads do not survive fork(), so a worker inherited from the master
+        # process has to start its own.
+        if self._thread is not None and self._thread.is_alive() and self._pid == os.getpid():
+            return
+        with self._start_lock:
+            if self._thread is None or not self._thread.is_alive() or self._pid != os.getpid():
+                self._pid = os.getpid()
+                self._thread = threading.Thread(
+                    target=self._run,
+                    name=f'ingest-{self.model._meta.model_name}',
+                    daemon=True,
+                )
+                self._thread.start()
+
+    def _run(self):
+        while True:
+            self._wakeup.wait(self.flush_interval)
+            self._wakeup.clear()
+            try:
+                self.flush()
+            except Exception:
+                logger.exception("Ingest flush for %s failed", self.model._meta.label)
+            finally:
+                close_old_connections()
+
+
+class SavedRowBuffer(BulkInsertBuffer):
+    """Queues rows that are already saved and passes them to ``after_insert``
+    in batches, for work derived from a row that can wait, such as counters.
+    """
+
+    def write(self, batch):
+        self.after_insert(batch)
+
+
+tracking_buffer = BulkInsertBuffer.from_settings(TrackingEvent)
+variant_visit_buffer = SavedRowBuffer.from_settings(
+    VariantVisit, after_insert=ab_results.add_visits
+)
+atexit.register(tracking_buffer.flush)
+atexit.register(variant_visit_buffer.flush)
@@ -0,0 +1,135 @@
+# content/landing_pages.py
+
+"""Compiled landing page payloads.
+
+A landing page response depends only on the page and the variant the visitor
+is assigned to. :func:`get_payload` renders that response to JSON bytes once
+per ``(page, variant)`` and keeps the bytes in Django's cache, so serving a
+page during a campaign launch is a cache read.
+
+A variant's ``content`` is a JSON merge patch (RFC 7396) over the page's
+``content``; the two are merged when the payload is compiled.
+
+Cache keys include the :func:`core.response_cache.model_version` of
+``LandingPage``, ``ABTest`` and ``Variant``, which their save, delete and
+many-to-many signals bump, so any edit is picked up by the next request.
+That needs a cache shared by every worker, like the database cache configured
+in ``core/settings_prod.py``; with a per-process ``LocMemCache`` the other
+workers keep serving their copy for up to ``TIMEOUT`` seconds.
+``manage.py warm_landing_pages`` compiles every active page and variant ahead
+of a launch; it also only helps with a shared cache.
+
+Options come from the ``LANDING_PAGE_CACHE`` setting (``ALIAS``, ``TIMEOUT``).
+"""
+
+import json
+
+from django.conf import settings
+from django.core.cache import caches
+from django.core.cache.backends.dummy import DummyCache
+from django.core.cache.backends.locmem import LocMemCache
+from rest_framework.renderers import JSONRenderer
+from rest_framework.response import Response
+
+from core.merge_patch import apply_merge_patch
+from core.response_cache import model_version, track_model
+
+from .models import ABTest, LandingPage, Variant
+from .query_planner import plan_queryset
+from .serializers import LandingPageSerializer
+
+DEFAULTS = {
+    'ALIAS': 'default',
+    'TIMEOUT': 5 * 60,
+}
+PAYLOAD_MODELS = (LandingPage, ABTest, Variant)
+
+for _model in PAYLOAD_MODELS:
+    track_model(_model)
+
+
+def get_option(name):
+    return {**DEFAULTS, **getattr(settings, 'LANDING_PAGE_CACHE', {})}[name]
+
+
+def is_shared_cache(alias):
+    """Whether other processes can read what this one stores in ``alias``."""
+    return not isinstance(caches[alias], (LocMemCache, DummyCache))
+
+
+def payload_key(page_id, variant_id=None):
+    versions = '.'.join(str(model_version(model).get()) for model in PAYLOAD_MODELS)
+    return f'landing-page:{page_id}:{variant_id or 0}:{versions}'
+
+
+def compile_payloads(page_ids):
+    """Render the base payload and every variant payload of ``page_ids``.
+
+    Returns:
+        dict: ``{(page_id, variant_id or None): bytes}``
+    """
+    pages = plan_queryset(LandingPage.objects.filter(pk__in=page_ids), LandingPageSerializer)
+    renderer = JSONRenderer()
+    payloads = {}
+    for page in pages:
+        data = LandingPageSerializer(page).data
+        payloads[(page.pk, None)] = renderer.render(data)
+        for test in page.ab_tests.all():
+            for variant in test.variants.all():
+                merged = {**data, 'content': apply_merge_patch(page.content, variant.content)}
+                payloads[(page.pk, variant.pk)] = renderer.render(merged)
+    return payloads
+
+
+def store_payloads(payloads):
+    entries = {payload_key(*target): payload for target, payload in payloads.items()}
+    caches[get_option('ALIAS')].set_many(entries, timeout=get_option('TIMEOUT'))
+
+
+def get_payload(page_id, variant_id=None):
+    """Return the compiled JSON for ``page_id`` as seen in ``variant_id``.
+
+    Falls back to the base payload for a variant that no longer exists, and
+    returns ``None`` for a missing page.
+    """
+    cache = caches[get_option('ALIAS')]
+    key = payload_key(page_id, variant_id)
+    payload = cache.get(key)
+    if payload is None:
+        # The page's other variants are compiled from the same rows.
+        payloads = compile_payloads([page_id])
+        store_payloads(payloads)
+        payload = payloads.get((page_id, variant_id)) or payloads.get((page_id, None))
+    return payload
+
+
+class PayloadResponse(Response):
+    """Response sending precompiled JSON bytes as they are.
+
+    Other renderers (the browsable API) and ``response.data`` get the
+    decoded payload.
+    """
+
+    def __init__(self, payload, **kwargs):
+        super().__init__(None, **kwargs)
+        self.payload = payload
+
+    @property
+    def data(self):
+        if self._data is None and getattr(self, 'payload', None) is not None:
+            self._data = json.loads(self.payload)
+        return self._data
+
+    @data.setter
+    def data(self, value):
+        self._data = value
+
+    @property
+    def rendered_content(self):
+        renderer = getattr(self, 'accepted_renderer', None)
+        # Media type parameters such as ``indent=4`` need a fresh render.
+        plain = ';' not in (getattr(self, 'accepted_media_type', '') or '')
+        if isinstance(renderer, JSONRenderer) and plain:
+            self['Content-Type'] = renderer.media_type
+            return self.payload
+        return super().rendered_content
@@ -0,0 +1,49 @@
+# content/management/commands/build_content_snapshots.py
+
+from django.core.management.base import BaseCommand, CommandError
+from content.snapshots import KINDS, KINDS_BY_NAME, SnapshotBuilder
+
+class Command(BaseCommand):
+    help = 'Render published content to static, content-hashed JSON snapshots'
+
+    def add_arguments(self, parser):
+        parser.add_argument(
+            '--output',
+            help='Directory to write snapshots to (default: CONTENT_SNAPSHOTS OUTPUT_DIR)',
+        )
+        parser.add_argument(
+            '--workers',
+            type=int,
+            help='Rendering processes; 1 renders in this process',
+        )
+        parser.add_argument(
+            '--kind',
+            action='append',
+            dest='kinds',
+            choices=sorted(KINDS_BY_NAME),
+            help='Only build the given kind (repeatable)',
+        )
+        parser.add_argument(
+            '--full',
+            action='store_true',
+            help='Render every object, ignoring the previous manifest',
+        )
+
+    def handle(self, *args, **options):
+        if options['workers'] is not None and options['workers'] < 1:
+            raise CommandError('--workers must be at least 1')
+
+        kinds = [KINDS_BY_NAME[name] for name in options['kinds']] if options['kinds'] else KINDS
+        builder = SnapshotBuilder(
+            output_dir=options['output'], workers=options['workers'], full=options['full']
+        )
+        self.stdout.write(f'Building snapshots in {builder.output_dir}...')
+
+        stats = builder.build(kinds)
+        for name, counts in stats.items():
+            self.stdout.write(
+                f"{name}: {counts['rendered']} rendered, {counts['unchanged']} unchanged, "
+                f"{counts['removed']} removed"
+            )
+
+        self.stdout.write(self.style.SUCCESS('Snapshots are up to date'))
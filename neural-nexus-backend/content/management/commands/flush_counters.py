@@ -0,0 +1,18 @@
+# content/management/commands/flush_counters.py
+
+from django.core.management.base import BaseCommand
+from content.counters import counter_buffer
+
+class Command(BaseCommand):
+    help = 'Write buffered view counters to the database'
+
+    def add_arguments(self, parser):
+        parser.add_argument(
+            '--sweep',
+            action='store_true',
+            help='Also collect deltas left in the shared cache by other workers',
+        )
+
+    def handle(self, *args, **options):
+        updated = counter_buffer.flush(sweep=options['sweep'])
+        self.stdout.write(self.style.SUCCESS(f'Flushed counters for {updated} rows'))
@@ -0,0 +1,28 @@
+# content/management/commands/rebuild_ab_rollups.py
+
+from django.core.management.base import BaseCommand
+from content.ab_results import rebuild_rollups
+from content.models import ABTest
+
+class Command(BaseCommand):
+    help = 'Recompute hourly A/B test rollups from raw variant visits'
+
+    def add_arguments(self, parser):
+        parser.add_argument(
+            '--test',
+            type=int,
+            action='append',
+            dest='tests',
+            help='Only rebuild the given A/B test id (repeatable)',
+        )
+
+    def handle(self, *args, **options):
+        tests = None
+        if options['tests']:
+            tests = ABTest.objects.filter(pk__in=options['tests'])
+            self.stdout.write(f'Rebuilding rollups for {tests.count()} test(s)...')
+        else:
+            self.stdout.write('Rebuilding rollups for all tests...')
+
+        written = rebuild_rollups(tests)
+        self.stdout.write(self.style.SUCCESS(f'Wrote {written} hourly rollup rows'))
@@ -0,0 +1,23 @@
+# content/management/commands/rebuild_related_content.py
+
+from django.core.management.base import BaseCommand
+from content.related import KINDS, rebuild
+
+class Command(BaseCommand):
+    help = 'Recompute the precomputed related posts and case studies'
+
+    def add_arguments(self, parser):
+        parser.add_argument(
+            '--kind',
+            action='append',
+            dest='kinds',
+            choices=sorted(KINDS),
+            help='Only rebuild the given kind (repeatable)',
+        )
+
+    def handle(self, *args, **options):
+        for kind in options['kinds'] or KINDS:
+            written = rebuild(kind)
+            self.stdout.write(f'{kind}: wrote {written} neighbour rows')
+
+        self.stdout.write(self.style.SUCCESS('Related content rebuilt successfully'))
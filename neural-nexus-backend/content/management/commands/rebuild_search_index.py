@@ -0,0 +1,18 @@
+# content/management/commands/rebuild_search_index.py
+
+from django.core.management.base import BaseCommand
+from content.search import DOCUMENTS, get_search_backend
+
+class Command(BaseCommand):
+    help = 'Rebuild the full-text search index for all searchable content'
+
+    def handle(self, *args, **options):
+        backend = get_search_backend()
+        self.stdout.write(f'Rebuilding search index with {type(backend).__name__}...')
+
+        for model in DOCUMENTS:
+            queryset = model.objects.select_related('category')
+            backend.reindex(queryset)
+            self.stdout.write(f'Indexed {queryset.count()} {model._meta.verbose_name_plural}')
+
+        self.stdout.write(self.style.SUCCESS('Search index rebuilt successfully'))
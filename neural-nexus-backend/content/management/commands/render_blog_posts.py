@@ -0,0 +1,53 @@
+# content/management/commands/render_blog_posts.py
+
+from django.core.management.base import BaseCommand
+from django.db import transaction
+from django.utils import timezone
+from content.models import BlogPost
+from core.response_cache import model_version
+
+class Command(BaseCommand):
+    help = 'Backfill the HTML, word count, read time, excerpt and contents of blog posts'
+
+    def add_arguments(self, parser):
+        parser.add_argument(
+            '--force',
+            action='store_true',
+            help='Re-render posts whose content has not changed',
+        )
+        parser.add_argument(
+            '--batch-size',
+            type=int,
+            default=200,
+            help='Posts written per bulk update',
+        )
+
+    def handle(self, *args, **options):
+        batch_size = options['batch_size']
+        fields = [*BlogPost.RENDERED_FIELDS, 'updated_at']
+        queryset = BlogPost.objects.defer('search_vector').order_by('pk')
+        self.stdout.write(f'Rendering {queryset.count()} blog posts...')
+
+        rendered = 0
+        batch = []
+        for post in queryset.iterator(chunk_size=batch_size):
+            if post.render_content(force=options['force']):
+                # The rendered representation changed, so validators and
+                # snapshots keyed on updated_at must see it.
+                post.updated_at = timezone.now()
+                batch.append(post)
+            if len(batch) >= batch_size:
+                rendered += self._write(batch, fields)
+                batch = []
+        rendered += self._write(batch, fields)
+
+        if rendered:
+            # bulk_update sends no signals.
+            model_version(BlogPost).bump()
+        self.stdout.write(self.style.SUCCESS(f'Rendered {rendered} blog posts'))
+
+    def _write(self, batch, fields):
+        if batch:
+            with transaction.atomic():
+                BlogPost.objects.bulk_update(batch, fields)
+        return len(batch)
@@ -0,0 +1,36 @@
+# content/management/commands/response_cache_stats.py
+
+from django.core.management.base import BaseCommand
+from django.urls import get_resolver
+from core.response_cache import cached_viewsets
+
+class Command(BaseCommand):
+    help = 'Report response cache hit rates for every cached viewset'
+
+    def add_arguments(self, parser):
+        parser.add_argument(
+            '--reset',
+            action='store_true',
+            help='Reset the counters after reporting',
+        )
+
+    def handle(self, *args, **options):
+        # Cached viewsets register themselves when the URLconf imports them.
+        get_resolver().url_patterns
+
+        total_hits = total_misses = 0
+        for name, viewset in sorted(cached_viewsets.items()):
+            stats = viewset.cache_stats()
+            counts = stats.read()
+            total_hits += counts['hits']
+            total_misses += counts['misses']
+            self.stdout.write(
+                f"{name}: {counts['hits']} hits, {counts['misses']} misses "
+                f"({counts['hit_rate']:.1%})"
+            )
+            if options['reset']:
+                stats.reset()
+
+        total = total_hits + total_misses
+        rate = total_hits / total if total else 0.0
+        self.stdout.write(self.style.SUCCESS(f'Overall hit rate: {rate:.1%} of {total} requests'))
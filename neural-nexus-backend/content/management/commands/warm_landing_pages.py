@@ -0,0 +1,37 @@
+# content/management/commands/warm_landing_pages.py
+
+from django.core.management.base import BaseCommand
+from content.landing_pages import compile_payloads, get_option, is_shared_cache, store_payloads
+from content.models import LandingPage
+
+class Command(BaseCommand):
+    help = (
+        'Compile and cache the payloads of active landing pages and their variants. '
+        'Needs a cache shared with the web workers (LANDING_PAGE_CACHE["ALIAS"]).'
+    )
+
+    def add_arguments(self, parser):
+        parser.add_argument(
+            '--slug',
+            action='append',
+            dest='slugs',
+            help='Only warm this landing page (repeatable)',
+        )
+
+    def handle(self, *args, **options):
+        if not is_shared_cache(get_option('ALIAS')):
+            self.stderr.write(self.style.WARNING(
+                f'The "{get_option("ALIAS")}" cache is local to this process, so the web '
+                'workers will not see these payloads. Configure a shared cache backend.'
+            ))
+
+        queryset = LandingPage.objects.filter(is_active=True)
+        if options['slugs']:
+            queryset = queryset.filter(slug__in=options['slugs'])
+
+        payloads = compile_payloads(list(queryset.values_list('pk', flat=True)))
+        store_payloads(payloads)
+        pages = len({page_id for page_id, _ in payloads})
+        self.stdout.write(self.style.SUCCESS(
+            f'Cached {len(payloads)} payloads for {pages} landing pages'
+        ))
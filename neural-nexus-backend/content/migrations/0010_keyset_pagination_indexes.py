@@ -0,0 +1,27 @@
+# Generated by Django 5.0 on 2026-10-18 11:17
+
+from django.conf import settings
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ("content", "0009_populate_case_study_categories"),
+        migrations.swappable_dependency(settings.AUTH_USER_MODEL),
+    ]
+
+    operations = [
+        migrations.AddIndex(
+            model_name="blogpost",
+            index=models.Index(
+                fields=["status", "-published_at", "-id"], name="blogpost_keyset_idx"
+            ),
+        ),
+        migrations.AddIndex(
+            model_name="casestudy",
+            index=models.Index(
+                fields=["status", "-published_at", "-id"], name="casestudy_keyset_idx"
+            ),
+        ),
+    ]
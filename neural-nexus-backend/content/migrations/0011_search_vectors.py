@@ -0,0 +1,72 @@
+# Generated by Django 5.0 on 2026-10-18 11:20
+
+import django.contrib.postgres.search
+from django.db import migrations
+
+# GIN indexes and the initial backfill only apply to PostgreSQL; other
+# databases use the in-memory search backend and leave the column empty.
+FORWARD_SQL = [
+    "CREATE INDEX IF NOT EXISTS blogpost_search_vector_gin "
+    "ON content_blogpost USING gin (search_vector)",
+    "CREATE INDEX IF NOT EXISTS casestudy_search_vector_gin "
+    "ON content_casestudy USING gin (search_vector)",
+    """
+    UPDATE content_blogpost AS post SET search_vector =
+        setweight(to_tsvector('english', coalesce(post.title, '')), 'A')
+        || setweight(to_tsvector('english', coalesce(post.excerpt, '')), 'B')
+        || setweight(to_tsvector('english', coalesce(post.content, '')), 'C')
+        || setweight(to_tsvector('english', coalesce(category.name, '')), 'B')
+    FROM content_category AS category
+    WHERE category.id = post.category_id
+    """,
+    """
+    UPDATE content_casestudy SET search_vector =
+        setweight(to_tsvector('english', coalesce(title, '')), 'A')
+        || setweight(to_tsvector('english', coalesce(client_name, '')), 'B')
+        || setweight(to_tsvector('english', coalesce(industry, '')), 'B')
+        || setweight(to_tsvector('english', coalesce(excerpt, '')), 'B')
+        || setweight(to_tsvector('english', coalesce(challenge, '')), 'C')
+        || setweight(to_tsvector('english', coalesce(solution, '')), 'C')
+    """,
+]
+REVERSE_SQL = [
+    "DROP INDEX IF EXISTS blogpost_search_vector_gin",
+    "DROP INDEX IF EXISTS casestudy_search_vector_gin",
+]
+
+
+def _run_on_postgres(statements):
+    def run(apps, schema_editor):
+        if schema_editor.connection.vendor != "postgresql":
+            return
+        for statement in statements:
+            schema_editor.execute(statement)
+
+    return run
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ("content", "0010_keyset_pagination_indexes"),
+    ]
+
+    operations = [
+        migrations.AddField(
+            model_name="blogpost",
+            name="search_vector",
+            field=django.contrib.postgres.search.SearchVectorField(
+                editable=False, null=True
+            ),
+        ),
+        migrations.AddField(
+            model_name="casestudy",
+            name="search_vector",
+            field=django.contrib.postgres.search.SearchVectorField(
+                editable=False, null=True
+            ),
+        ),
+        migrations.RunPython(
+            _run_on_postgres(FORWARD_SQL), _run_on_postgres(REVERSE_SQL)
+        ),
+    ]
@@ -0,0 +1,50 @@
+# Generated by Django 5.0 on 2026-10-18 11:40
+
+from django.db import migrations, models
+from django.db.models import F
+from django.db.models.functions import Round
+
+
+def averages_to_sums(apps, schema_editor):
+    BlogAnalytics = apps.get_model("content", "BlogAnalytics")
+    BlogAnalytics.objects.update(
+        time_on_page_total=F("avg_time_on_page") * F("return_visits"),
+        bounce_count=Round(F("bounce_rate") * F("return_visits")),
+    )
+
+
+def sums_to_averages(apps, schema_editor):
+    BlogAnalytics = apps.get_model("content", "BlogAnalytics")
+    BlogAnalytics.objects.filter(return_visits__gt=0).update(
+        avg_time_on_page=F("time_on_page_total") / F("return_visits"),
+        bounce_rate=F("bounce_count") * 1.0 / F("return_visits"),
+    )
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ("content", "0011_search_vectors"),
+    ]
+
+    operations = [
+        migrations.AddField(
+            model_name="bloganalytics",
+            name="time_on_page_total",
+            field=models.FloatField(default=0),
+        ),
+        migrations.AddField(
+            model_name="bloganalytics",
+            name="bounce_count",
+            field=models.IntegerField(default=0),
+        ),
+        migrations.RunPython(averages_to_sums, sums_to_averages),
+        migrations.RemoveField(
+            model_name="bloganalytics",
+            name="avg_time_on_page",
+        ),
+        migrations.RemoveField(
+            model_name="bloganalytics",
+            name="bounce_rate",
+        ),
+    ]
@@ -0,0 +1,53 @@
+# Generated by Django 5.0 on 2026-10-18 11:28
+
+import django.utils.timezone
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ("content", "0012_blog_analytics_running_sums"),
+    ]
+
+    operations = [
+        migrations.CreateModel(
+            name="TrackingEvent",
+            fields=[
+                (
+                    "id",
+                    models.BigAutoField(
+                        auto_created=True,
+                        primary_key=True,
+                        serialize=False,
+                        verbose_name="ID",
+                    ),
+                ),
+                ("event_name", models.CharField(max_length=100)),
+                ("occurred_at", models.DateTimeField()),
+                (
+                    "received_at",
+                    models.DateTimeField(default=django.utils.timezone.now),
+                ),
+                ("session_id", models.CharField(blank=True, max_length=100)),
+                ("anonymous_id", models.CharField(blank=True, max_length=100)),
+                ("identity", models.JSONField(default=dict)),
+                ("source", models.CharField(blank=True, max_length=50)),
+                ("path", models.CharField(blank=True, max_length=500)),
+                ("properties", models.JSONField(blank=True, default=dict)),
+            ],
+            options={
+                "ordering": ["-occurred_at"],
+                "indexes": [
+                    models.Index(
+                        fields=["event_name", "occurred_at"],
+                        name="trackingevent_name_idx",
+                    ),
+                    models.Index(
+                        fields=["session_id", "occurred_at"],
+                        name="trackingevent_session_idx",
+                    ),
+                ],
+            },
+        ),
+    ]
@@ -0,0 +1,20 @@
+# Generated by Django 5.0 on 2026-10-18 11:32
+
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ("content", "0013_tracking_events"),
+    ]
+
+    operations = [
+        migrations.AddIndex(
+            model_name="variantvisit",
+            index=models.Index(
+                fields=["variant", "session_id", "converted"],
+                name="variantvisit_conversion_idx",
+            ),
+        ),
+    ]
@@ -0,0 +1,48 @@
+# Generated by Django 5.0 on 2026-10-18 11:38
+
+import django.db.models.deletion
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ("content", "0014_variant_visit_conversion_index"),
+    ]
+
+    operations = [
+        migrations.CreateModel(
+            name="VariantHourlyRollup",
+            fields=[
+                (
+                    "id",
+                    models.BigAutoField(
+                        auto_created=True,
+                        primary_key=True,
+                        serialize=False,
+                        verbose_name="ID",
+                    ),
+                ),
+                ("hour", models.DateTimeField()),
+                ("visits", models.PositiveIntegerField(default=0)),
+                ("conversions", models.PositiveIntegerField(default=0)),
+                (
+                    "variant",
+                    models.ForeignKey(
+                        on_delete=django.db.models.deletion.CASCADE,
+                        related_name="hourly_rollups",
+                        to="content.variant",
+                    ),
+                ),
+            ],
+            options={
+                "ordering": ["variant", "hour"],
+            },
+        ),
+        migrations.AddConstraint(
+            model_name="varianthourlyrollup",
+            constraint=models.UniqueConstraint(
+                fields=("variant", "hour"), name="unique_variant_hour"
+            ),
+        ),
+    ]
@@ -0,0 +1,18 @@
+# Generated by Django 5.0 on 2026-10-18 11:49
+
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ("content", "0015_variant_hourly_rollups"),
+    ]
+
+    operations = [
+        migrations.AddField(
+            model_name="casestudy",
+            name="tags",
+            field=models.ManyToManyField(blank=True, to="content.tag"),
+        ),
+    ]
@@ -0,0 +1,52 @@
+# Generated by Django 5.0 on 2026-10-18 12:18
+
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ("content", "0017_blogpost_rendered_fields"),
+    ]
+
+    operations = [
+        migrations.CreateModel(
+            name="RelatedContent",
+            fields=[
+                (
+                    "id",
+                    models.BigAutoField(
+                        auto_created=True,
+                        primary_key=True,
+                        serialize=False,
+                        verbose_name="ID",
+                    ),
+                ),
+                (
+                    "kind",
+                    models.CharField(
+                        choices=[("post", "Blog post"), ("case-study", "Case study")],
+                        max_length=20,
+                    ),
+                ),
+                ("source_id", models.PositiveBigIntegerField()),
+                ("target_id", models.PositiveBigIntegerField()),
+                ("rank", models.PositiveSmallIntegerField()),
+                ("score", models.FloatField()),
+            ],
+            options={
+                "ordering": ["kind", "source_id", "rank"],
+                "indexes": [
+                    models.Index(
+                        fields=["kind", "target_id"], name="relatedcontent_target_idx"
+                    )
+                ],
+            },
+        ),
+        migrations.AddConstraint(
+            model_name="relatedcontent",
+            constraint=models.UniqueConstraint(
+                fields=("kind", "source_id", "rank"), name="unique_related_rank"
+            ),
+        ),
+    ]
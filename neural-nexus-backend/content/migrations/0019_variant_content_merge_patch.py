@@ -0,0 +1,43 @@
+# Generated by Django 5.0 on 2026-10-18 12:25
+
+from django.db import migrations, models
+
+from core.merge_patch import apply_merge_patch, make_merge_patch
+
+
+def contents_to_patches(apps, schema_editor):
+    Variant = apps.get_model("content", "Variant")
+    variants = list(Variant.objects.select_related("ab_test__landing_page"))
+    for variant in variants:
+        variant.content = make_merge_patch(
+            variant.ab_test.landing_page.content, variant.content
+        )
+    Variant.objects.bulk_update(variants, ["content"], batch_size=500)
+
+
+def patches_to_contents(apps, schema_editor):
+    Variant = apps.get_model("content", "Variant")
+    variants = list(Variant.objects.select_related("ab_test__landing_page"))
+    for variant in variants:
+        variant.content = apply_merge_patch(
+            variant.ab_test.landing_page.content, variant.content
+        )
+    Variant.objects.bulk_update(variants, ["content"], batch_size=500)
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ("content", "0018_relatedcontent"),
+    ]
+
+    operations = [
+        migrations.AlterField(
+            model_name="variant",
+            name="content",
+            field=models.JSONField(
+                help_text="JSON merge patch over the landing page content; null removes a key"
+            ),
+        ),
+        migrations.RunPython(contents_to_patches, patches_to_contents),
+    ]
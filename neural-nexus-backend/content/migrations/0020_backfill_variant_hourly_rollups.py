@@ -0,0 +1,52 @@
+# Generated by Django 5.0 on 2026-10-18 14:10
+
+from collections import defaultdict
+from datetime import timezone as dt_timezone
+
+from django.db import migrations
+from django.db.models import Count
+from django.db.models.functions import TruncHour
+
+
+def backfill_rollups(apps, schema_editor):
+    """Recompute hourly rollups from the visits recorded before they existed."""
+    VariantVisit = apps.get_model("content", "VariantVisit")
+    VariantHourlyRollup = apps.get_model("content", "VariantHourlyRollup")
+
+    counts = defaultdict(lambda: {"visits": 0, "conversions": 0})
+    for field, stamp, visits in (
+        ("visits", "timestamp", VariantVisit.objects.all()),
+        (
+            "conversions",
+            "conversion_timestamp",
+            VariantVisit.objects.filter(converted=True, conversion_timestamp__isnull=False),
+        ),
+    ):
+        grouped = (
+            visits.annotate(bucket=TruncHour(stamp, tzinfo=dt_timezone.utc))
+            .values("variant_id", "bucket")
+            .annotate(total=Count("id"))
+            .order_by()
+        )
+        for row in grouped:
+            counts[(row["variant_id"], row["bucket"])][field] = row["total"]
+
+    VariantHourlyRollup.objects.all().delete()
+    VariantHourlyRollup.objects.bulk_create(
+        [
+            VariantHourlyRollup(variant_id=variant_id, hour=hour, **totals)
+            for (variant_id, hour), totals in counts.items()
+        ],
+        batch_size=1000,
+    )
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ("content", "0019_variant_content_merge_patch"),
+    ]
+
+    operations = [
+        migrations.RunPython(backfill_rollups, migrations.RunPython.noop),
+    ]
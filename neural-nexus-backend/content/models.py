@@ -18,13 +18,21 @@ Models:
     ABTest: A/B testing configuration
     Variant: A/B test variants
     VariantVisit: A/B test visit tracking
+    VariantHourlyRollup: Hourly A/B test visit and conversion counts
+    TrackingEvent: Client-side analytics events
+    RelatedContent: Precomputed related posts and case studies
 """
 
-from django.db import models
+from django.contrib.postgres.search import SearchVectorField
+from django.db import IntegrityError, models, transaction
+from django.db.models import Exists, F, OuterRef
+from django.utils import timezone
 from django.utils.text import slugify
 from django.contrib.auth.models import User
 from leads.models import NewsletterSubscription  # Add this import at the top
 
+from .rendering import content_hash, excerpt_from_html, render_post
+
 class Tag(models.Model):
     """Content categorization tag model.
 
@@ -72,7 +80,12 @@ class BlogPost(models.Model):
         author (User): Post author
         category (Category): Post category
         tags (ManyToMany[Tag]): Associated tags
-        content (str): Main post content
+        content (str): Main post content (Markdown)
+        excerpt (str): Summary; generated from the content unless written by hand
+        content_html (str): Sanitized HTML rendered from the content on save
+        word_count (int): Words in the rendered content
+        estimated_read_time (int): Minutes to read, derived from word_count
+        table_of_contents (list): Nested headings with their anchor ids
         status (str): Publication status (DRAFT/PUBLISHED/ARCHIVED)
         is_featured (bool): Featured post flag
         seo_* (str): SEO metadata fields
@@ -102,24 +115,97 @@ class BlogPost(models.Model):
     created_at = models.DateTimeField(auto_now_add=True)
     updated_at = models.DateTimeField(auto_now=True)
     view_count = models.IntegerField(default=0)
+    # Maintained by content.search; GIN indexed on PostgreSQL (migration 0011)
+    search_vector = SearchVectorField(null=True, editable=False)
+    # Derived from content by content.rendering on save
+    content_html = models.TextField(blank=True, editable=False)
+    word_count = models.PositiveIntegerField(default=0, editable=False)
+    table_of_contents = models.JSONField(default=list, blank=True, editable=False)
+    rendered_hash = models.CharField(max_length=64, blank=True, editable=False)
+
+    RENDERED_FIELDS = [
+        'content_html', 'word_count', 'estimated_read_time', 'excerpt',
+        'table_of_contents', 'rendered_hash',
+    ]
 
     class Meta:
         ordering = ['-published_at', '-created_at']
+        indexes = [
+            # Supports keyset pagination over published posts
+            models.Index(fields=['status', '-published_at', '-id'], name='blogpost_keyset_idx'),
+        ]
 
     def __str__(self):
         return self.title
 
+    def save(self, *args, **kwargs):
+        update_fields = kwargs.get('update_fields')
+        if update_fields is None or 'content' in update_fields:
+            if self.render_content() and update_fields is not None:
+                kwargs['update_fields'] = {*update_fields, *self.RENDERED_FIELDS}
+        super().save(*args, **kwargs)
+
+    def render_content(self, force=False):
+        """Recompute the fields derived from ``content`` if it changed.
+
+        An excerpt is only replaced when it is empty or was itself generated
+        from the previous content, so hand-written excerpts are kept.
+
+        Args:
+            force (bool): Render even if the content is unchanged
+
+        Returns:
+            bool: Whether the derived fields were recomputed
+        """
+        digest = content_hash(self.content)
+        if digest == self.rendered_hash and not force:
+            return False
+        previous_excerpt = excerpt_from_html(self.content_html) if self.content_html else ''
+        rendered = render_post(self.content)
+        if not self.excerpt or self.excerpt == previous_excerpt:
+            self.excerpt = rendered.excerpt
+        self.content_html = rendered.html
+        self.word_count = rendered.word_count
+        self.estimated_read_time = rendered.read_time
+        self.table_of_contents = rendered.table_of_contents
+        self.rendered_hash = digest
+        return True
+
 class BlogAnalytics(models.Model):
+    """Aggregated reading analytics for a blog post.
+
+    Beacons only ever add to the running sums below with a single atomic
+    ``UPDATE``; averages are derived from them on read.
+
+    Attributes:
+        return_visits (int): Number of beacons with a time on page
+        time_on_page_total (float): Sum of reported seconds on page
+        bounce_count (int): Number of beacons flagged as bounces
+    """
     blog_post = models.OneToOneField(BlogPost, on_delete=models.CASCADE, related_name='analytics')
-    avg_time_on_page = models.FloatField(default=0)
-    bounce_rate = models.FloatField(default=0)
     return_visits = models.IntegerField(default=0)
+    time_on_page_total = models.FloatField(default=0)
+    bounce_count = models.IntegerField(default=0)
     social_shares = models.IntegerField(default=0)
     last_updated = models.DateTimeField(auto_now=True)
 
     class Meta:
         verbose_name_plural = "blog analytics"
 
+    @property
+    def avg_time_on_page(self):
+        """Mean seconds on page across recorded visits."""
+        if not self.return_visits:
+            return 0
+        return self.time_on_page_total / self.return_visits
+
+    @property
+    def bounce_rate(self):
+        """Share of recorded visits that bounced, between 0 and 1."""
+        if not self.return_visits:
+            return 0
+        return self.bounce_count / self.return_visits
+
 class Resource(models.Model):
     """Downloadable resource model.
 
@@ -158,6 +244,67 @@ class Resource(models.Model):
     def __str__(self):
         return f"{self.title} ({self.get_resource_type_display()})"
 
+class ResourceDownloadManager(models.Manager):
+    def record(self, resource_id, email, first_name='', company='', source_url=''):
+        """Record that ``email`` downloaded a resource, at most once per pair.
+
+        A repeat download is answered by a single read and writes nothing.
+        Otherwise the subscriber is upserted, the download inserted and, only
+        if that insert happened, the resource's ``download_count`` is
+        incremented, in one transaction; the counter update runs last so its
+        row lock is held only briefly.
+
+        Returns:
+            tuple: ``(subscriber_created, download_created)``
+        """
+        existing = (
+            NewsletterSubscription.objects.filter(email=email)
+            .annotate(
+                downloaded=Exists(
+                    self.filter(email=OuterRef('email'), resource_id=resource_id)
+                )
+            )
+            .values_list('pk', 'downloaded')
+            .first()
+        )
+        if existing is not None and existing[1]:
+            return False, False
+
+        with transaction.atomic():
+            subscriber_created = existing is None
+            if subscriber_created:
+                # A concurrent signup of the same address resolves to its row.
+                subscriber = NewsletterSubscription(
+                    email=email, first_name=first_name, source='CONTENT_END'
+                )
+                NewsletterSubscription.objects.bulk_create(
+                    [subscriber],
+                    update_conflicts=True,
+                    unique_fields=['email'],
+                    update_fields=['email'],
+                )
+                subscriber_id = subscriber.pk
+            else:
+                subscriber_id = existing[0]
+
+            try:
+                # A concurrent first download of the same pair fails the
+                # unique constraint here; only the insert that won counts.
+                with transaction.atomic():
+                    self.create(
+                        resource_id=resource_id,
+                        subscriber_id=subscriber_id,
+                        email=email,
+                        first_name=first_name,
+                        company=company,
+                        source_url=source_url,
+                    )
+            except IntegrityError:
+                return subscriber_created, False
+            Resource.objects.filter(pk=resource_id).update(download_count=F('download_count') + 1)
+        return subscriber_created, True
+
+
 class ResourceDownload(models.Model):
     resource = models.ForeignKey(Resource, on_delete=models.CASCADE, related_name='downloads')
     subscriber = models.ForeignKey(
@@ -173,6 +320,8 @@ class ResourceDownload(models.Model):
     downloaded_at = models.DateTimeField(auto_now_add=True)
     source_url = models.URLField(blank=True)
 
+    objects = ResourceDownloadManager()
+
     class Meta:
         unique_together = ['email', 'resource']
 
@@ -281,17 +430,19 @@ class ABTest(models.Model):
         return f"{self.name} - {self.landing_page.title}"
 
 class Variant(models.Model):
-    """A/B test variant visit tracking model.
+    """A/B test variant model.
 
     Attributes:
-        variant (Variant): The variant being tested
-        session_id (str): Visitor session ID
-        converted (bool): Whether visit led to conversion
-        conversion_timestamp (datetime): When conversion occurred
+        ab_test (ABTest): The test the variant belongs to
+        name (str): Variant label (A, B, etc.)
+        content (dict): JSON merge patch over the landing page content
+        traffic_percentage (int): Relative share of visitors assigned
     """
     ab_test = models.ForeignKey(ABTest, on_delete=models.CASCADE, related_name='variants')
     name = models.CharField(max_length=50)  # A, B, etc.
-    content = models.JSONField()  # Variant-specific content
+    content = models.JSONField(
+        help_text='JSON merge patch over the landing page content; null removes a key'
+    )
     traffic_percentage = models.IntegerField(default=50)
     created_at = models.DateTimeField(auto_now_add=True)
     updated_at = models.DateTimeField(auto_now=True)
@@ -311,6 +462,39 @@ class VariantVisit(models.Model):
 
     class Meta:
         ordering = ['-timestamp']
+        indexes = [
+            # Conversion lookup: a visitor's unconverted visit to a variant
+            models.Index(
+                fields=['variant', 'session_id', 'converted'], name='variantvisit_conversion_idx'
+            ),
+        ]
+
+class VariantHourlyRollup(models.Model):
+    """Visits and conversions per variant per hour.
+
+    Maintained incrementally by ``content.ab_results`` as visits are flushed
+    and conversions recorded, so test results never count raw visits.
+    Visits are bucketed by visit time, conversions by conversion time.
+
+    Attributes:
+        variant (Variant): Counted variant
+        hour (datetime): Start of the UTC hour
+        visits (int): Visits in the hour
+        conversions (int): Conversions in the hour
+    """
+    variant = models.ForeignKey(Variant, on_delete=models.CASCADE, related_name='hourly_rollups')
+    hour = models.DateTimeField()
+    visits = models.PositiveIntegerField(default=0)
+    conversions = models.PositiveIntegerField(default=0)
+
+    class Meta:
+        ordering = ['variant', 'hour']
+        constraints = [
+            models.UniqueConstraint(fields=['variant', 'hour'], name='unique_variant_hour'),
+        ]
+
+    def __str__(self):
+        return f"{self.variant} @ {self.hour:%Y-%m-%d %H:00}"
 
 class CaseStudyCategory(models.Model):
     """Category model for case studies.
@@ -360,6 +544,7 @@ class CaseStudy(models.Model):
         related_name='case_studies',
         help_text="Primary service category this case study relates to"
     )
+    tags = models.ManyToManyField(Tag, blank=True)
 
     # Content
     challenge = models.TextField()
@@ -385,9 +570,17 @@ class CaseStudy(models.Model):
     created_at = models.DateTimeField(auto_now_add=True)
     updated_at = models.DateTimeField(auto_now=True)
 
+    # Search
+    # Maintained by content.search; GIN indexed on PostgreSQL (migration 0011)
+    search_vector = SearchVectorField(null=True, editable=False)
+
     class Meta:
         ordering = ['-published_at', '-created_at']
         verbose_name_plural = "Case Studies"
+        indexes = [
+            # Supports keyset pagination over published case studies
+            models.Index(fields=['status', '-published_at', '-id'], name='casestudy_keyset_idx'),
+        ]
 
     def __str__(self):
         return self.title
@@ -396,3 +589,81 @@ class CaseStudy(models.Model):
         if not self.slug:
             self.slug = slugify(self.title)
         super().save(*args, **kwargs)
+
+
+class TrackingEvent(models.Model):
+    """Analytics event reported by the frontend tracking service.
+
+    Rows are written in batches by ``content.ingest`` rather than one INSERT
+    per request, so ``received_at`` is set when the event is accepted, not
+    when it is stored.
+
+    Attributes:
+        event_name (str): Event type, e.g. ``page_view``
+        occurred_at (datetime): Client timestamp of the event
+        received_at (datetime): Server time the event was accepted
+        session_id (str): Session identifier from the event identity
+        anonymous_id (str): Anonymous visitor identifier
+        identity (dict): Full identity payload
+        source (str): Reporting component
+        path (str): Page path the event fired on
+        properties (dict): Event-specific properties
+    """
+    event_name = models.CharField(max_length=100)
+    occurred_at = models.DateTimeField()
+    received_at = models.DateTimeField(default=timezone.now)
+    session_id = models.CharField(max_length=100, blank=True)
+    anonymous_id = models.CharField(max_length=100, blank=True)
+    identity = models.JSONField(default=dict)
+    source = models.CharField(max_length=50, blank=True)
+    path = models.CharField(max_length=500, blank=True)
+    properties = models.JSONField(default=dict, blank=True)
+
+    class Meta:
+        ordering = ['-occurred_at']
+        indexes = [
+            models.Index(fields=['event_name', 'occurred_at'], name='trackingevent_name_idx'),
+            models.Index(fields=['session_id', 'occurred_at'], name='trackingevent_session_idx'),
+        ]
+
+    def __str__(self):
+        return f"{self.event_name} at {self.occurred_at}"
+
+
+class RelatedContent(models.Model):
+    """Precomputed nearest neighbour of a blog post or case study.
+
+    Maintained by ``content.related``; each source keeps up to ``TOP_K`` rows
+    of the same kind, ranked from 0 by descending score.
+
+    Attributes:
+        kind (str): Type of the source and target (post/case-study)
+        source_id (int): Primary key of the object the row belongs to
+        target_id (int): Primary key of the related object
+        rank (int): Position of the target in the source's list
+        score (float): Combined text and tag similarity
+    """
+    KIND_CHOICES = [
+        ('post', 'Blog post'),
+        ('case-study', 'Case study'),
+    ]
+    kind = models.CharField(max_length=20, choices=KIND_CHOICES)
+    source_id = models.PositiveBigIntegerField()
+    target_id = models.PositiveBigIntegerField()
+    rank = models.PositiveSmallIntegerField()
+    score = models.FloatField()
+
+    class Meta:
+        ordering = ['kind', 'source_id', 'rank']
+        constraints = [
+            # Also the index serving lookups by source
+            models.UniqueConstraint(
+                fields=['kind', 'source_id', 'rank'], name='unique_related_rank'
+            ),
+        ]
+        indexes = [
+            models.Index(fields=['kind', 'target_id'], name='relatedcontent_target_idx'),
+        ]
+
+    def __str__(self):
+        return f"{self.kind} {self.source_id} -> {self.target_id} ({self.score:.3f})"
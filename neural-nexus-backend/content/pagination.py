@@ -0,0 +1,196 @@
+# content/pagination.py
+
+"""Keyset (cursor) pagination for published content.
+
+Page-number pagination runs a ``COUNT(*)`` and an ``OFFSET`` scan on every
+request, so deep pages cost more than the first one. Keyset pagination instead
+remembers the sort key of the last row served and asks for rows strictly
+"after" it, which an index on ``(published_at, id)`` answers in constant time
+regardless of depth. Dated and undated rows are read by separate queries
+ordered ``published_at DESC, id DESC`` like the index, so neither needs an
+``OR`` with ``published_at IS NULL`` or a ``NULLS LAST`` sort, which would
+keep the index from serving the scan.
+
+Cursors are opaque to clients: they are URL-safe base64 encoded JSON holding
+the ``published_at`` and ``id`` of the last row on the previous page.
+"""
+
+import base64
+import binascii
+import json
+from collections import OrderedDict
+
+from django.db.models import Q
+from django.utils.dateparse import parse_datetime
+from rest_framework.exceptions import NotFound
+from rest_framework.pagination import BasePagination
+from rest_framework.response import Response
+from rest_framework.utils.urls import remove_query_param, replace_query_param
+
+
+def encode_cursor(payload):
+    """Encode a cursor payload dict into an opaque URL-safe token."""
+    raw = json.dumps(payload, separators=(",", ":"), sort_keys=True).encode()
+    return base64.urlsafe_b64encode(raw).decode().rstrip("=")
+
+
+def decode_cursor(token):
+    """Decode a token produced by :func:`encode_cursor`.
+
+    Raises:
+        ValueError: If the token is not a valid cursor.
+    """
+    try:
+        padded = token + "=" * (-len(token) % 4)
+        payload = json.loads(base64.urlsafe_b64decode(padded.encode()))
+    except (binascii.Error, UnicodeDecodeError, ValueError) as exc:
+        raise ValueError("Invalid cursor") from exc
+    if not isinstance(payload, dict):
+        raise ValueError("Invalid cursor")
+    return payload
+
+
+class KeysetPagination(BasePagination):
+    """Forward-only keyset pagination ordered on ``(published_at, id)``.
+
+    Rows are served newest first. Rows without a ``published_at`` sort after
+    every dated row, ordered by ``id``, so nothing is skipped.
+
+    Attributes:
+        page_size (int): Default number of results per page
+        page_size_query_param (str): Query parameter overriding the page size
+        max_page_size (int): Upper bound for client supplied page sizes
+        cursor_query_param (str): Query parameter carrying the cursor
+        timestamp_field (str): Primary sort column
+    """
+
+    page_size = 12
+    page_size_query_param = "page_size"
+    max_page_size = 50
+    cursor_query_param = "cursor"
+    timestamp_field = "published_at"
+    invalid_cursor_message = "Invalid cursor"
+
+    def paginate_queryset(self, queryset, request, view=None):
+        self.request = request
+        self.base_url = request.build_absolute_uri()
+        page_size = self.get_page_size(request)
+
+        field = self.timestamp_field
+        queryset = queryset.order_by(f"-{field}", "-id")
+        cursor = self.get_cursor(request)
+        # Fetch one extra row to know whether a next page exists without a COUNT.
+        limit = page_size + 1
+
+        results = []
+        if cursor is None or cursor[0] is not None:
+            dated = queryset.filter(**{f"{field}__isnull": False})
+            if cursor is not None:
+                dated = dated.filter(self.after_cursor(*cursor))
+            results = list(dated[:limit])
+        if len(results) < limit:
+            # Undated rows follow the last dated one.
+            undated = queryset.filter(**{f"{field}__isnull": True})
+            if cursor is not None and cursor[0] is None:
+                undated = undated.filter(self.after_cursor(*cursor))
+            results += list(undated[: limit - len(results)])
+        self.has_next = len(results) > page_size
+        self.page = results[:page_size]
+        return self.page
+
+    def get_page_size(self, request):
+        try:
+            size = int(request.query_params.get(self.page_size_query_param, self.page_size))
+        except (TypeError, ValueError):
+            return self.page_size
+        return max(1, min(size, self.max_page_size))
+
+    def get_cursor(self, request):
+        """Return the ``(timestamp, id)`` pair encoded in the request, if any."""
+        token = request.query_params.get(self.cursor_query_param)
+        if not token:
+            return None
+        try:
+            payload = decode_cursor(token)
+            pk = int(payload["i"])
+            timestamp = payload.get("p")
+            if timestamp is not None:
+                timestamp = parse_datetime(timestamp)
+                if timestamp is None:
+                    raise ValueError("Invalid cursor")
+        except (KeyError, TypeError, ValueError):
+            raise NotFound(self.invalid_cursor_message)
+        return timestamp, pk
+
+    def after_cursor(self, timestamp, pk):
+        """Build the filter selecting rows that sort strictly after the cursor.
+
+        It applies to rows of the cursor's kind, dated or undated. The redundant ``<=`` bound lets the index scan start at the cursor.
+        """
+        field = self.timestamp_field
+        if timestamp is None:
+            return Q(id__lt=pk)
+        return Q(**{f"{field}__lte": timestamp}) & (
+            Q(**{f"{field}__lt": timestamp}) | Q(id__lt=pk)
+        )
+
+    def encode_position(self, instance):
+        timestamp = getattr(instance, self.timestamp_field)
+        return encode_cursor(
+            {"p": timestamp.isoformat() if timestamp else None, "i": instance.pk}
+        )
+
+    def get_next_link(self):
+        if not self.has_next:
+            return None
+        cursor = self.encode_position(self.page[-1])
+        return replace_query_param(self.base_url, self.cursor_query_param, cursor)
+
+    def get_first_link(self):
+        return remove_query_param(self.base_url, self.cursor_query_param)
+
+    def get_paginated_response(self, data):
+        return Response(
+            OrderedDict(
+                [
+                    ("next", self.get_next_link()),
+                    ("first", self.get_first_link()),
+                    ("results", data),
+                ]
+            )
+        )
+
+    def get_paginated_response_schema(self, schema):
+        return {
+            "type": "object",
+            "required": ["results"],
+            "properties": {
+                "next": {"type": "string", "nullable": True, "format": "uri"},
+                "first": {"type": "string", "format": "uri"},
+                "results": schema,
+            },
+        }
+
+
+class KeysetPaginationMixin:
+    """Opt viewsets into :class:`KeysetPagination` per request.
+
+    Clients request keyset mode with ``?pagination=cursor`` or by following a
+    ``next`` link carrying a ``cursor`` parameter. Every other request keeps the
+    viewset's regular pagination behaviour.
+    """
+
+    keyset_pagination_class = KeysetPagination
+
+    def use_keyset_pagination(self):
+        params = self.request.query_params
+        return params.get("pagination") == "cursor" or "cursor" in params
+
+    @property
+    def paginator(self):
+        if not hasattr(self, "_paginator"):
+            if self.use_keyset_pagination():
+                self._paginator = self.keyset_pagination_class()
+            else:
+                self._paginator = super().paginator
+        return self._paginator
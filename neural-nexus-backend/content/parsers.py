@@ -0,0 +1,36 @@
+# content/parsers.py
+
+"""Request body parsers for the content API."""
+
+import codecs
+import json
+
+from django.conf import settings
+from rest_framework.exceptions import ParseError
+from rest_framework.parsers import BaseParser
+
+
+class NDJSONParser(BaseParser):
+    """Parses newline-delimited JSON into a list with one item per line.
+
+    Blank lines are ignored, so a trailing newline is allowed.
+    """
+
+    media_type = 'application/x-ndjson'
+
+    def parse(self, stream, media_type=None, parser_context=None):
+        parser_context = parser_context or {}
+        encoding = parser_context.get('encoding', settings.DEFAULT_CHARSET)
+        items = []
+        try:
+            reader = codecs.getreader(encoding)(stream)
+            for line_number, line in enumerate(reader, start=1):
+                if not line.strip():
+                    continue
+                try:
+                    items.append(json.loads(line))
+                except ValueError as exc:
+                    raise ParseError(f'NDJSON parse error on line {line_number}: {exc}')
+        except UnicodeDecodeError as exc:
+            raise ParseError(f'NDJSON parse error: {exc}')
+        return items
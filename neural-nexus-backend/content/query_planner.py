@@ -0,0 +1,89 @@
+# content/query_planner.py
+
+"""Prefetch-aware queryset planning for nested serializers.
+
+Serializers declare the relations they read in their ``Meta`` class::
+
+    class Meta:
+        model = BlogPost
+        select_related = ['category', 'analytics', 'author']
+        prefetch_related = ['tags']
+
+:func:`plan_queryset` walks a serializer and its nested serializers, prefixes
+each declaration with the path of the field that nests it and applies the
+matching ``select_related``/``prefetch_related`` calls. Anything reached
+through a prefetched or ``many=True`` relation is prefetched as well, since a
+join cannot follow a multi-valued relation.
+
+A top-level serializer may also declare ``defer``: columns of its own model
+it never reads (large bodies on list serializers), which are left out of the
+``SELECT``.
+"""
+
+from functools import lru_cache
+
+from rest_framework.serializers import BaseSerializer, ListSerializer
+
+
+@lru_cache(maxsize=None)
+def collect_relations(serializer_class):
+    """Return the ``(select_related, prefetch_related)`` paths for a serializer.
+
+    Args:
+        serializer_class: Serializer class to inspect
+
+    Returns:
+        tuple: Two tuples of lookup paths
+    """
+    select, prefetch = [], []
+    _collect(serializer_class, '', False, select, prefetch)
+    return tuple(dict.fromkeys(select)), tuple(dict.fromkeys(prefetch))
+
+
+def _collect(serializer_class, prefix, prefetching, select, prefetch):
+    meta = getattr(serializer_class, 'Meta', None)
+    declared_select = [prefix + name for name in getattr(meta, 'select_related', ())]
+    declared_prefetch = [prefix + name for name in getattr(meta, 'prefetch_related', ())]
+    (prefetch if prefetching else select).extend(declared_select)
+    prefetch.extend(declared_prefetch)
+
+    for name, field in serializer_class().fields.items():
+        many = isinstance(field, ListSerializer)
+        nested = field.child if many else field
+        if not isinstance(nested, BaseSerializer) or field.source == '*':
+            continue
+        path = prefix + field.source.replace('.', '__')
+        _collect(
+            type(nested),
+            path + '__',
+            prefetching or many or path in declared_prefetch,
+            select,
+            prefetch,
+        )
+
+
+def plan_queryset(queryset, serializer_class):
+    """Apply the relation loading declared by ``serializer_class`` to ``queryset``."""
+    select, prefetch = collect_relations(serializer_class)
+    defer = getattr(getattr(serializer_class, 'Meta', None), 'defer', ())
+    if defer:
+        queryset = queryset.defer(*defer)
+    if select:
+        queryset = queryset.select_related(*select)
+    if prefetch:
+        queryset = queryset.prefetch_related(*prefetch)
+    return queryset
+
+
+class QueryPlannerMixin:
+    """Viewset mixin applying :func:`plan_queryset` for the active serializer.
+
+    Viewsets that override ``get_queryset`` should pass their result through
+    :meth:`plan_queryset` themselves.
+    """
+
+    def plan_queryset(self, queryset):
+        return plan_queryset(queryset, self.get_serializer_class())
+
+    def get_queryset(self):
+        return self.plan_queryset(super().get_queryset())
@@ -0,0 +1,464 @@
+# content/related.py
+
+"""Precomputed related posts and case studies.
+
+Similarity is computed offline and stored as the top ``TOP_K`` neighbours of
+every published object in :class:`~content.models.RelatedContent`, so serving
+"related" is one indexed read of ``(kind, source_id)`` followed by fetching
+the listed objects.
+
+Each published object becomes a TF-IDF vector over its title (counted twice),
+excerpt and tag slugs, built with :mod:`scipy.sparse`. The score of a pair is
+``TEXT_WEIGHT * cosine + (1 - TEXT_WEIGHT) * tag Jaccard``. Scores are
+computed in blocks of rows (sparse products turned into dense
+``BLOCK_SIZE x N`` arrays), so memory stays bounded as the corpus grows.
+
+:func:`rebuild` recomputes a whole kind (``manage.py rebuild_related_content``).
+:func:`update_objects` runs after posts or case studies are saved or
+retagged. It recomputes their lists and the lists of the objects that list
+them, or whose weakest neighbour they now beat. Because IDF weights move
+slowly as documents are added, other lists drift a little between full
+rebuilds. :func:`schedule_update` collects the objects a transaction changes
+and hands them to :data:`related_updates` on commit, which runs the update
+in a background thread unless ``BACKGROUND`` is false. The thread waits
+``UPDATE_DELAY`` seconds after being woken so the commits of that window
+share one corpus load. Updates still queued when a worker dies without
+running its exit hooks are lost until the next rebuild.
+
+Options come from the ``RELATED_CONTENT`` setting (``TOP_K``,
+``TEXT_WEIGHT``, ``MIN_SCORE``, ``BLOCK_SIZE``, ``UPDATE_ON_SAVE``,
+``BACKGROUND``, ``UPDATE_DELAY``).
+"""
+
+import atexit
+import logging
+import os
+import re
+import threading
+import time
+from dataclasses import dataclass
+
+import numpy as np
+from django.conf import settings
+from django.core.signals import request_started
+from django.db import close_old_connections, transaction
+from django.db.models import Count, Min
+from rest_framework.decorators import action
+from rest_framework.exceptions import NotFound
+from rest_framework.response import Response
+from scipy import sparse
+
+from .models import BlogPost, CaseStudy, RelatedContent
+
+logger = logging.getLogger(__name__)
+
+DEFAULTS = {
+    'TOP_K': 6,
+    'TEXT_WEIGHT': 0.7,
+    'MIN_SCORE': 0.05,
+    'BLOCK_SIZE': 512,
+    'UPDATE_ON_SAVE': True,
+    'BACKGROUND': True,
+    'UPDATE_DELAY': 5,
+}
+
+TOKEN_RE = re.compile(r'[a-z0-9]+')
+STOP_WORDS = frozenset(
+    'a about above after again all also an and any are as at be been before being '
+    'between both but by can could did do does doing down during each few for from '
+    'further had has have having how if in into is it its itself just more most no '
+    'nor not now of off on once only or other our out over own same should so some '
+    'such than that the their them then there these they this those through to too '
+    'under until up very was we were what when where which while who why will with '
+    'would you your'.split()
+)
+
+
+def get_option(name):
+    return {**DEFAULTS, **getattr(settings, 'RELATED_CONTENT', {})}[name]
+
+
+@dataclass(frozen=True)
+class RelatedKind:
+    """A model whose published objects are related to each other."""
+
+    name: str
+    model: type
+
+    def queryset(self):
+        return self.model.objects.filter(status='PUBLISHED')
+
+
+KINDS = {
+    'post': RelatedKind('post', BlogPost),
+    'case-study': RelatedKind('case-study', CaseStudy),
+}
+
+
+def tokenize(text):
+    return [token for token in TOKEN_RE.findall((text or '').lower()) if token not in STOP_WORDS]
+
+
+class Corpus:
+    """Vectorized published objects of one kind.
+
+    Attributes:
+        ids (np.ndarray): Primary keys, in row order
+        text (csr_matrix): L2-normalised TF-IDF rows
+        tags (csr_matrix): Binary object x tag matrix
+    """
+
+    def __init__(self, ids, documents, tag_sets):
+        self.ids = np.asarray(ids, dtype=np.int64)
+        self.index = {int(pk): row for row, pk in enumerate(self.ids)}
+        self.text = self._tfidf(documents)
+        self.tags = self._binary(tag_sets)
+        self.tag_sizes = np.asarray(self.tags.sum(axis=1)).ravel()
+
+    @classmethod
+    def load(cls, kind):
+        """Read every published object of ``kind`` with two queries."""
+        rows = list(kind.queryset().order_by('pk').values_list('pk', 'title', 'excerpt'))
+        through = kind.model.tags.through
+        source_field = f'{kind.model._meta.model_name}_id'
+        tags = {}
+        tag_pairs = through.objects.filter(
+            **{f'{source_field}__in': [pk for pk, _, _ in rows]}
+        ).values_list(source_field, 'tag_id', 'tag__slug')
+        for pk, tag_id, slug in tag_pairs:
+            tags.setdefault(pk, []).append((tag_id, slug))
+
+        documents, tag_sets = [], []
+        for pk, title, excerpt in rows:
+            object_tags = tags.get(pk, [])
+            title_tokens = tokenize(title)
+            documents.append(
+                title_tokens * 2
+                + tokenize(excerpt)
+                + [f'tag:{slug}' for _, slug in object_tags]
+            )
+            tag_sets.append({tag_id for tag_id, _ in object_tags})
+        return cls([pk for pk, _, _ in rows], documents, tag_sets)
+
+    def __len__(self):
+        return len(self.ids)
+
+    def __contains__(self, pk):
+        return pk in self.index
+
+    @staticmethod
+    def _tfidf(documents):
+        vocabulary = {}
+        rows, columns = [], []
+        for row, tokens in enumerate(documents):
+            for token in tokens:
+                rows.append(row)
+                columns.append(vocabulary.setdefault(token, len(vocabulary)))
+        counts = sparse.csr_matrix(
+            (np.ones(len(rows)), (rows, columns)),
+            shape=(len(documents), max(len(vocabulary), 1)),
+        )
+        counts.sum_duplicates()
+        # Sublinear term frequency and smoothed inverse document frequency.
+        counts.data = 1 + np.log(counts.data)
+        document_frequency = np.bincount(counts.indices, minlength=counts.shape[1])
+        idf = np.log((1 + len(documents)) / (1 + document_frequency)) + 1
+        weighted = counts.multiply(idf).tocsr()
+        norms = np.sqrt(np.asarray(weighted.multiply(weighted).sum(axis=1)).ravel())
+        norms[norms == 0] = 1
+        return sparse.csr_matrix(weighted.multiply(1 / norms[:, None]))
+
+    @staticmethod
+    def _binary(tag_sets):
+        tag_index = {}
+        rows, columns = [], []
+        for row, tag_ids in enumerate(tag_sets):
+            for tag_id in tag_ids:
+                rows.append(row)
+                columns.append(tag_index.setdefault(tag_id, len(tag_index)))
+        return sparse.csr_matrix(
+            (np.ones(len(rows)), (rows, columns)),
+            shape=(len(tag_sets), max(len(tag_index), 1)),
+        )
+
+    def scores(self, rows):
+        """Return the dense ``len(rows) x N`` score block; self-pairs are ``-inf``."""
+        rows = np.asarray(rows, dtype=np.int64)
+        weight = get_option('TEXT_WEIGHT')
+        cosine = (self.text[rows] @ self.text.T).toarray()
+        intersection = (self.tags[rows] @ self.tags.T).toarray()
+        union = self.tag_sizes[rows][:, None] + self.tag_sizes[None, :] - intersection
+        jaccard = np.divide(
+            intersection, union, out=np.zeros_like(intersection), where=union > 0
+        )
+        block = weight * cosine + (1 - weight) * jaccard
+        block[np.arange(len(rows)), rows] = -np.inf
+        return block
+
+    def neighbours(self, rows):
+        """Yield ``(source_id, [(target_id, score), ...])`` for ``rows``."""
+        top_k, min_score = get_option('TOP_K'), get_option('MIN_SCORE')
+        block_size = get_option('BLOCK_SIZE')
+        rows = list(rows)
+        for start in range(0, len(rows), block_size):
+            chunk = rows[start:start + block_size]
+            block = self.scores(chunk)
+            count = min(top_k, len(self) - 1)
+            for offset, row in enumerate(chunk):
+                scores = block[offset]
+                if count <= 0:
+                    yield int(self.ids[row]), []
+                    continue
+                candidates = np.argpartition(-scores, count - 1)[:count]
+                # Highest score first; ties broken by id for stable output.
+                ordered = sorted(candidates, key=lambda col: (-scores[col], self.ids[col]))
+                yield int(self.ids[row]), [
+                    (int(self.ids[col]), float(scores[col]))
+                    for col in ordered
+                    if scores[col] >= min_score
+                ]
+
+
+def _rows_for(kind, lists):
+    return [
+        RelatedContent(
+            kind=kind.name, source_id=source_id, target_id=target_id, rank=rank, score=score
+        )
+        for source_id, neighbours in lists
+        for rank, (target_id, score) in enumerate(neighbours)
+    ]
+
+
+def rebuild(kind_name):
+    """Recompute every neighbour list of one kind.
+
+    Returns:
+        int: Number of neighbour rows written
+    """
+    kind = KINDS[kind_name]
+    corpus = Corpus.load(kind)
+    rows = _rows_for(kind, corpus.neighbours(range(len(corpus))))
+    with transaction.atomic():
+        RelatedContent.objects.filter(kind=kind.name).delete()
+        RelatedContent.objects.bulk_create(rows, batch_size=1000)
+    return len(rows)
+
+
+def update_objects(kind_name, pks):
+    """Bring the lists affected by changes to objects ``pks`` up to date.
+
+    Besides the corpus, only the rows listing one of ``pks`` are read, plus
+    the length and weakest score of every list.
+
+    Returns:
+        int: Number of lists recomputed
+    """
+    kind = KINDS[kind_name]
+    pks = set(pks)
+    corpus = Corpus.load(kind)
+    top_k, min_score = get_option('TOP_K'), get_option('MIN_SCORE')
+    lists = RelatedContent.objects.filter(kind=kind.name)
+
+    affected = pks | set(lists.filter(target_id__in=pks).values_list('source_id', flat=True))
+    changed = [corpus.index[pk] for pk in pks if pk in corpus]
+    if changed:
+        listed = np.zeros(len(corpus), dtype=np.int64)
+        weakest = np.full(len(corpus), min_score, dtype=float)
+        summaries = lists.order_by().values('source_id').annotate(
+            listed=Count('pk'), weakest=Min('score')
+        ).values_list('source_id', 'listed', 'weakest')
+        for source_id, count, score in summaries:
+            row = corpus.index.get(source_id)
+            if row is not None:
+                listed[row], weakest[row] = count, score
+        block_size = get_option('BLOCK_SIZE')
+        for start in range(0, len(changed), block_size):
+            # Scores are symmetric, so a changed object's row says how every
+            # other object now scores it.
+            scores = corpus.scores(changed[start:start + block_size])
+            beaten = (scores >= min_score) & ((listed < top_k) | (scores > weakest))
+            affected.update(int(pk) for pk in corpus.ids[beaten.any(axis=0)])
+
+    live = [corpus.index[source_id] for source_id in affected if source_id in corpus]
+    rows = _rows_for(kind, corpus.neighbours(live))
+    with transaction.atomic():
+        lists.filter(source_id__in=affected).delete()
+        RelatedContent.objects.bulk_create(rows, batch_size=1000)
+    return len(affected)
+
+
+class RelatedUpdateQueue:
+    """Collects changed objects and runs :func:`update_objects` for them.
+
+    Keys queued while an update runs are coalesced into the next one, one
+    call (and one corpus load) per kind. With ``background`` the updates run
+    in a daemon thread, which waits ``delay`` seconds after being woken to
+    gather more keys, so requests never wait on scoring; otherwise they run
+    inline, which is what tests use.
+
+    Attributes:
+        background (bool): Whether a daemon thread runs the updates
+        delay (float): Seconds the thread gathers keys before updating
+    """
+
+    def __init__(self, background=True, delay=5):
+        self.background = background
+        self.delay = delay
+        self._pending = set()
+        self._lock = threading.Lock()
+        self._run_lock = threading.Lock()
+        self._start_lock = threading.Lock()
+        self._wakeup = threading.Event()
+        self._thread = None
+        self._pid = None
+
+    def add(self, keys):
+        """Queue ``(kind_name, pk)`` pairs for an update."""
+        with self._lock:
+            self._pending.update(keys)
+        if self.background:
+            self._ensure_worker()
+            self._wakeup.set()
+        else:
+            self.flush()
+
+    def pending(self):
+        """Return the number of objects waiting for an update."""
+        return len(self._pending)
+
+    def flush(self):
+        """Update the lists of every queued object."""
+        with self._run_lock:
+            with self._lock:
+                keys, self._pending = self._pending, set()
+            by_kind = {}
+            for kind_name, pk in keys:
+                by_kind.setdefault(kind_name, set()).add(pk)
+            for kind_name, pks in by_kind.items():
+                try:
+                    update_objects(kind_name, pks)
+                except Exception:
+                    # The saves already succeeded; a rebuild repairs the lists.
+                    logger.exception("Failed to update related %s for %s", kind_name, sorted(pks))
+
+    def _ensure_worker(self):
+        # Threads do not survive fork(), so a worker inherited from the master
+        # process has to start its own.
+        if self._thread is not None and self._thread.is_alive() and self._pid == os.getpid():
+            return
+        with self._start_lock:
+            if self._thread is None or not self._thread.is_alive() or self._pid != os.getpid():
+                self._pid = os.getpid()
+                self._thread = threading.Thread(
+                    target=self._run, name='related-content', daemon=True
+                )
+                self._thread.start()
+
+    def _run(self):
+        while True:
+            self._wakeup.wait()
+            time.sleep(self.delay)
+            self._wakeup.clear()
+            try:
+                self.flush()
+            finally:
+                close_old_connections()
+
+
+related_updates = RelatedUpdateQueue(
+    background=get_option('BACKGROUND'), delay=get_option('UPDATE_DELAY')
+)
+atexit.register(related_updates.flush)
+
+
+# ``(thread id, kind, pk)`` of objects changed by transactions that have not
+# committed yet; each thread's hook takes only its own.
+_scheduled = set()
+_scheduled_lock = threading.Lock()
+_local = threading.local()
+
+
+def _reset_hook(**kwargs):
+    # A transaction that rolls back never runs its hook, so each request
+    # starts unhooked and its first transaction registers a new one.
+    _local.hooked = False
+
+
+request_started.connect(_reset_hook)
+
+
+def _queue_scheduled():
+    """Commit hook handing this thread's objects to :data:`related_updates`."""
+    _reset_hook()
+    thread = threading.get_ident()
+    with _scheduled_lock:
+        mine = {entry for entry in _scheduled if entry[0] == thread}
+        _scheduled.difference_update(mine)
+    keys = {(kind_name, pk) for _, kind_name, pk in mine}
+    if keys:
+        related_updates.add(keys)
+
+
+def schedule_update(kind_name, pk):
+    """Queue an update of ``pk``'s lists once the current transaction commits.
+
+    A save and the ``m2m_changed`` signals of its retagging all land in one
+    batch: the first call in a transaction registers a single commit hook,
+    which hands over everything the thread has scheduled. If the transaction
+    or savepoint holding the hook rolls back, its objects stay scheduled and
+    go out with the thread's next hook, registered by its next request at the
+    latest; updating them only recomputes lists that did not change.
+    """
+    if not get_option('UPDATE_ON_SAVE'):
+        return
+    with _scheduled_lock:
+        _scheduled.add((threading.get_ident(), kind_name, pk))
+    if not transaction.get_connection().in_atomic_block:
+        _queue_scheduled()
+    elif not getattr(_local, 'hooked', False):
+        _local.hooked = True
+        transaction.on_commit(_queue_scheduled)
+
+
+def related_ids(kind_name, source_id, limit=None):
+    """Return ``[(target_id, score), ...]`` for ``source_id``, best first."""
+    queryset = RelatedContent.objects.filter(kind=kind_name, source_id=source_id).order_by('rank')
+    if limit is not None:
+        queryset = queryset[:limit]
+    return list(queryset.values_list('target_id', 'score'))
+
+
+class RelatedContentMixin:
+    """Viewset mixin adding a ``related`` detail action served from the index.
+
+    Expects :class:`core.conditional.ConditionalGetMixin` (for the indexed
+    ``(pk, updated_at)`` lookup) and :class:`~content.query_planner.QueryPlannerMixin`.
+
+    Attributes:
+        related_kind (str): Key of :data:`KINDS` for the viewset's model
+    """
+
+    related_kind = None
+
+    @action(detail=True, methods=['get'])
+    def related(self, request, *args, **kwargs):
+        """Return up to ``?limit=`` related objects, each with its ``score``."""
+        row = self.get_validator_row()
+        if row is None:
+            raise NotFound()
+        try:
+            limit = min(int(request.query_params.get('limit', get_option('TOP_K'))), 50)
+        except ValueError:
+            limit = get_option('TOP_K')
+
+        neighbours = related_ids(self.related_kind, row['pk'], max(limit, 0))
+        kind = KINDS[self.related_kind]
+        objects = self.plan_queryset(kind.queryset().filter(pk__in=[pk for pk, _ in neighbours]))
+        by_id = {instance.pk: instance for instance in objects}
+        serializer_class = self.get_serializer_class()
+        context = self.get_serializer_context()
+        return Response([
+            {**serializer_class(by_id[pk], context=context).data, 'score': round(score, 4)}
+            for pk, score in neighbours
+            if pk in by_id
+        ])
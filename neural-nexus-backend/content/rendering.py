@@ -0,0 +1,197 @@
+# content/rendering.py
+
+"""Derived, pre-rendered fields for blog posts.
+
+Posts are written in Markdown. :func:`render_post` turns the body into
+sanitized HTML once, when the post is saved, along with the figures the
+frontend otherwise had to compute per visitor: word count, reading time, a
+plain-text excerpt and a table of contents built from the headings.
+
+The HTML is cleaned with an allowlist of tags and attributes, so anything
+Markdown passes through verbatim (raw ``<script>``, ``on*`` handlers,
+``javascript:`` links) is removed rather than shipped to the browser.
+
+Typical usage example:
+    rendered = render_post(post.content)
+    post.content_html = rendered.html
+"""
+
+import hashlib
+import math
+import re
+from dataclasses import dataclass, field
+from html import escape
+from html.parser import HTMLParser
+from urllib.parse import urlsplit
+
+import markdown
+
+WORDS_PER_MINUTE = 200
+EXCERPT_LENGTH = 300
+MARKDOWN_EXTENSIONS = ['extra', 'nl2br', 'sane_lists', 'toc']
+
+ALLOWED_TAGS = {
+    'a', 'abbr', 'blockquote', 'br', 'code', 'dd', 'del', 'div', 'dl', 'dt', 'em',
+    'h1', 'h2', 'h3', 'h4', 'h5', 'h6', 'hr', 'i', 'img', 'li', 'ol', 'p', 'pre',
+    'strong', 'sub', 'sup', 'table', 'tbody', 'td', 'th', 'thead', 'tr', 'ul',
+}
+VOID_TAGS = {'br', 'hr', 'img'}
+ALLOWED_ATTRIBUTES = {
+    'a': {'href', 'title'},
+    'abbr': {'title'},
+    'img': {'src', 'alt', 'title'},
+    'td': {'align'},
+    'th': {'align'},
+    **{f'h{level}': {'id'} for level in range(1, 7)},
+}
+HEADING_TAGS = {f'h{level}' for level in range(1, 7)}
+URL_ATTRIBUTES = {'href', 'src'}
+ALLOWED_SCHEMES = {'', 'http', 'https', 'mailto'}
+# Elements whose content is dropped together with the element.
+DROP_CONTENT_TAGS = {'script', 'style', 'iframe', 'object', 'embed', 'template'}
+BLOCK_TAGS = {'p', 'li', 'blockquote', 'pre', 'td', 'th', 'dd', 'dt', 'div'} | HEADING_TAGS
+
+
+@dataclass
+class RenderedPost:
+    html: str
+    word_count: int
+    read_time: int
+    excerpt: str
+    table_of_contents: list = field(default_factory=list)
+
+
+class _Sanitizer(HTMLParser):
+    """Re-serializes allowlisted HTML and collects the text it contains."""
+
+    def __init__(self):
+        super().__init__(convert_charrefs=True)
+        self.output = []
+        self.text = []
+        self.paragraphs = []
+        self.headings = []
+        self._paragraph = None
+        self._heading = None
+        self._dropping = 0
+
+    def handle_starttag(self, tag, attrs):
+        if tag in DROP_CONTENT_TAGS:
+            self._dropping += 1
+            return
+        if self._dropping or tag not in ALLOWED_TAGS:
+            return
+        allowed = ALLOWED_ATTRIBUTES.get(tag, set())
+        rendered = ''.join(
+            f' {name}="{escape(value, quote=True)}"'
+            for name, value in attrs
+            if name in allowed and value is not None and self._safe_value(name, value)
+        )
+        self.output.append(f'<{tag}{rendered}>')
+        if tag == 'p':
+            self._paragraph = []
+        if tag in HEADING_TAGS:
+            self._heading = (int(tag[1]), dict(attrs).get('id'), [])
+        if tag in BLOCK_TAGS | VOID_TAGS:
+            self.text.append(' ')
+
+    def handle_startendtag(self, tag, attrs):
+        self.handle_starttag(tag, attrs)
+        if tag not in VOID_TAGS:
+            self.handle_endtag(tag)
+
+    def handle_endtag(self, tag):
+        if tag in DROP_CONTENT_TAGS:
+            self._dropping = max(0, self._dropping - 1)
+            return
+        if self._dropping or tag not in ALLOWED_TAGS or tag in VOID_TAGS:
+            return
+        self.output.append(f'</{tag}>')
+        if tag == 'p' and self._paragraph is not None:
+            self.paragraphs.append(' '.join(''.join(self._paragraph).split()))
+            self._paragraph = None
+        if tag in HEADING_TAGS and self._heading is not None:
+            level, anchor, parts = self._heading
+            if anchor:
+                self.headings.append((level, anchor, ' '.join(''.join(parts).split())))
+            self._heading = None
+        if tag in BLOCK_TAGS:
+            self.text.append(' ')
+
+    def handle_data(self, data):
+        if self._dropping:
+            return
+        self.output.append(escape(data, quote=False))
+        self.text.append(data)
+        if self._paragraph is not None:
+            self._paragraph.append(data)
+        if self._heading is not None:
+            self._heading[2].append(data)
+
+    @staticmethod
+    def _safe_value(name, value):
+        if name not in URL_ATTRIBUTES:
+            return True
+        # Browsers ignore whitespace and control characters inside schemes.
+        compact = re.sub(r'[\x00-\x20]+', '', value)
+        try:
+            return urlsplit(compact).scheme.lower() in ALLOWED_SCHEMES
+        except ValueError:
+            return False
+
+
+def sanitize_html(html):
+    """Return ``(clean_html, sanitizer)`` for untrusted ``html``."""
+    sanitizer = _Sanitizer()
+    sanitizer.feed(html)
+    sanitizer.close()
+    return ''.join(sanitizer.output), sanitizer
+
+
+def make_excerpt(paragraphs, length=EXCERPT_LENGTH):
+    """Return about ``length`` characters of plain text, cut at a word boundary."""
+    text = ' '.join(paragraph for paragraph in paragraphs if paragraph)
+    if len(text) <= length:
+        return text
+    cut = text[:length].rsplit(' ', 1)[0].rstrip(' ,;:.-')
+    return f'{cut}…'
+
+
+def build_toc(headings):
+    """Nest ``(level, id, title)`` headings into a table of contents."""
+    root = {'level': 0, 'children': []}
+    stack = [root]
+    for level, anchor, title in headings:
+        while stack[-1]['level'] >= level:
+            stack.pop()
+        entry = {'level': level, 'id': anchor, 'title': title, 'children': []}
+        stack[-1]['children'].append(entry)
+        stack.append(entry)
+    return root['children']
+
+
+def render_post(content):
+    """Render Markdown ``content`` and compute the fields derived from it.
+
+    Returns:
+        RenderedPost: Sanitized HTML, word count, read time in minutes,
+        excerpt and nested table of contents
+    """
+    source = markdown.markdown(content or '', extensions=MARKDOWN_EXTENSIONS)
+    html, sanitizer = sanitize_html(source)
+    word_count = len(''.join(sanitizer.text).split())
+    return RenderedPost(
+        html=html,
+        word_count=word_count,
+        read_time=math.ceil(word_count / WORDS_PER_MINUTE),
+        excerpt=make_excerpt(sanitizer.paragraphs),
+        table_of_contents=build_toc(sanitizer.headings),
+    )
+
+
+def content_hash(content):
+    return hashlib.sha256((content or '').encode()).hexdigest()
+
+
+def excerpt_from_html(html):
+    """Return the excerpt :func:`render_post` produced for already rendered ``html``."""
+    return make_excerpt(sanitize_html(html)[1].paragraphs)
@@ -0,0 +1,51 @@
+# content/search/__init__.py
+
+"""Pluggable full-text search for published content.
+
+The backend is chosen with the ``CONTENT_SEARCH_BACKEND`` setting (a dotted
+path). When unset, PostgreSQL databases use
+:class:`~content.search.postgres.PostgresSearchBackend` and everything else
+falls back to :class:`~content.search.memory.InMemorySearchBackend`.
+
+Typical usage example:
+    from content.search import get_search_backend
+
+    posts = get_search_backend().filter(BlogPost.objects.all(), "data strategy")
+"""
+
+from django.conf import settings
+from django.db import connection
+from django.utils.module_loading import import_string
+
+from .base import DOCUMENTS, BaseSearchBackend, SearchHit
+
+POSTGRES_BACKEND = 'content.search.postgres.PostgresSearchBackend'
+MEMORY_BACKEND = 'content.search.memory.InMemorySearchBackend'
+
+_backend = None
+
+
+def get_search_backend():
+    """Return the process-wide search backend instance."""
+    global _backend
+    if _backend is None:
+        path = getattr(settings, 'CONTENT_SEARCH_BACKEND', None)
+        if path is None:
+            path = POSTGRES_BACKEND if connection.vendor == 'postgresql' else MEMORY_BACKEND
+        _backend = import_string(path)()
+    return _backend
+
+
+def reset_search_backend():
+    """Forget the cached backend so the next call re-reads settings."""
+    global _backend
+    _backend = None
+
+
+__all__ = [
+    'DOCUMENTS',
+    'BaseSearchBackend',
+    'SearchHit',
+    'get_search_backend',
+    'reset_search_backend',
+]
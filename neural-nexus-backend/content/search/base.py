@@ -0,0 +1,130 @@
+# content/search/base.py
+
+"""Shared definitions for content search backends."""
+
+from dataclasses import dataclass
+
+from django.db.models import Case, IntegerField, When
+
+from ..models import BlogPost, CaseStudy
+
+
+@dataclass(frozen=True)
+class SearchField:
+    """A searchable column and its relevance weight (A is highest, D lowest)."""
+
+    name: str
+    weight: str = 'D'
+
+
+@dataclass(frozen=True)
+class SearchDocument:
+    """Describes how a model is indexed.
+
+    Attributes:
+        fields: Weighted columns read from the model row
+        related: Weighted values read through a relation, as ``(lookup, weight)``
+        snippet_field: Column used to build highlighted snippets
+    """
+
+    fields: tuple
+    snippet_field: str
+    related: tuple = ()
+
+    def field_names(self):
+        return [field.name for field in self.fields]
+
+    def related_values(self, instance):
+        """Yield ``(text, weight)`` for each related value of ``instance``."""
+        for lookup, weight in self.related:
+            value = instance
+            for part in lookup.split('__'):
+                value = getattr(value, part, None) if value is not None else None
+            if value:
+                yield str(value), weight
+
+
+DOCUMENTS = {
+    BlogPost: SearchDocument(
+        fields=(
+            SearchField('title', 'A'),
+            SearchField('excerpt', 'B'),
+            SearchField('content', 'C'),
+        ),
+        related=(('category__name', 'B'),),
+        snippet_field='content',
+    ),
+    CaseStudy: SearchDocument(
+        fields=(
+            SearchField('title', 'A'),
+            SearchField('client_name', 'B'),
+            SearchField('industry', 'B'),
+            SearchField('excerpt', 'B'),
+            SearchField('challenge', 'C'),
+            SearchField('solution', 'C'),
+        ),
+        snippet_field='solution',
+    ),
+}
+
+
+@dataclass(frozen=True)
+class SearchHit:
+    """A ranked search result.
+
+    Attributes:
+        pk: Primary key of the matching row
+        rank: Relevance score, higher is better
+        snippet: HTML fragment with matches wrapped in ``<mark>``
+    """
+
+    pk: int
+    rank: float
+    snippet: str = ''
+
+
+def preserve_order(queryset, pks):
+    """Restrict ``queryset`` to ``pks`` and order rows as listed."""
+    if not pks:
+        return queryset.none()
+    ordering = Case(
+        *[When(pk=pk, then=position) for position, pk in enumerate(pks)],
+        output_field=IntegerField(),
+    )
+    return queryset.filter(pk__in=pks).order_by(ordering)
+
+
+class BaseSearchBackend:
+    """Interface implemented by search backends.
+
+    Backends rank rows of the models listed in :data:`DOCUMENTS` and keep
+    their index current through :meth:`index_instance` and
+    :meth:`remove_instance`, which are called from model signals.
+    """
+
+    documents = DOCUMENTS
+
+    def get_document(self, model):
+        try:
+            return self.documents[model]
+        except KeyError:
+            raise ValueError(f"{model.__name__} is not searchable")
+
+    def filter(self, queryset, query):
+        """Return ``queryset`` restricted to matches, best match first."""
+        raise NotImplementedError
+
+    def search(self, queryset, query, limit=20):
+        """Return up to ``limit`` :class:`SearchHit` objects for ``query``."""
+        raise NotImplementedError
+
+    def index_instance(self, instance):
+        raise NotImplementedError
+
+    def remove_instance(self, instance):
+        raise NotImplementedError
+
+    def reindex(self, queryset):
+        """Rebuild index entries for every row of ``queryset``."""
+        for instance in queryset.iterator():
+            self.index_instance(instance)
@@ -0,0 +1,21 @@
+# content/search/filters.py
+
+from rest_framework.filters import BaseFilterBackend
+
+from . import get_search_backend
+
+
+class FullTextSearchFilter(BaseFilterBackend):
+    """DRF filter backend delegating ``?search=`` to the content search backend.
+
+    Matches are returned best first, so list it after ``OrderingFilter`` when a
+    view uses both.
+    """
+
+    search_param = 'search'
+
+    def filter_queryset(self, request, queryset, view):
+        query = request.query_params.get(self.search_param, '').strip()
+        if not query:
+            return queryset
+        return get_search_backend().filter(queryset, query)
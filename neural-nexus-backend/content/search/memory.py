@@ -0,0 +1,178 @@
+# content/search/memory.py
+
+"""In-process inverted index search backend.
+
+Used with SQLite and in tests, where ``tsvector`` columns are unavailable. The
+index for a model is built from the database on first use and then kept
+current by the save/delete signals, so it is local to each worker process.
+"""
+
+import math
+import re
+import threading
+from collections import defaultdict
+
+from django.utils.html import escape
+
+from .base import BaseSearchBackend, SearchHit, preserve_order
+
+TOKEN_RE = re.compile(r"[\w']+")
+STOP_WORDS = frozenset(
+    "a an and are as at be by for from has in is it its of on or that the to "
+    "was were will with".split()
+)
+WEIGHTS = {'A': 1.0, 'B': 0.4, 'C': 0.2, 'D': 0.1}
+SNIPPET_WORDS = 30
+
+
+def stem(token):
+    """Strip common English suffixes so "strategies" matches "strategy"."""
+    if len(token) > 4:
+        if token.endswith('ies'):
+            return token[:-3] + 'y'
+        for suffix in ('ing', 'ed', 'es', 's'):
+            if token.endswith(suffix) and len(token) - len(suffix) >= 3:
+                return token[: -len(suffix)]
+    return token
+
+
+def analyze(text):
+    """Split ``text`` into normalised index terms."""
+    return [
+        stem(token)
+        for token in TOKEN_RE.findall(text.lower())
+        if token not in STOP_WORDS
+    ]
+
+
+class _ModelIndex:
+    """Postings for one model: ``term -> {pk: weighted term frequency}``."""
+
+    def __init__(self):
+        self.postings = defaultdict(dict)
+        self.doc_terms = {}
+        self.snippets = {}
+
+    def add(self, pk, weighted_texts, snippet_text):
+        self.remove(pk)
+        frequencies = defaultdict(float)
+        for text, weight in weighted_texts:
+            for term in analyze(text):
+                frequencies[term] += WEIGHTS.get(weight, WEIGHTS['D'])
+        for term, frequency in frequencies.items():
+            self.postings[term][pk] = frequency
+        self.doc_terms[pk] = tuple(frequencies)
+        self.snippets[pk] = snippet_text
+
+    def remove(self, pk):
+        for term in self.doc_terms.pop(pk, ()):
+            postings = self.postings.get(term)
+            if postings is not None:
+                postings.pop(pk, None)
+                if not postings:
+                    del self.postings[term]
+        self.snippets.pop(pk, None)
+
+    def rank(self, terms):
+        """Return ``[(pk, score)]`` for documents containing every term."""
+        if not terms:
+            return []
+        postings = [self.postings.get(term, {}) for term in terms]
+        if not all(postings):
+            return []
+        postings.sort(key=len)
+        candidates = set(postings[0]).intersection(*postings[1:])
+        total = len(self.doc_terms) or 1
+        scores = []
+        for pk in candidates:
+            score = sum(
+                posting[pk] * math.log(1 + total / len(posting)) for posting in postings
+            )
+            scores.append((pk, score))
+        scores.sort(key=lambda item: (-item[1], -item[0]))
+        return scores
+
+
+class InMemorySearchBackend(BaseSearchBackend):
+    """Search backend keeping an inverted index per model in process memory."""
+
+    def __init__(self):
+        self._indexes = {}
+        self._lock = threading.Lock()
+
+    def get_index(self, model):
+        index = self._indexes.get(model)
+        if index is None:
+            with self._lock:
+                index = self._indexes.get(model)
+                if index is None:
+                    index = self._build(model)
+                    self._indexes[model] = index
+        return index
+
+    def _build(self, model):
+        index = _ModelIndex()
+        document = self.get_document(model)
+        queryset = model.objects.all()
+        if document.related:
+            queryset = queryset.select_related(
+                *{lookup.rsplit('__', 1)[0] for lookup, _ in document.related}
+            )
+        for instance in queryset.iterator():
+            self._add(index, document, instance)
+        return index
+
+    def _add(self, index, document, instance):
+        weighted = [
+            (getattr(instance, field.name) or '', field.weight) for field in document.fields
+        ]
+        weighted += list(document.related_values(instance))
+        snippet_text = getattr(instance, document.snippet_field) or ''
+        index.add(instance.pk, weighted, snippet_text)
+
+    def filter(self, queryset, query):
+        ranked = self.get_index(queryset.model).rank(analyze(query))
+        return preserve_order(queryset, [pk for pk, _ in ranked])
+
+    def search(self, queryset, query, limit=20):
+        index = self.get_index(queryset.model)
+        terms = analyze(query)
+        ranked = dict(index.rank(terms))
+        allowed = preserve_order(queryset, list(ranked)).values_list('pk', flat=True)[:limit]
+        return [
+            SearchHit(pk, ranked[pk], self.highlight(index.snippets.get(pk, ''), terms))
+            for pk in allowed
+        ]
+
+    def highlight(self, text, terms):
+        """Return a window of ``text`` around the first match, matches marked."""
+        words = text.split()
+        wanted = set(terms)
+        matches = [
+            position for position, word in enumerate(words) if set(analyze(word)) & wanted
+        ]
+        start = max(0, matches[0] - SNIPPET_WORDS // 3) if matches else 0
+        window = words[start:start + SNIPPET_WORDS]
+        marked = [
+            f'<mark>{escape(word)}</mark>' if set(analyze(word)) & wanted else escape(word)
+            for word in window
+        ]
+        return ' '.join(marked)
+
+    def index_instance(self, instance):
+        model = type(instance)
+        index = self._indexes.get(model)
+        if index is not None:
+            self._add(index, self.get_document(model), instance)
+
+    def remove_instance(self, instance):
+        index = self._indexes.get(type(instance))
+        if index is not None:
+            index.remove(instance.pk)
+
+    def reindex(self, queryset):
+        self._indexes.pop(queryset.model, None)
+
+    def reset(self):
+        """Drop every index; they are rebuilt on next use."""
+        self._indexes.clear()
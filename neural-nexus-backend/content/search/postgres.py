@@ -0,0 +1,97 @@
+# content/search/postgres.py
+
+"""PostgreSQL full-text search backed by stored ``tsvector`` columns.
+
+``BlogPost.search_vector`` and ``CaseStudy.search_vector`` hold weighted
+vectors maintained on save and covered by GIN indexes, so a search is an index
+scan plus ``ts_rank`` over the matches instead of an ``ILIKE`` scan of every
+post body.
+
+``ts_headline`` copies the source text verbatim, so snippets are selected
+with control-character markers, escaped, and only then marked up.
+"""
+
+from functools import reduce
+from operator import add
+
+from django.conf import settings
+from django.contrib.postgres.search import (
+    SearchHeadline,
+    SearchQuery,
+    SearchRank,
+    SearchVector,
+)
+from django.db.models import F, Value
+from django.utils.html import escape
+
+from .base import BaseSearchBackend, SearchHit
+
+START_SEL, STOP_SEL = '\x02', '\x03'
+
+
+def mark(headline):
+    """Escape a headline and turn its selection markers into ``<mark>`` tags."""
+    return (
+        escape(headline or '')
+        .replace(START_SEL, '<mark>')
+        .replace(STOP_SEL, '</mark>')
+    )
+
+
+class PostgresSearchBackend(BaseSearchBackend):
+    """Search backend using ``to_tsvector``/``websearch_to_tsquery``."""
+
+    def __init__(self):
+        self.config = getattr(settings, 'CONTENT_SEARCH_CONFIG', 'english')
+
+    def build_query(self, query):
+        return SearchQuery(query, search_type='websearch', config=self.config)
+
+    def build_vector(self, instance):
+        document = self.get_document(type(instance))
+        vectors = [
+            SearchVector(field.name, weight=field.weight, config=self.config)
+            for field in document.fields
+        ]
+        vectors += [
+            SearchVector(Value(text), weight=weight, config=self.config)
+            for text, weight in document.related_values(instance)
+        ]
+        return reduce(add, vectors)
+
+    def filter(self, queryset, query):
+        search_query = self.build_query(query)
+        return (
+            queryset.filter(search_vector=search_query)
+            .annotate(search_rank=SearchRank(F('search_vector'), search_query))
+            .order_by('-search_rank', '-pk')
+        )
+
+    def search(self, queryset, query, limit=20):
+        document = self.get_document(queryset.model)
+        search_query = self.build_query(query)
+        rows = (
+            self.filter(queryset, query)
+            .annotate(
+                search_snippet=SearchHeadline(
+                    document.snippet_field,
+                    search_query,
+                    config=self.config,
+                    start_sel=START_SEL,
+                    stop_sel=STOP_SEL,
+                    max_words=35,
+                    min_words=15,
+                )
+            )
+            .values_list('pk', 'search_rank', 'search_snippet')[:limit]
+        )
+        return [SearchHit(pk, rank, mark(snippet)) for pk, rank, snippet in rows]
+
+    def index_instance(self, instance):
+        type(instance).objects.filter(pk=instance.pk).update(
+            search_vector=self.build_vector(instance)
+        )
+
+    def remove_instance(self, instance):
+        # The vector lives on the deleted row itself.
+        pass
@@ -5,24 +5,41 @@
 This module contains serializers for converting content models to/from JSON,
 handling data validation, and managing nested relationships between models.
 
+Serializers that read related objects declare them with ``select_related`` and
+``prefetch_related`` lists on their ``Meta`` class; viewsets apply them through
+``content.query_planner.plan_queryset``.
+
 Serializers:
     TagSerializer: Handles content tags
     CategorySerializer: Manages content categories
     BlogPostSerializer: Processes blog post content with related data
+    BlogPostListSerializer: Blog post summaries without the body
     ResourceSerializer: Handles downloadable resources
     LeadMagnetSerializer: Manages lead generation content
     CampaignSerializer: Handles marketing campaigns
     LandingPageSerializer: Processes campaign landing pages
     ABTestSerializer: Manages A/B testing configurations
+    TrackingEventSerializer: Validates frontend tracking events
 """
 
+from datetime import datetime, timezone as dt_timezone
+
+import numpy as np
+from django.core.validators import (
+    MaxLengthValidator, MinLengthValidator, ProhibitNullCharactersValidator,
+)
+from django.utils.dateparse import parse_datetime
 from rest_framework import serializers
+from rest_framework.fields import SkipField, empty
+from rest_framework.settings import api_settings
+from rest_framework.validators import ProhibitSurrogateCharactersValidator
 from .models import (
     BlogPost, Category, Tag, BlogAnalytics, Resource,
     ResourceDownload, LeadMagnet, Campaign, LandingPage,
-    ABTest, Variant, VariantVisit, CaseStudy, CaseStudyCategory  # Added CaseStudyCategory here
+    ABTest, Variant, VariantVisit, CaseStudy, CaseStudyCategory, TrackingEvent  # Added CaseStudyCategory here
 )
 from leads.models import NewsletterSubscription  # Add this import
+from .counts import published_case_counts
 
 class TagSerializer(serializers.ModelSerializer):
     """Serializer for content tags.
@@ -94,9 +111,15 @@ class BlogPostSerializer(serializers.ModelSerializer):
             'tags', 'tag_ids', 'content', 'excerpt', 'featured_image',
             'status', 'is_featured', 'seo_title', 'seo_description',
             'seo_keywords', 'estimated_read_time', 'published_at',
-            'created_at', 'updated_at', 'view_count', 'analytics'
+            'created_at', 'updated_at', 'view_count', 'analytics',
+            'content_html', 'word_count', 'table_of_contents'
         ]
-        read_only_fields = ['slug', 'created_at', 'updated_at', 'view_count']
+        read_only_fields = [
+            'slug', 'created_at', 'updated_at', 'view_count', 'estimated_read_time',
+            'content_html', 'word_count', 'table_of_contents'
+        ]
+        select_related = ['category', 'analytics', 'author']
+        prefetch_related = ['tags']
 
     def create(self, validated_data):
         """Creates a blog post with associated tags.
@@ -119,6 +142,30 @@ class BlogPostSerializer(serializers.ModelSerializer):
             blog_post.tags.set(tag_ids)
         return blog_post
 
+class BlogPostListSerializer(serializers.ModelSerializer):
+    """Read-only blog post summary for list endpoints.
+
+    Leaves out the body and everything rendered from it; cards only need the
+    precomputed excerpt and read time.
+    """
+    category = CategorySerializer(read_only=True)
+    tags = TagSerializer(many=True, read_only=True)
+    analytics = BlogAnalyticsSerializer(read_only=True)
+
+    class Meta:
+        model = BlogPost
+        fields = [
+            'id', 'title', 'slug', 'author', 'category', 'tags', 'excerpt',
+            'featured_image', 'status', 'is_featured', 'seo_title',
+            'seo_description', 'seo_keywords', 'estimated_read_time',
+            'word_count', 'published_at', 'created_at', 'updated_at',
+            'view_count', 'analytics'
+        ]
+        read_only_fields = fields
+        select_related = ['category', 'analytics', 'author']
+        prefetch_related = ['tags']
+        defer = ['content', 'content_html', 'table_of_contents', 'search_vector']
+
 class ResourceDownloadSerializer(serializers.ModelSerializer):
     class Meta:
         model = ResourceDownload
@@ -156,6 +203,7 @@ class ResourceSerializer(serializers.ModelSerializer):
             'created_at', 'updated_at'
         ]
         read_only_fields = ['slug', 'download_count', 'created_at', 'updated_at']
+        prefetch_related = ['tags']
 
     def create(self, validated_data):
         tag_ids = validated_data.pop('tag_ids', [])
@@ -176,6 +224,7 @@ class LeadMagnetSerializer(serializers.ModelSerializer):
             'created_at', 'updated_at'
         ]
         read_only_fields = ['slug', 'conversion_rate', 'created_at', 'updated_at']
+        select_related = ['resource']
 
 class CampaignSerializer(serializers.ModelSerializer):
     class Meta:
@@ -211,6 +260,7 @@ class ABTestSerializer(serializers.ModelSerializer):
             'created_by', 'variants'
         ]
         read_only_fields = ['created_by']
+        prefetch_related = ['variants']
 
 class LandingPageSerializer(serializers.ModelSerializer):
     ab_tests = ABTestSerializer(many=True, read_only=True)
@@ -223,6 +273,7 @@ class LandingPageSerializer(serializers.ModelSerializer):
             'created_by', 'created_at', 'updated_at', 'ab_tests'
         ]
         read_only_fields = ['created_by', 'created_at', 'updated_at']
+        prefetch_related = ['ab_tests']
 
 class VariantVisitSerializer(serializers.ModelSerializer):
     class Meta:
@@ -244,21 +295,186 @@ class CaseStudyCategorySerializer(serializers.ModelSerializer):
         read_only_fields = ['slug']
 
     def get_case_count(self, obj):
-        return obj.case_studies.filter(status='PUBLISHED').count()
+        # Viewsets listing categories annotate the count; nested uses fall
+        # back to the cached counts for all categories.
+        annotated = getattr(obj, 'published_case_count', None)
+        if annotated is not None:
+            return annotated
+        return published_case_counts().get(obj.pk, 0)
 
 class CaseStudySerializer(serializers.ModelSerializer):
     """Serializer for case studies with nested category data."""
     category = CaseStudyCategorySerializer(read_only=True)
     category_id = serializers.IntegerField(write_only=True)
+    tags = TagSerializer(many=True, read_only=True)
 
     class Meta:
         model = CaseStudy
         fields = [
             'id', 'title', 'slug', 'industry', 'client_name', 'category',
-            'category_id', 'challenge', 'solution', 'results',
+            'category_id', 'tags', 'challenge', 'solution', 'results',
             'implementation_timeline', 'testimonial', 'excerpt',
             'featured_image', 'status', 'is_featured', 'view_count',
             'seo_title', 'seo_description', 'seo_keywords',
             'published_at', 'created_at', 'updated_at'
         ]
         read_only_fields = ['slug', 'view_count', 'created_at', 'updated_at']
+        select_related = ['category']
+        prefetch_related = ['tags']
+
+
+class EventTimestampField(serializers.Field):
+    """Accepts epoch milliseconds (as sent by ``Date.now()``) or ISO 8601."""
+    default_error_messages = {'invalid': 'Expected epoch milliseconds or an ISO 8601 datetime.'}
+
+    def to_internal_value(self, data):
+        if isinstance(data, (int, float)) and not isinstance(data, bool):
+            try:
+                return datetime.fromtimestamp(data / 1000, tz=dt_timezone.utc)
+            except (OverflowError, OSError, ValueError):
+                self.fail('invalid')
+        if isinstance(data, str):
+            try:
+                parsed = parse_datetime(data)
+            except ValueError:
+                # Well formed but impossible, e.g. February 30th.
+                self.fail('invalid')
+            if parsed is not None:
+                return parsed
+        self.fail('invalid')
+
+    def to_representation(self, value):
+        return value.isoformat()
+
+
+class TrackingEventSerializer(serializers.ModelSerializer):
+    """Serializer for events posted by the frontend tracking service.
+
+    Field names follow the camelCase payload of ``trackingService.ts``. The
+    session and anonymous ids are copied out of ``identity`` so they can be
+    indexed.
+    """
+    eventName = serializers.CharField(source='event_name', max_length=100)
+    timestamp = EventTimestampField(source='occurred_at')
+    identity = serializers.DictField()
+    properties = serializers.DictField(required=False, default=dict)
+
+    class Meta:
+        model = TrackingEvent
+        fields = ['eventName', 'timestamp', 'identity', 'source', 'path', 'properties']
+
+    def validate(self, attrs):
+        identity = attrs['identity']
+        attrs['session_id'] = str(identity.get('sessionId') or '')[:100]
+        attrs['anonymous_id'] = str(identity.get('anonymousId') or '')[:100]
+        return attrs
+
+    @classmethod
+    def validate_batch(cls, events):
+        """Validate many events column by column.
+
+        Each field's values are pulled out of every event and checked
+        together: string columns by type and length in one pass, numeric
+        timestamps converted in one numpy operation. Values a column check
+        cannot settle (missing keys, ISO strings, anything invalid) go
+        through the field's own validation, so rules and messages match a
+        single event.
+
+        Returns:
+            tuple: ``(valid, errors)``; ``valid`` maps the index of each valid
+            event to its validated attributes, ``errors`` maps the index of
+            each invalid event to its errors by field.
+        """
+        serializer = cls()
+        errors = {}
+        valid = {}
+        for index, event in enumerate(events):
+            if isinstance(event, dict):
+                valid[index] = {}
+            else:
+                message = serializer.error_messages['invalid'].format(
+                    datatype=type(event).__name__
+                )
+                errors[index] = {api_settings.NON_FIELD_ERRORS_KEY: [message]}
+
+        indexes = list(valid)
+        for field in serializer._writable_fields:
+            column = [events[index].get(field.field_name, empty) for index in indexes]
+            checked = _validate_column(field, column)
+            for index, raw, value in zip(indexes, column, checked):
+                if value is empty:
+                    try:
+                        value = field.run_validation(raw)
+                    except serializers.ValidationError as exc:
+                        errors.setdefault(index, {})[field.field_name] = exc.detail
+                        continue
+                    except SkipField:
+                        continue
+                serializer.set_value(valid[index], field.source_attrs, value)
+
+        return {
+            index: serializer.validate(attrs)
+            for index, attrs in valid.items()
+            if index not in errors
+        }, errors
+
+
+# Epoch milliseconds that ``datetime`` can represent, with a day of margin.
+_MIN_EPOCH_MS = (datetime.min.replace(tzinfo=dt_timezone.utc).timestamp() + 86400) * 1000
+_MAX_EPOCH_MS = (datetime.max.replace(tzinfo=dt_timezone.utc).timestamp() - 86400) * 1000
+
+
+# Validators ``_char_column`` applies itself.
+_CHAR_VALIDATORS = {
+    MaxLengthValidator, MinLengthValidator,
+    ProhibitNullCharactersValidator, ProhibitSurrogateCharactersValidator,
+}
+
+
+def _validate_column(field, values):
+    """Validate one field's values from many events at once.
+
+    Returns:
+        list: The validated value for each entry of ``values``, or ``empty``
+        where the column check could not decide and the field must validate
+        the value itself.
+    """
+    if isinstance(field, EventTimestampField):
+        return _timestamp_column(values)
+    if type(field) is serializers.CharField and all(
+        type(validator) in _CHAR_VALIDATORS for validator in field.validators
+    ):
+        return _char_column(field, values)
+    return [empty] * len(values)
+
+
+def _char_column(field, values):
+    """Accept plain ASCII strings within the field's length limits."""
+    low = field.min_length or (0 if field.allow_blank else 1)
+    high = field.max_length or float('inf')
+    checked = []
+    for value in values:
+        if type(value) is str:
+            if field.trim_whitespace:
+                value = value.strip()
+            # ASCII without NUL satisfies DRF's null and surrogate validators.
+            if low <= len(value) <= high and value.isascii() and '\x00' not in value:
+                checked.append(value)
+                continue
+        checked.append(empty)
+    return checked
+
+
+def _timestamp_column(values):
+    """Convert every epoch-millisecond value in one numpy pass."""
+    checked = [empty] * len(values)
+    positions = [
+        position for position, value in enumerate(values)
+        if type(value) in (int, float) and _MIN_EPOCH_MS < value < _MAX_EPOCH_MS
+    ]
+    if positions:
+        micros = np.rint(np.array([values[p] for p in positions], dtype=np.float64) * 1000)
+        stamps = micros.astype(np.int64).astype('datetime64[us]').tolist()
+        for position, stamp in zip(positions, stamps):
+            checked[position] = stamp.replace(tzinfo=dt_timezone.utc)
+    return checked
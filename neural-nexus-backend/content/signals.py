@@ -0,0 +1,128 @@
+# content/signals.py
+
+"""Signal handlers keeping derived content data in sync with model changes."""
+
+from django.db.models.signals import m2m_changed, post_delete, post_save, pre_delete
+from django.dispatch import receiver
+
+from services.models import Service, ServiceFeature
+
+from .ab_testing import ab_test_version
+from .autocomplete import schedule_invalidation as invalidate_autocomplete
+from .counts import case_count_version
+from .models import ABTest, BlogPost, CaseStudy, Category, Resource, Tag, Variant
+from .related import schedule_update as schedule_related_update
+from .search import get_search_backend
+from .tag_feed import tag_feed_version
+
+
+@receiver(post_save, sender=BlogPost)
+@receiver(post_save, sender=CaseStudy)
+def update_search_index(sender, instance, raw=False, **kwargs):
+    """Re-index content whenever it is saved."""
+    if raw:
+        return
+    get_search_backend().index_instance(instance)
+
+
+@receiver(post_delete, sender=BlogPost)
+@receiver(post_delete, sender=CaseStudy)
+def remove_from_search_index(sender, instance, **kwargs):
+    get_search_backend().remove_instance(instance)
+
+
+@receiver(post_save, sender=Category)
+def reindex_category_posts(sender, instance, created=False, raw=False, **kwargs):
+    """Category names are indexed with their posts, so renames re-index them."""
+    if raw or created:
+        return
+    get_search_backend().reindex(BlogPost.objects.filter(category=instance))
+
+
+@receiver(post_save, sender=ABTest)
+@receiver(post_delete, sender=ABTest)
+@receiver(post_save, sender=Variant)
+@receiver(post_delete, sender=Variant)
+def invalidate_ab_test_config(sender, **kwargs):
+    """Make workers reload their cached A/B test configuration."""
+    ab_test_version.bump()
+
+
+def bump_tag_feeds(tag_ids):
+    for tag_id in set(tag_ids):
+        tag_feed_version(tag_id).bump()
+
+
+@receiver(post_save, sender=BlogPost)
+@receiver(post_save, sender=Resource)
+@receiver(post_save, sender=CaseStudy)
+@receiver(pre_delete, sender=BlogPost)
+@receiver(pre_delete, sender=Resource)
+@receiver(pre_delete, sender=CaseStudy)
+def invalidate_tag_feeds(sender, instance, raw=False, **kwargs):
+    """Drop cached feed pages for every tag on changed content."""
+    if raw:
+        return
+    bump_tag_feeds(instance.tags.values_list('pk', flat=True))
+
+
+@receiver(m2m_changed, sender=BlogPost.tags.through)
+@receiver(m2m_changed, sender=Resource.tags.through)
+@receiver(m2m_changed, sender=CaseStudy.tags.through)
+def invalidate_retagged_feeds(sender, instance, action, reverse, pk_set, **kwargs):
+    if reverse:
+        # Changed from the tag's side: only that tag's feed is affected.
+        if action in ('post_add', 'post_remove', 'pre_clear'):
+            bump_tag_feeds([instance.pk])
+    elif action in ('post_add', 'post_remove'):
+        bump_tag_feeds(pk_set or ())
+    elif action == 'pre_clear':
+        bump_tag_feeds(instance.tags.values_list('pk', flat=True))
+
+
+@receiver(post_save, sender=CaseStudy)
+@receiver(post_delete, sender=CaseStudy)
+def invalidate_case_counts(sender, raw=False, **kwargs):
+    """Status or category changes move category counts."""
+    if not raw:
+        case_count_version.bump()
+
+
+RELATED_KINDS = {BlogPost: 'post', CaseStudy: 'case-study'}
+
+
+@receiver(post_save, sender=BlogPost)
+@receiver(post_save, sender=CaseStudy)
+@receiver(post_delete, sender=BlogPost)
+@receiver(post_delete, sender=CaseStudy)
+def update_related_content(sender, instance, raw=False, **kwargs):
+    """Refresh precomputed neighbours after the change commits."""
+    if not raw:
+        schedule_related_update(RELATED_KINDS[sender], instance.pk)
+
+
+@receiver(m2m_changed, sender=BlogPost.tags.through)
+@receiver(m2m_changed, sender=CaseStudy.tags.through)
+def update_retagged_related_content(sender, instance, action, reverse, model, pk_set, **kwargs):
+    if action not in ('post_add', 'post_remove', 'post_clear'):
+        return
+    if not reverse:
+        schedule_related_update(RELATED_KINDS[type(instance)], instance.pk)
+    elif pk_set:
+        for pk in pk_set:
+            schedule_related_update(RELATED_KINDS[model], pk)
+
+
+@receiver(post_save, sender=Service)
+@receiver(post_save, sender=ServiceFeature)
+@receiver(post_save, sender=BlogPost)
+@receiver(post_save, sender=CaseStudy)
+@receiver(post_save, sender=Tag)
+@receiver(post_delete, sender=Service)
+@receiver(post_delete, sender=ServiceFeature)
+@receiver(post_delete, sender=BlogPost)
+@receiver(post_delete, sender=CaseStudy)
+@receiver(post_delete, sender=Tag)
+def invalidate_autocomplete_index(sender, raw=False, **kwargs):
+    if not raw:
+        invalidate_autocomplete()
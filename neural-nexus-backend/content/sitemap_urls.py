@@ -0,0 +1,11 @@
+# content/sitemap_urls.py
+from django.urls import path
+
+from . import views
+
+urlpatterns = [
+    path("sitemap.xml", views.sitemap_index, name="sitemap-index"),
+    path("sitemap-<slug:section>-<int:page>.xml", views.sitemap_section, name="sitemap-section"),
+    path("feeds/<slug:section>.rss", views.content_feed, {"format": "rss"}, name="feed-rss"),
+    path("feeds/<slug:section>.atom", views.content_feed, {"format": "atom"}, name="feed-atom"),
+]
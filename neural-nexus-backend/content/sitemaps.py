@@ -0,0 +1,354 @@
+# content/sitemaps.py
+
+"""Streaming sitemaps and RSS/Atom feeds for published content.
+
+Every published blog post, case study, resource and active service is listed
+in ``sitemap-<section>-<page>.xml`` files of at most ``URLS_PER_SITEMAP``
+URLs, referenced from ``sitemap.xml``. Posts, case studies and resources also
+get RSS 2.0 and Atom feeds of their newest ``FEED_ITEMS`` entries.
+
+Documents are written as they are generated: rows are read with
+``queryset.iterator()`` over the few columns each document needs, and XML is
+yielded in chunks, so memory does not grow with the number of rows. The bytes
+are copied to a file under ``CACHE_DIR`` while they stream. The file name
+includes a hash of the section's ``MAX(updated_at)`` and row count, so later
+requests stream that file until a row of the section is saved, added or
+removed. Each request therefore costs one aggregate query per section
+involved, and answers ``304 Not Modified`` when the client's validators match.
+
+Page URLs are built from ``SITE_URL`` (the public frontend, defaulting to
+the requested host) and each section's path template. Sitemap and feed URLs
+use the requested host.
+
+Options come from the ``SITEMAPS`` setting (``SITE_URL``, ``SITE_NAME``,
+``CACHE_DIR``, ``URLS_PER_SITEMAP``, ``FEED_ITEMS``, ``CHUNK_SIZE``).
+"""
+
+import hashlib
+import logging
+import math
+import os
+import tempfile
+from dataclasses import dataclass
+from email.utils import format_datetime
+from pathlib import Path
+from xml.sax.saxutils import escape, quoteattr
+
+from django.conf import settings
+from django.db.models import Count, F, Max
+from django.utils.http import quote_etag
+
+from services.models import Service
+
+from .models import BlogPost, CaseStudy, Resource
+
+logger = logging.getLogger(__name__)
+
+DEFAULTS = {
+    'SITE_URL': None,
+    'SITE_NAME': 'Neural Nexus Strategies',
+    'CACHE_DIR': None,
+    'URLS_PER_SITEMAP': 50000,
+    'FEED_ITEMS': 50,
+    'CHUNK_SIZE': 1000,
+}
+READ_SIZE = 64 * 1024
+XML_DECLARATION = '<?xml version="1.0" encoding="UTF-8"?>\n'
+SITEMAP_NS = 'http://www.sitemaps.org/schemas/sitemap/0.9'
+ATOM_NS = 'http://www.w3.org/2005/Atom'
+CONTENT_NS = 'http://purl.org/rss/1.0/modules/content/'
+FEED_FORMATS = {
+    'rss': 'application/rss+xml; charset=utf-8',
+    'atom': 'application/atom+xml; charset=utf-8',
+}
+
+
+def get_option(name):
+    return {**DEFAULTS, **getattr(settings, 'SITEMAPS', {})}[name]
+
+
+def get_site_url(request):
+    """Return the public site root, without a trailing slash."""
+    return (get_option('SITE_URL') or request.build_absolute_uri('/')).rstrip('/')
+
+
+def cache_dir():
+    return Path(get_option('CACHE_DIR') or Path(settings.BASE_DIR) / 'cache' / 'sitemaps')
+
+
+@dataclass(frozen=True)
+class Section:
+    """A model whose published rows are listed in sitemaps and feeds.
+
+    Attributes:
+        name (str): URL segment of the section
+        title (str): Human-readable name used in feed titles
+        model: Model whose rows are listed
+        path (str): Frontend path of a row, formatted with its ``slug``
+        filters (tuple): ``(lookup, value)`` pairs selecting published rows
+        title_field (str): Column holding an entry's title
+        summary_field (str): Column holding an entry's plain-text summary
+        content_field (str): Column holding an entry's HTML, if any
+        date_field (str): Publication date; ``updated_at`` when empty
+        changefreq (str): Sitemap ``changefreq`` hint
+        priority (str): Sitemap ``priority`` hint
+        feed (bool): Whether the section has RSS/Atom feeds
+    """
+
+    name: str
+    title: str
+    model: type
+    path: str
+    filters: tuple = ()
+    title_field: str = 'title'
+    summary_field: str = 'excerpt'
+    content_field: str = None
+    date_field: str = 'published_at'
+    changefreq: str = 'weekly'
+    priority: str = '0.5'
+    feed: bool = True
+
+    def queryset(self):
+        return self.model.objects.filter(**dict(self.filters)).order_by()
+
+    def stamp(self):
+        """Return ``(max updated_at, row count)`` in one aggregate query."""
+        aggregate = self.queryset().aggregate(last_modified=Max('updated_at'), count=Count('pk'))
+        return aggregate['last_modified'], aggregate['count']
+
+    def url(self, site_url, slug):
+        return f'{site_url}{self.path.format(slug=slug)}'
+
+    def feed_fields(self):
+        fields = ['pk', 'slug', 'updated_at', self.title_field, self.summary_field]
+        if self.date_field:
+            fields.append(self.date_field)
+        if self.content_field:
+            fields.append(self.content_field)
+        return fields
+
+
+SECTIONS = (
+    Section(
+        'posts', 'Blog', BlogPost, '/blog/{slug}',
+        filters=(('status', 'PUBLISHED'),),
+        content_field='content_html',
+        priority='0.8',
+    ),
+    Section(
+        'case-studies', 'Case Studies', CaseStudy, '/case-studies/{slug}',
+        filters=(('status', 'PUBLISHED'),),
+        priority='0.8',
+    ),
+    Section(
+        'resources', 'Resources', Resource, '/resources/{slug}',
+        summary_field='description',
+        date_field='created_at',
+    ),
+    Section(
+        'services', 'Services', Service, '/services/{slug}',
+        filters=(('is_active', True),),
+        title_field='name',
+        summary_field='description',
+        date_field='created_at',
+        changefreq='monthly',
+        priority='0.6',
+        feed=False,
+    ),
+)
+SECTIONS_BY_NAME = {section.name: section for section in SECTIONS}
+
+
+def w3c_date(value):
+    return value.replace(microsecond=0).isoformat() if value else ''
+
+
+def page_count(count):
+    return max(1, math.ceil(count / get_option('URLS_PER_SITEMAP')))
+
+
+def _chunked(parts, size):
+    """Join an iterable of strings into UTF-8 chunks of ``size`` parts."""
+    buffer = []
+    for part in parts:
+        buffer.append(part)
+        if len(buffer) >= size:
+            yield ''.join(buffer).encode()
+            buffer = []
+    if buffer:
+        yield ''.join(buffer).encode()
+
+
+def sitemap_index(stamps, sitemap_url):
+    """Yield ``sitemap.xml``.
+
+    Args:
+        stamps (dict): ``{section name: (last_modified, count)}``
+        sitemap_url: Callable returning the absolute URL of a child sitemap
+            from a section name and page number
+    """
+    yield XML_DECLARATION
+    yield f'<sitemapindex xmlns="{SITEMAP_NS}">\n'
+    for section in SECTIONS:
+        last_modified, count = stamps[section.name]
+        if not count:
+            continue
+        for page in range(1, page_count(count) + 1):
+            yield (
+                f'<sitemap><loc>{escape(sitemap_url(section.name, page))}</loc>'
+                f'<lastmod>{w3c_date(last_modified)}</lastmod></sitemap>\n'
+            )
+    yield '</sitemapindex>\n'
+
+
+def sitemap_page(section, page, site_url):
+    """Yield one child sitemap, reading its rows in ``pk`` order."""
+    per_page = get_option('URLS_PER_SITEMAP')
+    start = (page - 1) * per_page
+    rows = (
+        section.queryset()
+        .order_by('pk')
+        .values_list('slug', 'updated_at')[start:start + per_page]
+        .iterator(chunk_size=get_option('CHUNK_SIZE'))
+    )
+    yield XML_DECLARATION
+    yield f'<urlset xmlns="{SITEMAP_NS}">\n'
+    for slug, updated_at in rows:
+        yield (
+            f'<url><loc>{escape(section.url(site_url, slug))}</loc>'
+            f'<lastmod>{w3c_date(updated_at)}</lastmod>'
+            f'<changefreq>{section.changefreq}</changefreq>'
+            f'<priority>{section.priority}</priority></url>\n'
+        )
+    yield '</urlset>\n'
+
+
+def _feed_entries(section, site_url):
+    date = F(section.date_field).desc(nulls_last=True)
+    queryset = (
+        section.queryset()
+        .only(*section.feed_fields())
+        .order_by(date, '-pk')[:get_option('FEED_ITEMS')]
+    )
+    for instance in queryset.iterator(chunk_size=get_option('CHUNK_SIZE')):
+        yield (
+            instance,
+            getattr(instance, section.date_field) or instance.updated_at,
+            section.url(site_url, instance.slug),
+        )
+
+
+def _text(instance, field):
+    return escape(getattr(instance, field) or '') if field else ''
+
+
+def rss_feed(section, last_modified, site_url, feed_url):
+    """Yield the RSS 2.0 feed of ``section``."""
+    yield XML_DECLARATION
+    yield f'<rss version="2.0" xmlns:atom="{ATOM_NS}" xmlns:content="{CONTENT_NS}"><channel>\n'
+    yield (
+        f'<title>{escape(get_option("SITE_NAME"))} - {escape(section.title)}</title>'
+        f'<link>{escape(site_url)}/</link>'
+        f'<description>{escape(section.title)}</description>'
+        f'<atom:link href={quoteattr(feed_url)} rel="self" type="application/rss+xml"/>\n'
+    )
+    if last_modified:
+        yield f'<lastBuildDate>{format_datetime(last_modified)}</lastBuildDate>\n'
+    for instance, published, url in _feed_entries(section, site_url):
+        content = _text(instance, section.content_field)
+        yield (
+            f'<item><title>{_text(instance, section.title_field)}</title>'
+            f'<link>{escape(url)}</link><guid isPermaLink="true">{escape(url)}</guid>'
+            f'<pubDate>{format_datetime(published)}</pubDate>'
+            f'<description>{_text(instance, section.summary_field)}</description>'
+            + (f'<content:encoded>{content}</content:encoded>' if content else '')
+            + '</item>\n'
+        )
+    yield '</channel></rss>\n'
+
+
+def atom_feed(section, last_modified, site_url, feed_url):
+    """Yield the Atom feed of ``section``."""
+    yield XML_DECLARATION
+    yield f'<feed xmlns="{ATOM_NS}">\n'
+    yield (
+        f'<title>{escape(get_option("SITE_NAME"))} - {escape(section.title)}</title>'
+        f'<id>{escape(feed_url)}</id>'
+        f'<link rel="self" href={quoteattr(feed_url)}/>'
+        f'<link rel="alternate" href={quoteattr(site_url + "/")}/>'
+        f'<updated>{w3c_date(last_modified)}</updated>'
+        f'<author><name>{escape(get_option("SITE_NAME"))}</name></author>\n'
+    )
+    for instance, published, url in _feed_entries(section, site_url):
+        content = _text(instance, section.content_field)
+        yield (
+            f'<entry><title>{_text(instance, section.title_field)}</title>'
+            f'<id>{escape(url)}</id><link rel="alternate" href={quoteattr(url)}/>'
+            f'<published>{w3c_date(published)}</published>'
+            f'<updated>{w3c_date(instance.updated_at)}</updated>'
+            f'<summary>{_text(instance, section.summary_field)}</summary>'
+            + (f'<content type="html">{content}</content>' if content else '')
+            + '</entry>\n'
+        )
+    yield '</feed>\n'
+
+
+FEED_WRITERS = {'rss': rss_feed, 'atom': atom_feed}
+
+
+def document_etag(name, parts):
+    """Return the weak ETag of document ``name`` built from ``parts``."""
+    return 'W/' + quote_etag(_digest(name, parts))
+
+
+def _digest(name, parts):
+    return hashlib.sha256(repr((name, parts)).encode()).hexdigest()[:32]
+
+
+def cached_stream(name, parts, generate):
+    """Return an iterator over the bytes of document ``name``.
+
+    The document is read from ``CACHE_DIR`` when a copy built from the same
+    ``parts`` (stamps and base URLs) exists. Otherwise ``generate()`` is streamed and written to the
+    cache as it goes; a response abandoned half way leaves no file behind.
+    """
+    path = cache_dir() / f'{name}.{_digest(name, parts)}.xml'
+    try:
+        handle = open(path, 'rb')
+    except FileNotFoundError:
+        return _write_through(path, _chunked(generate(), get_option('CHUNK_SIZE')))
+    return _read(handle)
+
+
+def _read(handle):
+    with handle:
+        while chunk := handle.read(READ_SIZE):
+            yield chunk
+
+
+def _write_through(path, chunks):
+    path.parent.mkdir(parents=True, exist_ok=True)
+    fd, tmp = tempfile.mkstemp(dir=path.parent, prefix='.tmp-')
+    complete = False
+    try:
+        with os.fdopen(fd, 'wb') as handle:
+            for chunk in chunks:
+                handle.write(chunk)
+                yield chunk
+        os.replace(tmp, path)
+        complete = True
+    finally:
+        if not complete:
+            os.unlink(tmp)
+    _prune(path)
+
+
+def _prune(current):
+    """Remove older copies of the document ``current`` replaces."""
+    name = current.name.rsplit('.', 2)[0]
+    for path in current.parent.glob(f'{name}.*.xml'):
+        if path != current:
+            try:
+                path.unlink()
+            except FileNotFoundError:
+                pass
@@ -0,0 +1,285 @@
+# content/snapshots.py
+
+"""Static JSON snapshots of published content.
+
+Each published blog post, case study, resource, category and service catalog
+page is rendered with its API serializer to ``<kind>/<slug>.<hash>.json``
+under the output directory, where ``<hash>`` is a prefix of the SHA-256 of the
+file's bytes. A file's name therefore changes exactly when its content does,
+so the CDN can cache snapshot files forever.
+
+``manifest.json`` maps every kind and slug to its current file. Builds are
+incremental: an object is only rendered again when its stamp (``updated_at``,
+or the newest ``updated_at`` among the rows it nests) differs from the one in
+the previous manifest or its file is missing. Kinds without a stamp are always
+rendered, which leaves their file names untouched when nothing changed.
+Changes that move no stamp, such as renaming a tag, need a ``full`` build.
+
+Rendering is spread over a process pool in chunks of slugs. Workers write
+their files; the manifest is written last and atomically, then files it no
+longer references are removed.
+
+Options come from the ``CONTENT_SNAPSHOTS`` setting (``OUTPUT_DIR``,
+``WORKERS``, ``CHUNK_SIZE``).
+"""
+
+import hashlib
+import json
+import logging
+import os
+import tempfile
+from concurrent.futures import ProcessPoolExecutor
+from dataclasses import dataclass
+from pathlib import Path
+
+import django
+from django.conf import settings
+from django.db import connections
+from django.db.models import F, Max
+from django.db.models.functions import Greatest
+from django.utils import timezone
+from rest_framework.renderers import JSONRenderer
+
+from services.models import Service, ServiceCategory
+from services.serializers import ServiceCategorySerializer, ServiceSerializer
+
+from .models import BlogPost, CaseStudy, Category, Resource
+from .query_planner import plan_queryset
+from .serializers import (
+    BlogPostSerializer,
+    CaseStudySerializer,
+    CategorySerializer,
+    ResourceSerializer,
+)
+
+logger = logging.getLogger(__name__)
+
+MANIFEST_NAME = 'manifest.json'
+HASH_LENGTH = 12
+
+DEFAULTS = {
+    'OUTPUT_DIR': None,
+    'WORKERS': None,
+    'CHUNK_SIZE': 200,
+}
+
+
+def get_option(name):
+    return {**DEFAULTS, **getattr(settings, 'CONTENT_SNAPSHOTS', {})}[name]
+
+
+def default_output_dir():
+    return Path(get_option('OUTPUT_DIR') or Path(settings.BASE_DIR) / 'snapshots')
+
+
+@dataclass(frozen=True)
+class SnapshotKind:
+    """One kind of object rendered to snapshot files.
+
+    Attributes:
+        name (str): Directory and manifest key for the kind
+        model: Model whose rows are rendered
+        serializer_class: Serializer producing each file's data
+        filters (tuple): ``(lookup, value)`` pairs selecting the published rows
+        stamp: Expression that changes whenever a file must be rebuilt, or
+            ``None`` to always render
+    """
+
+    name: str
+    model: type
+    serializer_class: type
+    filters: tuple = ()
+    stamp: object = F('updated_at')
+
+    def queryset(self):
+        return self.model.objects.filter(**dict(self.filters))
+
+    def stamps(self):
+        """Return ``{slug: stamp}`` for every row to snapshot, in one query."""
+        queryset = self.queryset().order_by()
+        if self.stamp is None:
+            return dict.fromkeys(queryset.values_list('slug', flat=True))
+        rows = queryset.annotate(snapshot_stamp=self.stamp).values_list('slug', 'snapshot_stamp')
+        return {slug: stamp.isoformat() if stamp else None for slug, stamp in rows}
+
+    def render(self, slugs):
+        queryset = plan_queryset(self.queryset().filter(slug__in=slugs), self.serializer_class)
+        renderer = JSONRenderer()
+        for instance in queryset:
+            yield instance.slug, renderer.render(self.serializer_class(instance).data)
+
+
+KINDS = (
+    SnapshotKind(
+        'posts', BlogPost, BlogPostSerializer,
+        filters=(('status', 'PUBLISHED'),),
+    ),
+    SnapshotKind(
+        'case-studies', CaseStudy, CaseStudySerializer,
+        filters=(('status', 'PUBLISHED'),),
+        stamp=Greatest('updated_at', 'category__updated_at'),
+    ),
+    SnapshotKind('resources', Resource, ResourceSerializer),
+    SnapshotKind('categories', Category, CategorySerializer, stamp=None),
+    SnapshotKind(
+        'services', Service, ServiceSerializer,
+        filters=(('is_active', True),),
+    ),
+    SnapshotKind(
+        'service-categories', ServiceCategory, ServiceCategorySerializer,
+        stamp=Greatest('updated_at', Max('services__updated_at')),
+    ),
+)
+KINDS_BY_NAME = {kind.name: kind for kind in KINDS}
+
+
+def write_atomic(path, data):
+    """Write ``data`` to ``path`` through a temporary file in the same directory."""
+    path.parent.mkdir(parents=True, exist_ok=True)
+    fd, tmp = tempfile.mkstemp(dir=path.parent, prefix='.tmp-')
+    try:
+        with os.fdopen(fd, 'wb') as handle:
+            handle.write(data)
+        os.replace(tmp, path)
+    except BaseException:
+        os.unlink(tmp)
+        raise
+
+
+def render_chunk(kind_name, slugs, output_dir):
+    """Render ``slugs`` of one kind and return ``{slug: (file, sha256)}``."""
+    kind = KINDS_BY_NAME[kind_name]
+    output_dir = Path(output_dir)
+    written = {}
+    for slug, content in kind.render(slugs):
+        digest = hashlib.sha256(content).hexdigest()
+        relative = f'{kind.name}/{slug}.{digest[:HASH_LENGTH]}.json'
+        target = output_dir / relative
+        if not target.exists():
+            write_atomic(target, content)
+        written[slug] = (relative, digest)
+    return written
+
+
+def _init_worker():
+    # Spawned workers start without Django configured; for forked ones this
+    # is a no-op.
+    django.setup()
+
+
+def load_manifest(output_dir):
+    try:
+        with open(Path(output_dir) / MANIFEST_NAME, encoding='utf-8') as handle:
+            return json.load(handle)
+    except (FileNotFoundError, json.JSONDecodeError):
+        return {'kinds': {}}
+
+
+class SnapshotBuilder:
+    """Builds snapshot files and the manifest under ``output_dir``.
+
+    Attributes:
+        output_dir (Path): Directory receiving the snapshots
+        workers (int): Processes rendering chunks; ``1`` renders in-process
+        chunk_size (int): Slugs per unit of work
+        full (bool): Render everything regardless of the previous manifest
+    """
+
+    def __init__(self, output_dir=None, workers=None, chunk_size=None, full=False):
+        self.output_dir = Path(output_dir or default_output_dir())
+        self.workers = workers or get_option('WORKERS') or os.cpu_count() or 1
+        self.chunk_size = chunk_size or get_option('CHUNK_SIZE')
+        self.full = full
+
+    def build(self, kinds=KINDS):
+        """Bring the snapshots up to date.
+
+        Returns:
+            dict: Per kind, the number of ``rendered``, ``unchanged`` and
+            ``removed`` objects
+        """
+        previous = load_manifest(self.output_dir)
+        manifest = {'generated_at': timezone.now().isoformat(), 'kinds': {}}
+        stats = {}
+        jobs = []
+        for kind in kinds:
+            old_entries = previous['kinds'].get(kind.name, {})
+            entries, stale = self._plan(kind, old_entries)
+            manifest['kinds'][kind.name] = entries
+            stats[kind.name] = {
+                'rendered': len(stale),
+                'unchanged': len(entries) - len(stale),
+                'removed': len(set(old_entries) - set(entries)),
+            }
+            for start in range(0, len(stale), self.chunk_size):
+                jobs.append((kind.name, stale[start:start + self.chunk_size]))
+
+        for kind_name, written in self._run(jobs):
+            entries = manifest['kinds'][kind_name]
+            for slug, (relative, digest) in written.items():
+                entries[slug].update(file=relative, sha256=digest)
+
+        for kind_name, entries in manifest['kinds'].items():
+            # Rows unpublished between planning and rendering have no file.
+            manifest['kinds'][kind_name] = {
+                slug: entry for slug, entry in entries.items() if 'file' in entry
+            }
+        for kind in KINDS:
+            if kind not in kinds and kind.name in previous['kinds']:
+                manifest['kinds'][kind.name] = previous['kinds'][kind.name]
+
+        write_atomic(
+            self.output_dir / MANIFEST_NAME,
+            json.dumps(manifest, indent=2, sort_keys=True).encode(),
+        )
+        self._prune(manifest)
+        return stats
+
+    def _plan(self, kind, old_entries):
+        """Return the kind's manifest entries and the slugs to render."""
+        entries, stale = {}, []
+        for slug, stamp in kind.stamps().items():
+            old = old_entries.get(slug)
+            fresh = (
+                not self.full
+                and stamp is not None
+                and old is not None
+                and old.get('stamp') == stamp
+                and (self.output_dir / old['file']).exists()
+            )
+            if fresh:
+                entries[slug] = dict(old)
+            else:
+                entries[slug] = {'stamp': stamp}
+                stale.append(slug)
+        return entries, stale
+
+    def _run(self, jobs):
+        output_dir = str(self.output_dir)
+        if self.workers <= 1 or len(jobs) <= 1:
+            for kind_name, slugs in jobs:
+                yield kind_name, render_chunk(kind_name, slugs, output_dir)
+            return
+
+        # Children must open their own connections rather than share ours.
+        connections.close_all()
+        with ProcessPoolExecutor(max_workers=self.workers, initializer=_init_worker) as pool:
+            futures = [
+                (kind_name, pool.submit(render_chunk, kind_name, slugs, output_dir))
+                for kind_name, slugs in jobs
+            ]
+            for kind_name, future in futures:
+                yield kind_name, future.result()
+
+    def _prune(self, manifest):
+        referenced = {
+            entry['file'] for entries in manifest['kinds'].values() for entry in entries.values()
+        }
+        for kind in KINDS:
+            directory = self.output_dir / kind.name
+            if not directory.is_dir():
+                continue
+            for path in directory.glob('*.json'):
+                if path.relative_to(self.output_dir).as_posix() not in referenced:
+                    path.unlink()
+                    logger.debug("Removed stale snapshot %s", path)
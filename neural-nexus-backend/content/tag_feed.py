@@ -0,0 +1,160 @@
+# content/tag_feed.py
+
+"""Merged, keyset-paginated feed of everything carrying a tag.
+
+Blog posts, resources and case studies live in separate tables, so the feed
+reads one keyset stream per model, each already ordered newest first and
+limited to a page, and merges them with :func:`heapq.merge`. A page therefore
+costs one small query per model however deep the client has scrolled.
+
+The feed order is ``(feed_at desc, type, id desc)`` where ``feed_at`` is the
+publish time (creation time for resources and for unpublished dates). The
+cursor carries the last item's position in that order and is encoded with
+:func:`content.pagination.encode_cursor`.
+
+Pages are cached per tag. Each tag has its own :class:`~core.cache.CacheVersion`
+that the content signal handlers bump whenever tagged content changes.
+"""
+
+import heapq
+from dataclasses import dataclass
+from itertools import islice
+
+from django.core.cache import cache
+from django.db.models import F, Q
+from django.db.models.functions import Coalesce
+from django.utils.dateparse import parse_datetime
+
+from core.cache import CacheVersion
+
+from .models import BlogPost, CaseStudy, Resource
+from .pagination import decode_cursor, encode_cursor
+
+
+@dataclass(frozen=True)
+class FeedSource:
+    """One model contributing items to the feed."""
+
+    type: str
+    model: type
+    timestamp: object
+    fields: tuple
+    published_only: bool = True
+
+    def queryset(self, tag):
+        queryset = self.model.objects.filter(tags=tag)
+        if self.published_only:
+            queryset = queryset.filter(status='PUBLISHED')
+        return queryset.annotate(feed_at=self.timestamp)
+
+
+SOURCES = (
+    FeedSource(
+        'post', BlogPost, Coalesce(F('published_at'), F('created_at')),
+        ('id', 'slug', 'title', 'excerpt', 'featured_image'),
+    ),
+    FeedSource(
+        'resource', Resource, F('created_at'),
+        ('id', 'slug', 'title', 'description', 'thumbnail_url', 'resource_type'),
+        published_only=False,
+    ),
+    FeedSource(
+        'case-study', CaseStudy, Coalesce(F('published_at'), F('created_at')),
+        ('id', 'slug', 'title', 'excerpt', 'featured_image', 'industry'),
+    ),
+)
+TYPE_ORDER = {source.type: position for position, source in enumerate(SOURCES)}
+
+
+def tag_feed_version(tag_id):
+    return CacheVersion(f'content.tag_feed.{tag_id}')
+
+
+class InvalidFeedCursor(ValueError):
+    pass
+
+
+class TagFeed:
+    """Builds pages of the merged feed for one tag.
+
+    Attributes:
+        tag (Tag): Tag whose content is listed
+        page_size (int): Items per page
+        cache_timeout (int): Seconds a cached page is kept
+    """
+
+    cache_timeout = 300
+
+    def __init__(self, tag, page_size):
+        self.tag = tag
+        self.page_size = page_size
+
+    def page(self, cursor=None):
+        """Return ``{'results': [...], 'next_cursor': str|None}`` for a page.
+
+        Raises:
+            InvalidFeedCursor: If ``cursor`` cannot be decoded.
+        """
+        position = self.decode(cursor) if cursor else None
+        version = tag_feed_version(self.tag.pk).get()
+        key = f'tag_feed:{self.tag.pk}:{version}:{self.page_size}:{cursor or ""}'
+        page = cache.get(key)
+        if page is None:
+            page = self.build(position)
+            cache.set(key, page, self.cache_timeout)
+        return page
+
+    def build(self, position):
+        streams = [self._stream(source, position) for source in SOURCES]
+        merged = heapq.merge(*streams, key=self.sort_key)
+        items = list(islice(merged, self.page_size + 1))
+        has_next = len(items) > self.page_size
+        items = items[: self.page_size]
+        return {
+            'results': items,
+            'next_cursor': self.encode(items[-1]) if has_next else None,
+        }
+
+    @staticmethod
+    def sort_key(item):
+        # heapq.merge expects ascending keys, so time and id are negated.
+        return (-item['published_at'].timestamp(), TYPE_ORDER[item['type']], -item['id'])
+
+    def _stream(self, source, position):
+        queryset = source.queryset(self.tag)
+        if position is not None:
+            queryset = queryset.filter(self._after(source, *position))
+        rows = queryset.order_by('-feed_at', '-id').values('feed_at', *source.fields)
+        for row in rows[: self.page_size + 1]:
+            row['published_at'] = row.pop('feed_at')
+            row['type'] = source.type
+            yield row
+
+    @staticmethod
+    def _after(source, timestamp, type_, pk):
+        """Rows of ``source`` sorting strictly after the cursor position."""
+        rank, cursor_rank = TYPE_ORDER[source.type], TYPE_ORDER[type_]
+        if rank > cursor_rank:
+            return Q(feed_at__lte=timestamp)
+        if rank < cursor_rank:
+            return Q(feed_at__lt=timestamp)
+        return Q(feed_at__lt=timestamp) | Q(feed_at=timestamp, id__lt=pk)
+
+    @staticmethod
+    def encode(item):
+        return encode_cursor(
+            {'p': item['published_at'].isoformat(), 't': item['type'], 'i': item['id']}
+        )
+
+    @staticmethod
+    def decode(token):
+        try:
+            payload = decode_cursor(token)
+            timestamp = parse_datetime(payload['p'])
+            type_ = payload['t']
+            pk = int(payload['i'])
+        except (KeyError, TypeError, ValueError) as exc:
+            raise InvalidFeedCursor('Invalid cursor') from exc
+        if timestamp is None or not isinstance(type_, str) or type_ not in TYPE_ORDER:
+            raise InvalidFeedCursor('Invalid cursor')
+        return timestamp, type_, pk
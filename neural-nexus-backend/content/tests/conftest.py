@@ -1,8 +1,18 @@
 # content/tests/conftest.py
+from datetime import timedelta
+
 import pytest
+from django.core.cache import cache
+from django.utils import timezone
 from rest_framework.test import APIClient
 from django.contrib.auth import get_user_model
-from .factories import UserFactory, ContentFactory
+from content.autocomplete import suggestion_index
+from content.counters import counter_buffer
+from content.ingest import tracking_buffer, variant_visit_buffer
+from content import related
+from content.related import related_updates
+from content.models import ABTest, Campaign, LandingPage, Variant
+from .factories import UserFactory, BlogPostFactory
 
 @pytest.fixture
 def api_client():
@@ -20,4 +30,45 @@ def user():
 
 @pytest.fixture
 def content():
-    return ContentFactory()
+    return BlogPostFactory()
+
+@pytest.fixture(autouse=True)
+def clear_response_cache():
+    """Cached responses and versions outlive each test's rolled back data."""
+    cache.clear()
+    suggestion_index.clear()
+    yield
+    cache.clear()
+    suggestion_index.clear()
+
+@pytest.fixture(autouse=True)
+def inline_ingest(monkeypatch):
+    """Flush ingest buffers in the test thread, which owns the test database."""
+    for buffer in (tracking_buffer, variant_visit_buffer, related_updates, counter_buffer):
+        monkeypatch.setattr(buffer, 'background', False)
+    yield
+    # Discard rows queued against this test's (rolled back) database.
+    for buffer in (tracking_buffer, variant_visit_buffer):
+        while buffer._drain():
+            pass
+    # Hooks registered in the test transaction never run.
+    related._scheduled.clear()
+    related._reset_hook()
+
+@pytest.fixture
+def ab_test(db):
+    user = UserFactory()
+    campaign = Campaign.objects.create(
+        name='Launch', slug='launch', start_date=timezone.now(), created_by=user
+    )
+    page = LandingPage.objects.create(
+        campaign=campaign, title='Launch', slug='launch', content={'headline': 'Default'},
+        meta_title='Launch', is_active=True, created_by=user,
+    )
+    test = ABTest.objects.create(
+        landing_page=page, name='Headline', is_active=True,
+        start_date=timezone.now() - timedelta(days=1), created_by=user,
+    )
+    Variant.objects.create(ab_test=test, name='A', content={'headline': 'A'}, traffic_percentage=50)
+    Variant.objects.create(ab_test=test, name='B', content={'headline': 'B'}, traffic_percentage=50)
+    return test
@@ -1,7 +1,8 @@
 # content/tests/factories.py
 import factory
 from django.contrib.auth import get_user_model
-from content.models import Content, Category, Tag
+from django.utils import timezone
+from content.models import BlogPost, CaseStudy, CaseStudyCategory, Category, Resource, Tag
 
 class UserFactory(factory.django.DjangoModelFactory):
     class Meta:
@@ -26,13 +27,47 @@ class TagFactory(factory.django.DjangoModelFactory):
     name = factory.Sequence(lambda n: f'Tag {n}')
     slug = factory.Sequence(lambda n: f'tag-{n}')
 
-class ContentFactory(factory.django.DjangoModelFactory):
+class BlogPostFactory(factory.django.DjangoModelFactory):
     class Meta:
-        model = Content
+        model = BlogPost
 
-    title = factory.Sequence(lambda n: f'Content Title {n}')
-    slug = factory.Sequence(lambda n: f'content-title-{n}')
+    title = factory.Sequence(lambda n: f'Blog Post {n}')
+    slug = factory.Sequence(lambda n: f'blog-post-{n}')
     author = factory.SubFactory(UserFactory)
     category = factory.SubFactory(CategoryFactory)
     content = factory.Faker('text', max_nb_chars=1000)
-    status = 'published'
+    status = 'PUBLISHED'
+    published_at = factory.LazyFunction(timezone.now)
+
+class ResourceFactory(factory.django.DjangoModelFactory):
+    class Meta:
+        model = Resource
+
+    title = factory.Sequence(lambda n: f'Resource {n}')
+    slug = factory.Sequence(lambda n: f'resource-{n}')
+    description = factory.Faker('sentence')
+    resource_type = 'GUIDE'
+    file_url = factory.Sequence(lambda n: f'https://example.com/resource-{n}.pdf')
+
+class CaseStudyCategoryFactory(factory.django.DjangoModelFactory):
+    class Meta:
+        model = CaseStudyCategory
+
+    name = factory.Sequence(lambda n: f'Case Category {n}')
+    slug = factory.Sequence(lambda n: f'case-category-{n}')
+
+class CaseStudyFactory(factory.django.DjangoModelFactory):
+    class Meta:
+        model = CaseStudy
+
+    title = factory.Sequence(lambda n: f'Case Study {n}')
+    slug = factory.Sequence(lambda n: f'case-study-{n}')
+    industry = 'Retail'
+    client_name = factory.Faker('company')
+    category = factory.SubFactory(CaseStudyCategoryFactory)
+    challenge = factory.Faker('paragraph')
+    solution = factory.Faker('paragraph')
+    results = factory.LazyFunction(lambda: {'roi': '120%'})
+    implementation_timeline = '3 months'
+    status = 'PUBLISHED'
+    published_at = factory.LazyFunction(timezone.now)
@@ -0,0 +1,45 @@
+# content/tests/test_analytics.py
+import pytest
+from django.db import connection
+from django.test.utils import CaptureQueriesContext
+
+from content.models import BlogAnalytics
+from .factories import BlogPostFactory
+
+
+@pytest.mark.django_db
+class TestBlogAnalyticsBeacons:
+    url = '/api/content/analytics/'
+
+    def test_running_sums_and_derived_averages(self, api_client):
+        post = BlogPostFactory()
+        first = api_client.post(self.url, {'blog_post': post.id, 'time_on_page': 30}, format='json')
+        api_client.post(
+            self.url, {'blog_post': post.id, 'time_on_page': 90, 'is_bounce': True}, format='json'
+        )
+
+        assert first.status_code == 201
+        analytics = BlogAnalytics.objects.get(blog_post=post)
+        assert analytics.return_visits == 2
+        assert analytics.time_on_page_total == 120
+        assert analytics.avg_time_on_page == 60
+        assert analytics.bounce_rate == 0.5
+
+    def test_existing_row_is_updated_with_a_single_write(self, api_client):
+        post = BlogPostFactory()
+        BlogAnalytics.objects.create(blog_post=post)
+
+        with CaptureQueriesContext(connection) as ctx:
+            response = api_client.post(
+                self.url, {'blog_post': post.id, 'time_on_page': 12}, format='json'
+            )
+
+        assert response.status_code == 200
+        assert response.data['avg_time_on_page'] == 12
+        writes = [q for q in ctx.captured_queries if q['sql'].startswith('UPDATE')]
+        assert len(writes) == 1
+        assert len(ctx.captured_queries) == 2
+
+    def test_unknown_post_returns_404(self, api_client):
+        response = api_client.post(self.url, {'blog_post': 999, 'time_on_page': 5}, format='json')
+        assert response.status_code == 404
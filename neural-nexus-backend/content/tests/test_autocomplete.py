@@ -0,0 +1,133 @@
+# content/tests/test_autocomplete.py
+from decimal import Decimal
+
+import pytest
+
+from content.autocomplete import load_suggestions, suggest, suggestion_index
+from core.prefix_index import PrefixIndex, SharedPrefixIndex, Suggestion, normalize
+from services.models import Service, ServiceCategory, ServiceFeature
+from .factories import BlogPostFactory, CaseStudyFactory, TagFactory
+
+
+@pytest.fixture
+def service(db):
+    category = ServiceCategory.objects.create(name='Strategy', slug='strategy', description='')
+    service = Service.objects.create(
+        category=category, name='Data Strategy Sprint', slug='data-strategy-sprint',
+        package_type='ESSENTIALS', description='', base_price=Decimal('1000'), duration='2 weeks',
+    )
+    ServiceFeature.objects.create(service=service, name='Data maturity assessment', description='')
+    return service
+
+
+def texts(suggestions):
+    return [suggestion.text for suggestion in suggestions]
+
+
+class TestPrefixIndex:
+    index = PrefixIndex([
+        Suggestion('post', 'Building a Data Strategy', 'building', 3),
+        Suggestion('service', 'Data Strategy Sprint', 'sprint', 4),
+        Suggestion('tag', 'Databases', 'databases', 2),
+        Suggestion('post', 'Café analytics', 'cafe', 3),
+    ])
+
+    def test_matches_word_prefixes_ranked(self):
+        # Text starting with the query first, then weight, then length.
+        assert texts(self.index.search('data')) == [
+            'Data Strategy Sprint', 'Databases', 'Building a Data Strategy',
+        ]
+
+    def test_multi_word_and_accent_insensitive(self):
+        assert texts(self.index.search('data str')) == [
+            'Data Strategy Sprint', 'Building a Data Strategy',
+        ]
+        assert texts(self.index.search('CAFE')) == ['Café analytics']
+
+    def test_kinds_and_limit(self):
+        assert texts(self.index.search('data', kinds={'post'})) == ['Building a Data Strategy']
+        assert len(self.index.search('data', limit=1)) == 1
+        assert self.index.search('zzz') == []
+        assert self.index.search('  ') == []
+
+    def test_normalize(self):
+        assert normalize('  Ünïcode—Titles! ') == 'unicode titles'
+
+
+@pytest.mark.django_db
+class TestSuggestionIndex:
+    def test_sources(self, service):
+        post = BlogPostFactory(title='Data mesh in practice')
+        BlogPostFactory(title='Data draft', status='DRAFT')
+        CaseStudyFactory(title='Retail data platform')
+        TagFactory(name='Data Engineering')
+
+        kinds = {(s.kind, s.text) for s in load_suggestions()}
+
+        assert ('service', 'Data Strategy Sprint') in kinds
+        assert ('feature', 'Data maturity assessment') in kinds
+        assert ('post', post.title) in kinds
+        assert ('post', 'Data draft') not in kinds
+        assert ('case-study', 'Retail data platform') in kinds
+
+    def test_saves_invalidate_index(self, service, django_capture_on_commit_callbacks):
+        assert texts(suggest('mesh')) == []
+
+        with django_capture_on_commit_callbacks(execute=True):
+            BlogPostFactory(title='Data mesh in practice')
+
+        assert texts(suggest('mesh')) == ['Data mesh in practice']
+
+    def test_other_workers_load_built_index_from_cache(
+        self, service, django_assert_num_queries
+    ):
+        suggestion_index.get()
+        other_worker = SharedPrefixIndex('content.autocomplete', build=load_suggestions)
+
+        with django_assert_num_queries(0):
+            assert texts(other_worker.get().search('data str')) == ['Data Strategy Sprint']
+
+    def test_copies_expire_without_a_visible_bump(self, service, monkeypatch):
+        clock = [1_000_000.0]
+        monkeypatch.setattr('core.prefix_index.time.time', lambda: clock[0])
+        worker = SharedPrefixIndex(
+            'content.autocomplete', build=load_suggestions, check_interval=0, max_age=60
+        )
+        worker.get()
+        # A write whose bump this worker never sees (another worker's LocMemCache).
+        Service.objects.filter(pk=service.pk).update(name='Data Platform Sprint')
+
+        assert texts(worker.get().search('data p')) == []
+        clock[0] += 60
+        assert texts(worker.get().search('data p')) == ['Data Platform Sprint']
+
+    def test_lookup_needs_no_queries(self, service, django_assert_num_queries):
+        suggest('data')
+
+        with django_assert_num_queries(0):
+            assert texts(suggest('data', kinds={'service'})) == ['Data Strategy Sprint']
+
+
+@pytest.mark.django_db
+class TestAutocompleteEndpoints:
+    def test_content_autocomplete(self, api_client, service):
+        TagFactory(name='Data Engineering', slug='data-engineering')
+
+        response = api_client.get('/api/content/autocomplete/?q=data&kind=tag,service')
+
+        assert response.status_code == 200
+        assert response.data['results'] == [
+            {'text': 'Data Strategy Sprint', 'kind': 'service', 'slug': 'data-strategy-sprint'},
+            {'text': 'Data Engineering', 'kind': 'tag', 'slug': 'data-engineering'},
+        ]
+
+    def test_unknown_kind(self, api_client, db):
+        response = api_client.get('/api/content/autocomplete/?q=data&kind=users')
+
+        assert response.status_code == 400
+
+    def test_service_search_suggestions(self, api_client, service):
+        response = api_client.get('/api/services/search_suggestions/?q=strat')
+
+        assert response.status_code == 200
+        assert response.data == ['Data Strategy Sprint']
@@ -0,0 +1,142 @@
+# content/tests/test_conditional.py
+from datetime import timedelta
+
+import pytest
+from django.utils.http import http_date
+
+from content.counters import counter_buffer
+from content.ingest import variant_visit_buffer
+from content.models import BlogPost, Resource
+from .factories import BlogPostFactory, ResourceFactory, TagFactory
+
+
+@pytest.fixture(autouse=True)
+def flush_counters(db):
+    yield
+    counter_buffer.flush()
+
+
+@pytest.mark.django_db
+class TestConditionalGet:
+    def test_list_revalidation_is_one_query(self, api_client, django_assert_num_queries):
+        ResourceFactory.create_batch(3)
+        first = api_client.get('/api/content/resources/')
+        assert first.status_code == 200
+        assert first['ETag'].startswith('W/"')
+        assert first['Last-Modified']
+
+        with django_assert_num_queries(1):
+            response = api_client.get('/api/content/resources/', HTTP_IF_NONE_MATCH=first['ETag'])
+
+        assert response.status_code == 304
+        assert response['ETag'] == first['ETag']
+        assert not response.content
+
+    def test_list_etag_follows_changes(self, api_client):
+        resource, other = ResourceFactory.create_batch(2)
+        etag = api_client.get('/api/content/resources/')['ETag']
+
+        other.delete()
+        assert api_client.get('/api/content/resources/')['ETag'] != etag
+
+        etag = api_client.get('/api/content/resources/')['ETag']
+        resource.tags.add(TagFactory())
+        assert api_client.get('/api/content/resources/')['ETag'] != etag
+
+    def test_list_etag_depends_on_query(self, api_client):
+        ResourceFactory()
+        etag = api_client.get('/api/content/resources/')['ETag']
+
+        response = api_client.get('/api/content/resources/?ordering=title', HTTP_IF_NONE_MATCH=etag)
+
+        assert response.status_code == 200
+
+    def test_post_list_validators_match_the_listed_posts(self, api_client, settings):
+        settings.RESPONSE_CACHE = {'ENABLED': False}
+        listed, draft = BlogPostFactory(), BlogPostFactory(status='DRAFT')
+        url = f'/api/content/posts/?author={listed.author_id}'
+        etag = api_client.get(url)['ETag']
+
+        # The list ignores ``author``; a post it now returns must change the
+        # ETag even though no signal bumps the model version.
+        BlogPost.objects.filter(pk=draft.pk).update(status='PUBLISHED')
+
+        response = api_client.get(url, HTTP_IF_NONE_MATCH=etag)
+        assert response.status_code == 200
+        assert len(response.data) == 2
+
+    def test_if_modified_since(self, api_client):
+        resource = ResourceFactory()
+        url = f'/api/content/resources/{resource.slug}/'
+        later = http_date((resource.updated_at + timedelta(seconds=5)).timestamp())
+        earlier = http_date((resource.updated_at - timedelta(seconds=5)).timestamp())
+
+        assert api_client.get(url, HTTP_IF_MODIFIED_SINCE=later).status_code == 304
+        assert api_client.get(url, HTTP_IF_MODIFIED_SINCE=earlier).status_code == 200
+
+    def test_detail_etag_changes_on_save(self, api_client):
+        resource = ResourceFactory()
+        url = f'/api/content/resources/{resource.slug}/'
+        etag = api_client.get(url)['ETag']
+
+        Resource.objects.get(pk=resource.pk).save()
+        response = api_client.get(url, HTTP_IF_NONE_MATCH=etag)
+
+        assert response.status_code == 200
+        assert response['ETag'] != etag
+
+    def test_missing_object_is_404(self, api_client):
+        response = api_client.get('/api/content/resources/missing/', HTTP_IF_NONE_MATCH='W/"x"')
+
+        assert response.status_code == 404
+
+    def test_revalidated_post_is_still_counted(self, api_client, settings):
+        post = BlogPostFactory()
+        url = f'/api/content/posts/{post.slug}/'
+        etag = api_client.get(url)['ETag']
+
+        # Answered from the validator query, then from the cached response.
+        settings.RESPONSE_CACHE = {'ENABLED': False}
+        assert api_client.get(url, HTTP_IF_NONE_MATCH=etag).status_code == 304
+        settings.RESPONSE_CACHE = {'ENABLED': True}
+        assert api_client.get(url, HTTP_IF_NONE_MATCH=etag).status_code == 304
+
+        counter_buffer.flush()
+        assert BlogPost.objects.get(pk=post.pk).view_count == 3
+
+    def test_cached_response_revalidates_without_queries(
+        self, api_client, django_assert_num_queries
+    ):
+        BlogPostFactory()
+        etag = api_client.get('/api/content/posts/')['ETag']
+
+        with django_assert_num_queries(0):
+            response = api_client.get('/api/content/posts/', HTTP_IF_NONE_MATCH=etag)
+
+        assert response.status_code == 304
+
+
+@pytest.mark.django_db
+class TestLandingPageValidators:
+    url = '/api/content/landing-pages/launch/'
+
+    def test_etag_is_per_variant(self, api_client, ab_test):
+        seen = {}
+        for number in range(20):
+            response = api_client.get(self.url, HTTP_X_VISITOR_ID=f'visitor-{number:04d}')
+            seen[response.data['content']['headline']] = response['ETag']
+
+        assert set(seen) == {'A', 'B'}
+        assert seen['A'] != seen['B']
+        assert 'Last-Modified' not in response
+        assert 'Cookie' in response['Vary']
+
+    def test_revalidation_still_records_visit(self, api_client, ab_test):
+        visitor = 'visitor-0001'
+        etag = api_client.get(self.url, HTTP_X_VISITOR_ID=visitor)['ETag']
+
+        response = api_client.get(self.url, HTTP_X_VISITOR_ID=visitor, HTTP_IF_NONE_MATCH=etag)
+
+        assert response.status_code == 304
+        variant_visit_buffer.flush()
+        assert sum(variant.visits.count() for variant in ab_test.variants.all()) == 2
@@ -0,0 +1,65 @@
+# content/tests/test_counts.py
+import pytest
+from django.db import connection
+from django.test.utils import CaptureQueriesContext
+from django.urls import reverse
+
+from .factories import CaseStudyCategoryFactory, CaseStudyFactory
+
+
+@pytest.fixture
+def categories(db):
+    first, second, empty = (CaseStudyCategoryFactory() for _ in range(3))
+    CaseStudyFactory.create_batch(3, category=first)
+    CaseStudyFactory(category=first, status='DRAFT')
+    CaseStudyFactory(category=second)
+    return first, second, empty
+
+
+@pytest.mark.django_db
+class TestCaseCounts:
+    def test_category_list_counts_with_one_grouped_query(
+        self, api_client, categories, django_assert_num_queries
+    ):
+        first, second, _ = categories
+
+        with django_assert_num_queries(2):  # page count and the grouped page
+            response = api_client.get('/api/content/case-study-categories/')
+
+        counts = {item['slug']: item['case_count'] for item in response.data['results']}
+        assert counts == {first.slug: 3, second.slug: 1}
+
+    def test_nested_counts_do_not_query_per_case(self, api_client, categories, settings):
+        settings.RESPONSE_CACHE = {'ENABLED': False}
+        api_client.get('/api/content/case-studies/')
+
+        with CaptureQueriesContext(connection) as ctx:
+            response = api_client.get('/api/content/case-studies/')
+
+        assert len(ctx.captured_queries) == 4  # validators, count, page, tags
+        assert {item['category']['case_count'] for item in response.data['results']} == {3, 1}
+
+    def test_counts_follow_status_changes(self, api_client, categories):
+        first, _, _ = categories
+        api_client.get('/api/content/case-studies/')
+
+        first.case_studies.filter(status='PUBLISHED').first().delete()
+        case = CaseStudyFactory(category=first, status='DRAFT')
+        case.status = 'PUBLISHED'
+        case.save()
+
+        response = api_client.get('/api/content/case-studies/')
+        counts = {item['category']['slug']: item['category']['case_count']
+                  for item in response.data['results']}
+        assert counts[first.slug] == 3
+
+
+@pytest.mark.django_db
+def test_admin_changelist_shows_case_counts(admin_client, categories):
+    first, _, _ = categories
+
+    response = admin_client.get(reverse('admin:content_casestudycategory_changelist'))
+
+    assert response.status_code == 200
+    counts = {row.slug: row.published_case_count for row in response.context['cl'].result_list}
+    assert counts[first.slug] == 3  # the draft is not counted
@@ -0,0 +1,96 @@
+# content/tests/test_downloads.py
+import pytest
+
+from content.models import Resource, ResourceDownload
+from leads.models import NewsletterSubscription
+from .factories import ResourceFactory
+
+
+@pytest.fixture
+def resource(db):
+    return ResourceFactory(is_gated=True)
+
+
+def download(api_client, resource, **data):
+    return api_client.post(f'/api/content/resources/{resource.slug}/download/', data)
+
+
+@pytest.mark.django_db
+class TestResourceDownload:
+    payload = {'email': 'reader@example.com', 'first_name': 'Ada', 'company': 'Acme'}
+
+    def test_records_download_and_subscriber(self, api_client, resource):
+        response = download(api_client, resource, **self.payload)
+
+        assert response.status_code == 200
+        assert response.data == {'download_url': resource.file_url, 'subscriber_created': True}
+        subscriber = NewsletterSubscription.objects.get(email='reader@example.com')
+        assert subscriber.first_name == 'Ada'
+        record = ResourceDownload.objects.get(resource=resource)
+        assert record.subscriber == subscriber
+        assert record.company == 'Acme'
+        assert Resource.objects.get(pk=resource.pk).download_count == 1
+
+    def test_repeat_download_is_idempotent(
+        self, api_client, resource, django_assert_num_queries
+    ):
+        download(api_client, resource, **self.payload)
+
+        # Resource lookup and the subscriber/download check; nothing is written.
+        with django_assert_num_queries(2):
+            response = download(api_client, resource, **self.payload)
+
+        assert response.status_code == 200
+        assert response.data == {'download_url': resource.file_url, 'subscriber_created': False}
+        assert ResourceDownload.objects.count() == 1
+        assert Resource.objects.get(pk=resource.pk).download_count == 1
+
+    def test_losing_concurrent_insert_does_not_count(self, resource):
+        # The winner's row exists but this call's read did not see it, as
+        # when two first downloads of the same pair race.
+        ResourceDownload.objects.create(resource=resource, email='reader@example.com')
+
+        created = ResourceDownload.objects.record(resource.pk, 'reader@example.com', 'Ada')
+
+        assert created == (True, False)
+        assert ResourceDownload.objects.count() == 1
+        assert Resource.objects.get(pk=resource.pk).download_count == 0
+
+    def test_existing_subscriber_is_reused(self, api_client, resource):
+        subscriber = NewsletterSubscription.objects.create(
+            email='reader@example.com', first_name='Ada', source='BANNER'
+        )
+
+        response = download(api_client, resource, **self.payload)
+
+        assert response.data['subscriber_created'] is False
+        assert ResourceDownload.objects.get().subscriber == subscriber
+        assert NewsletterSubscription.objects.get().source == 'BANNER'
+
+    def test_second_resource_reuses_subscriber(self, api_client, resource):
+        other = ResourceFactory()
+        download(api_client, resource, **self.payload)
+
+        response = download(api_client, other, **self.payload)
+
+        assert response.data['subscriber_created'] is False
+        assert NewsletterSubscription.objects.count() == 1
+        assert ResourceDownload.objects.filter(email='reader@example.com').count() == 2
+
+    def test_gated_resource_requires_email(self, api_client, resource):
+        response = download(api_client, resource)
+
+        assert response.status_code == 400
+        assert not ResourceDownload.objects.exists()
+
+    def test_ungated_download_only_counts(self, api_client, db):
+        resource = ResourceFactory(is_gated=False)
+
+        download(api_client, resource)
+        download(api_client, resource)
+
+        assert Resource.objects.get(pk=resource.pk).download_count == 2
+        assert not ResourceDownload.objects.exists()
+
+    def test_unknown_resource_is_404(self, api_client, db):
+        assert api_client.post('/api/content/resources/missing/download/').status_code == 404
@@ -0,0 +1,189 @@
+# content/tests/test_ingest.py
+import json
+import time
+
+import pytest
+from django.db import DatabaseError, connection
+from django.test.utils import CaptureQueriesContext
+from django.utils import timezone
+
+from content import views
+from content.ingest import BulkInsertBuffer
+from content.models import TrackingEvent
+from content.serializers import TrackingEventSerializer
+
+
+def make_event(name='page_view'):
+    return {
+        'eventName': name,
+        'timestamp': int(time.time() * 1000),
+        'identity': {'id': None, 'type': 'anonymous', 'sessionId': 's-1', 'anonymousId': 'a-1'},
+        'source': 'web',
+        'path': '/blog',
+        'properties': {'title': 'Blog'},
+    }
+
+
+@pytest.fixture
+def buffer(monkeypatch):
+    buffer = BulkInsertBuffer(
+        TrackingEvent, max_queue=3, batch_size=2, flush_interval=3600, background=False
+    )
+    monkeypatch.setattr(views, 'tracking_buffer', buffer)
+    return buffer
+
+
+class RejectingBuffer(BulkInsertBuffer):
+    """Fails any batch holding an event named ``bad``, like a row the database rejects."""
+
+    def write(self, batch):
+        if any(event.event_name == 'bad' for event in batch):
+            raise DatabaseError('rejected')
+        super().write(batch)
+
+
+def event_row(name):
+    return TrackingEvent(event_name=name, occurred_at=timezone.now())
+
+
+@pytest.mark.django_db
+def test_bad_row_is_dropped_after_max_attempts():
+    buffer = RejectingBuffer(
+        TrackingEvent, batch_size=10, flush_interval=3600, background=False, max_attempts=2
+    )
+    for name in ('first', 'bad', 'second'):
+        buffer.submit(event_row(name))
+
+    assert buffer.flush() == 0
+    assert buffer.pending() == 3
+
+    assert buffer.flush() == 2
+    assert buffer.pending() == 0
+    assert set(TrackingEvent.objects.values_list('event_name', flat=True)) == {'first', 'second'}
+
+
+@pytest.mark.django_db
+class TestTrackingIngest:
+    url = '/api/content/tracking/'
+
+    def test_events_are_inserted_in_batches(self, api_client, buffer):
+        response = api_client.post(self.url, make_event(), format='json')
+
+        assert response.status_code == 202
+        assert buffer.pending() == 1
+        assert not TrackingEvent.objects.exists()
+
+        with CaptureQueriesContext(connection) as ctx:
+            api_client.post(self.url, make_event('click'), format='json')
+
+        inserts = [q for q in ctx.captured_queries if q['sql'].startswith('INSERT')]
+        assert len(inserts) == 1
+
+        assert buffer.pending() == 0
+        event = TrackingEvent.objects.get(event_name='page_view')
+        assert event.session_id == 's-1'
+        assert event.anonymous_id == 'a-1'
+        assert event.properties == {'title': 'Blog'}
+
+    def test_full_queue_returns_429(self, api_client, buffer, monkeypatch):
+        monkeypatch.setattr(buffer, 'flush', lambda: 0)
+        for _ in range(3):
+            assert api_client.post(self.url, make_event(), format='json').status_code == 202
+
+        response = api_client.post(self.url, make_event(), format='json')
+
+        assert response.status_code == 429
+        assert response['Retry-After']
+
+    @pytest.mark.parametrize('timestamp', ['2024-02-30T00:00:00', '2024-13-45T00:00:00'])
+    def test_impossible_date_is_rejected(self, api_client, buffer, timestamp):
+        response = api_client.post(
+            self.url, {**make_event(), 'timestamp': timestamp}, format='json'
+        )
+
+        assert response.status_code == 400
+        assert 'timestamp' in response.data['details']
+        assert buffer.pending() == 0
+
+    def test_invalid_event_is_rejected(self, api_client, buffer):
+        response = api_client.post(self.url, {'eventName': 'page_view'}, format='json')
+
+        assert response.status_code == 400
+        assert buffer.pending() == 0
+
+
+@pytest.mark.django_db
+class TestTrackingBatch:
+    url = '/api/content/tracking/batch/'
+
+    def test_json_array_reports_invalid_events_by_index(self, api_client):
+        events = [make_event(), {'eventName': 'broken'}, make_event('click')]
+
+        response = api_client.post(self.url, events, format='json')
+
+        assert response.status_code == 200
+        assert response.data['accepted'] == 2
+        assert [item['index'] for item in response.data['rejected']] == [1]
+        assert TrackingEvent.objects.count() == 2
+
+    def test_impossible_date_is_reported_by_index(self, api_client):
+        events = [make_event(), {**make_event(), 'timestamp': '2024-02-30T00:00:00'}]
+
+        response = api_client.post(self.url, events, format='json')
+
+        assert response.status_code == 200
+        [rejected] = response.data['rejected']
+        assert rejected['index'] == 1
+        assert list(rejected['errors']) == ['timestamp']
+
+    def test_batch_errors_match_single_event_validation(self):
+        bad_time = {**make_event(), 'timestamp': 'yesterday', 'path': 'x' * 501}
+        missing = {'eventName': 'broken'}
+        events = [make_event(), bad_time, 'page_view', missing]
+
+        valid, errors = TrackingEventSerializer.validate_batch(events)
+
+        assert list(valid) == [0]
+        assert valid[0]['session_id'] == 's-1'
+        assert valid[0]['properties'] == {'title': 'Blog'}
+        for index in (1, 3):
+            serializer = TrackingEventSerializer(data=events[index])
+            assert not serializer.is_valid()
+            assert errors[index] == serializer.errors
+        assert list(errors[2]) == ['non_field_errors']
+
+    @pytest.mark.parametrize('field,values', [
+        ('timestamp', [1700000000123, 1700000000123.5, '2024-05-01T10:00:00Z', 1e20, True, None]),
+        ('eventName', ['  click ', 'é', 'x' * 101, '', 42, 'a\x00b']),
+    ])
+    def test_column_checks_match_single_event_validation(self, field, values):
+        events = [{**make_event(), field: value} for value in values]
+
+        valid, errors = TrackingEventSerializer.validate_batch(events)
+
+        for index, event in enumerate(events):
+            serializer = TrackingEventSerializer(data=event)
+            if serializer.is_valid():
+                assert valid[index] == serializer.validated_data
+            else:
+                assert errors[index] == serializer.errors
+
+    def test_ndjson_body(self, api_client):
+        body = '\n'.join(json.dumps(make_event(name)) for name in ('a', 'b', 'c')) + '\n'
+
+        response = api_client.post(self.url, body, content_type='application/x-ndjson')
+
+        assert response.status_code == 200
+        assert set(TrackingEvent.objects.values_list('event_name', flat=True)) == {'a', 'b', 'c'}
+
+    def test_malformed_ndjson_line(self, api_client):
+        response = api_client.post(self.url, '{"eventName": "a"}\n{oops', content_type='application/x-ndjson')
+
+        assert response.status_code == 400
+        assert 'line 2' in response.data['detail']
+
+    def test_batch_with_no_valid_events(self, api_client):
+        response = api_client.post(self.url, [{'eventName': 'x'}], format='json')
+
+        assert response.status_code == 400
+        assert not TrackingEvent.objects.exists()
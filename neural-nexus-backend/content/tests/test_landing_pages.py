@@ -0,0 +1,116 @@
+# content/tests/test_landing_pages.py
+import json
+from importlib import import_module
+from io import StringIO
+
+import pytest
+from django.core.management import call_command
+
+from content.ab_testing import active_tests
+from content.landing_pages import compile_payloads, get_payload
+from content.models import Variant
+from core.merge_patch import apply_merge_patch, make_merge_patch
+
+URL = '/api/content/landing-pages/launch/'
+
+
+@pytest.fixture(autouse=True)
+def clear_config_cache():
+    active_tests.clear()
+    yield
+    active_tests.clear()
+
+
+def test_merge_patch_round_trip():
+    base = {'headline': 'Default', 'hero': {'image': 'a.png', 'cta': 'Go'}, 'faq': [1, 2]}
+    changed = {'headline': 'New', 'hero': {'image': 'a.png'}, 'faq': [3]}
+
+    patch = make_merge_patch(base, changed)
+
+    assert patch == {'headline': 'New', 'hero': {'cta': None}, 'faq': [3]}
+    assert apply_merge_patch(base, patch) == changed
+    assert base['hero'] == {'image': 'a.png', 'cta': 'Go'}
+    assert apply_merge_patch(base, ['replaced']) == ['replaced']
+
+
+@pytest.mark.django_db
+class TestCompiledPayloads:
+    def test_variant_content_is_merged_over_page(self, ab_test):
+        page = ab_test.landing_page
+        page.content = {'headline': 'Default', 'subhead': 'Shared'}
+        page.save()
+        variant = ab_test.variants.get(name='A')
+
+        payload = json.loads(get_payload(page.pk, variant.pk))
+
+        assert payload['content'] == {'headline': 'A', 'subhead': 'Shared'}
+        assert json.loads(get_payload(page.pk))['content'] == page.content
+
+    def test_cached_payload_needs_no_queries(self, ab_test, django_assert_num_queries):
+        variant = ab_test.variants.first()
+        first = get_payload(ab_test.landing_page_id, variant.pk)
+
+        with django_assert_num_queries(0):
+            assert get_payload(ab_test.landing_page_id, variant.pk) == first
+
+    def test_variant_change_recompiles(self, ab_test):
+        variant = ab_test.variants.get(name='A')
+        get_payload(ab_test.landing_page_id, variant.pk)
+
+        variant.content = {'headline': 'Changed'}
+        variant.save()
+
+        payload = json.loads(get_payload(ab_test.landing_page_id, variant.pk))
+        assert payload['content']['headline'] == 'Changed'
+
+    def test_all_variants_compiled_together(self, ab_test):
+        payloads = compile_payloads([ab_test.landing_page_id])
+
+        assert set(payloads) == {
+            (ab_test.landing_page_id, None),
+            *((ab_test.landing_page_id, pk) for pk in ab_test.variants.values_list('pk', flat=True)),
+        }
+
+    def test_retrieve_serves_compiled_bytes(self, api_client, ab_test, django_assert_num_queries):
+        api_client.get(URL, HTTP_X_VISITOR_ID='visitor-0001')
+
+        # The validator lookup and the visit; the payload comes from the cache.
+        with django_assert_num_queries(2):
+            response = api_client.get(URL, HTTP_X_VISITOR_ID='visitor-0001')
+
+        assert response.status_code == 200
+        assert response['Content-Type'] == 'application/json'
+        assert json.loads(response.content)['content']['headline'] in {'A', 'B'}
+
+    def test_browsable_api_still_renders(self, api_client, ab_test):
+        response = api_client.get(URL, HTTP_ACCEPT='text/html')
+
+        assert response.status_code == 200
+        assert response['Content-Type'].startswith('text/html')
+        assert b'headline' in response.content
+
+    def test_migration_turns_contents_into_patches(self, ab_test):
+        from django.apps import apps
+
+        migration = import_module('content.migrations.0019_variant_content_merge_patch')
+        page = ab_test.landing_page
+        page.content = {'headline': 'Default', 'subhead': 'Shared'}
+        page.save()
+        ab_test.variants.filter(name='A').update(content={'headline': 'A', 'subhead': 'Shared'})
+
+        migration.contents_to_patches(apps, None)
+        assert Variant.objects.get(name='A').content == {'headline': 'A'}
+
+        migration.patches_to_contents(apps, None)
+        assert Variant.objects.get(name='A').content == {'headline': 'A', 'subhead': 'Shared'}
+
+    def test_warm_command(self, ab_test):
+        out = StringIO()
+
+        err = StringIO()
+
+        call_command('warm_landing_pages', stdout=out, stderr=err)
+
+        assert 'Cached 3 payloads for 1 landing pages' in out.getvalue()
+        # The test settings use LocMemCache, which no web worker can read.
+        assert 'local to this process' in err.getvalue()
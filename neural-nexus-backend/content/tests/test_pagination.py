@@ -0,0 +1,81 @@
+# content/tests/test_pagination.py
+from datetime import timedelta
+
+import pytest
+from django.db import connection
+from django.test.utils import CaptureQueriesContext
+from django.utils import timezone
+
+from content.pagination import decode_cursor, encode_cursor
+from .factories import BlogPostFactory, CaseStudyFactory
+
+
+def _walk(client, url):
+    """Follow ``next`` links and return every slug served, in order."""
+    slugs = []
+    while url:
+        response = client.get(url)
+        assert response.status_code == 200
+        slugs.extend(item['slug'] for item in response.data['results'])
+        url = response.data['next']
+    return slugs
+
+
+@pytest.mark.django_db
+class TestKeysetPagination:
+    def test_cursor_round_trip(self):
+        payload = {'p': '2024-01-01T00:00:00+00:00', 'i': 42}
+        assert decode_cursor(encode_cursor(payload)) == payload
+
+    def test_blog_posts_walk_all_pages_in_order(self, api_client):
+        now = timezone.now()
+        shared = now - timedelta(days=1)
+        posts = [BlogPostFactory(published_at=now - timedelta(days=i)) for i in range(5)]
+        # Ties on published_at are broken by id
+        posts += [BlogPostFactory(published_at=shared) for _ in range(2)]
+        posts += [BlogPostFactory(published_at=None) for _ in range(3)]
+        BlogPostFactory(status='DRAFT')
+
+        slugs = _walk(api_client, '/api/content/posts/?pagination=cursor&page_size=3')
+
+        expected = sorted(
+            posts,
+            key=lambda p: (p.published_at is None, -(p.published_at or now).timestamp(), -p.id),
+        )
+        assert slugs == [p.slug for p in expected]
+
+    def test_full_dated_page_skips_undated_rows(self, api_client):
+        now = timezone.now()
+        for i in range(5):
+            BlogPostFactory(published_at=now - timedelta(days=i))
+        BlogPostFactory(published_at=None)
+        cursor = api_client.get('/api/content/posts/?pagination=cursor&page_size=2').data['next']
+
+        with CaptureQueriesContext(connection) as queries:
+            response = api_client.get(cursor)
+
+        order = 'ORDER BY "content_blogpost"."published_at"'
+        pages = [query['sql'] for query in queries if order in query['sql']]
+        assert len(pages) == 1
+        assert 'IS NOT NULL' in pages[0]
+        assert ' IS NULL' not in pages[0].replace('IS NOT NULL', '')
+        assert len(response.data['results']) == 2
+
+    def test_blog_posts_default_list_is_unpaginated(self, api_client):
+        BlogPostFactory.create_batch(3)
+        response = api_client.get('/api/content/posts/')
+        assert response.status_code == 200
+        assert isinstance(response.data, list)
+        assert len(response.data) == 3
+
+    def test_case_studies_cursor_mode(self, api_client):
+        now = timezone.now()
+        cases = [CaseStudyFactory(published_at=now - timedelta(hours=i)) for i in range(4)]
+
+        slugs = _walk(api_client, '/api/content/case-studies/?pagination=cursor&page_size=2')
+
+        assert slugs == [c.slug for c in cases]
+
+    def test_invalid_cursor_returns_404(self, api_client):
+        response = api_client.get('/api/content/posts/?cursor=not-a-cursor')
+        assert response.status_code == 404
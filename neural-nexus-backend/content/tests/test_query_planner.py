@@ -0,0 +1,56 @@
+# content/tests/test_query_planner.py
+import pytest
+from django.db import connection
+from django.test.utils import CaptureQueriesContext
+
+from content.models import BlogAnalytics
+from content.query_planner import collect_relations
+from content.serializers import BlogPostSerializer, LandingPageSerializer, LeadMagnetSerializer
+from .factories import BlogPostFactory, TagFactory
+
+
+def _create_posts(count):
+    for _ in range(count):
+        post = BlogPostFactory()
+        post.tags.add(TagFactory(), TagFactory())
+        BlogAnalytics.objects.create(blog_post=post)
+
+
+def _count_queries(client, url):
+    with CaptureQueriesContext(connection) as ctx:
+        response = client.get(url)
+    assert response.status_code == 200
+    return len(ctx.captured_queries)
+
+
+class TestCollectRelations:
+    def test_blog_post_relations(self):
+        select, prefetch = collect_relations(BlogPostSerializer)
+        assert set(select) == {'category', 'analytics', 'author'}
+        assert prefetch == ('tags',)
+
+    def test_nested_relations_are_prefixed(self):
+        assert collect_relations(LeadMagnetSerializer) == (('resource',), ('resource__tags',))
+        assert collect_relations(LandingPageSerializer) == ((), ('ab_tests', 'ab_tests__variants'))
+
+
+@pytest.mark.django_db
+class TestBlogPostQueryCount:
+    def test_post_list_uses_fixed_number_of_queries(self, api_client):
+        _create_posts(2)
+        few = _count_queries(api_client, '/api/content/posts/')
+        _create_posts(6)
+        many = _count_queries(api_client, '/api/content/posts/')
+
+        assert few == many
+        # Validators, posts with joined relations, prefetched tags
+        assert many == 3
+
+    def test_tag_content_uses_fixed_number_of_queries(self, api_client):
+        tag = TagFactory()
+        for _ in range(5):
+            BlogPostFactory().tags.add(tag, TagFactory())
+        url = f'/api/content/tags/{tag.slug}/content/'
+        first = _count_queries(api_client, url)
+        BlogPostFactory().tags.add(tag)
+        assert _count_queries(api_client, url) == first
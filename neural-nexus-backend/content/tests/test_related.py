@@ -0,0 +1,184 @@
+# content/tests/test_related.py
+import threading
+from io import StringIO
+
+import pytest
+from django.core.management import call_command
+from django.core.signals import request_started
+from django.db import transaction
+
+from content.models import BlogPost, RelatedContent
+from content.related import (
+    Corpus, KINDS, RelatedUpdateQueue, rebuild, related_ids, update_objects,
+)
+from .factories import BlogPostFactory, CaseStudyFactory, TagFactory
+
+
+@pytest.fixture
+def posts(db, django_capture_on_commit_callbacks):
+    ml, data, cooking = TagFactory(slug='ml'), TagFactory(slug='data'), TagFactory(slug='food')
+    # Run the related update the fixture schedules, as its commit would.
+    with django_capture_on_commit_callbacks(execute=True):
+        models = BlogPostFactory(
+            title='Machine learning models in production', excerpt='Deploying models'
+        )
+        models.tags.set([ml, data])
+        pipelines = BlogPostFactory(
+            title='Machine learning data pipelines', excerpt='Feeding models with data'
+        )
+        pipelines.tags.set([ml, data])
+        monitoring = BlogPostFactory(title='Monitoring learning systems', excerpt='Models drift')
+        monitoring.tags.set([ml])
+        pasta = BlogPostFactory(title='Pasta recipes', excerpt='Cooking at home')
+        pasta.tags.set([cooking])
+    return models, pipelines, monitoring, pasta
+
+
+@pytest.mark.django_db
+class TestRelatedContent:
+    def test_rebuild_ranks_similar_posts(self, posts):
+        models, pipelines, monitoring, pasta = posts
+
+        rebuild('post')
+
+        neighbours = related_ids('post', models.pk)
+        assert [pk for pk, _ in neighbours][:2] == [pipelines.pk, monitoring.pk]
+        assert pasta.pk not in {pk for pk, _ in neighbours}
+        assert all(first >= second for (_, first), (_, second) in zip(neighbours, neighbours[1:]))
+
+    def test_scores_combine_text_and_tags(self, posts, settings):
+        models, pipelines, _, _ = posts
+        corpus = Corpus.load(KINDS['post'])
+        row, other = corpus.index[models.pk], corpus.index[pipelines.pk]
+
+        settings.RELATED_CONTENT = {'TEXT_WEIGHT': 0.0}
+        assert corpus.scores([row])[0][other] == pytest.approx(1.0)  # identical tags
+        settings.RELATED_CONTENT = {'TEXT_WEIGHT': 1.0}
+        assert 0 < corpus.scores([row])[0][other] < 1
+
+    def test_top_k_is_respected(self, posts, settings):
+        settings.RELATED_CONTENT = {'TOP_K': 1}
+
+        rebuild('post')
+
+        assert RelatedContent.objects.filter(kind='post', source_id=posts[0].pk).count() == 1
+
+    def test_incremental_update_adds_new_post(self, posts):
+        models, pipelines, monitoring, pasta = posts
+        rebuild('post')
+        twin = BlogPostFactory(title='Pasta recipes for weeknights', excerpt='Cooking at home')
+        twin.tags.set(pasta.tags.all())
+
+        update_objects('post', [twin.pk])
+
+        assert related_ids('post', twin.pk)[0][0] == pasta.pk
+        assert related_ids('post', pasta.pk)[0][0] == twin.pk
+
+    def test_unpublishing_removes_post_from_lists(self, posts):
+        models, pipelines, _, _ = posts
+        rebuild('post')
+
+        BlogPost.objects.filter(pk=pipelines.pk).update(status='DRAFT')
+        update_objects('post', [pipelines.pk])
+
+        assert pipelines.pk not in {pk for pk, _ in related_ids('post', models.pk)}
+        assert related_ids('post', pipelines.pk) == []
+
+    def test_save_schedules_update(self, posts, django_capture_on_commit_callbacks):
+        models, _, _, _ = posts
+        with django_capture_on_commit_callbacks(execute=True):
+            models.title = 'Machine learning models'
+            models.save()
+
+        assert RelatedContent.objects.filter(kind='post', source_id=models.pk).exists()
+
+    def test_one_update_per_transaction(
+        self, posts, monkeypatch, django_capture_on_commit_callbacks
+    ):
+        models, pipelines, monitoring, _ = posts
+        calls = []
+        monkeypatch.setattr(
+            'content.related.update_objects', lambda kind, pks: calls.append((kind, set(pks)))
+        )
+        with django_capture_on_commit_callbacks(execute=True):
+            models.save()
+            models.tags.set(monitoring.tags.all())
+            pipelines.save()
+
+        assert calls == [('post', {models.pk, pipelines.pk})]
+
+    def test_one_commit_hook_per_transaction(
+        self, posts, monkeypatch, django_capture_on_commit_callbacks
+    ):
+        models, pipelines, monitoring, _ = posts
+        monkeypatch.setattr('content.related.update_objects', lambda kind, pks: None)
+        with django_capture_on_commit_callbacks(execute=True) as callbacks:
+            models.save()
+            models.tags.set(monitoring.tags.all())
+            pipelines.save()
+
+        assert [func.__module__ for func in callbacks].count('content.related') == 1
+
+    def test_rolled_back_updates_go_out_with_the_next_commit(
+        self, posts, monkeypatch, django_capture_on_commit_callbacks
+    ):
+        models, pipelines, _, _ = posts
+        calls = []
+        monkeypatch.setattr(
+            'content.related.update_objects', lambda kind, pks: calls.append((kind, set(pks)))
+        )
+        with pytest.raises(RuntimeError), transaction.atomic():
+            models.save()
+            raise RuntimeError
+        request_started.send(sender=None)
+        with django_capture_on_commit_callbacks(execute=True):
+            pipelines.save()
+
+        assert calls == [('post', {models.pk, pipelines.pk})]
+
+    def test_related_action(self, api_client, posts, django_assert_max_num_queries):
+        models, pipelines, _, _ = posts
+        rebuild('post')
+
+        # Source lookup, neighbours, related posts, their tags
+        with django_assert_max_num_queries(4):
+            response = api_client.get(f'/api/content/posts/{models.slug}/related/?limit=1')
+
+        assert response.status_code == 200
+        assert [item['slug'] for item in response.data] == [pipelines.slug]
+        assert 'content' not in response.data[0]
+        assert response.data[0]['score'] > 0
+
+    def test_related_case_studies(self, api_client):
+        first = CaseStudyFactory(status='PUBLISHED', title='Retail demand forecasting')
+        second = CaseStudyFactory(status='PUBLISHED', title='Retail demand planning')
+        rebuild('case-study')
+
+        response = api_client.get(f'/api/content/case-studies/{first.slug}/related/')
+
+        assert [item['slug'] for item in response.data] == [second.slug]
+
+    def test_unknown_object_is_404(self, api_client, db):
+        assert api_client.get('/api/content/posts/missing/related/').status_code == 404
+
+    def test_command(self, posts):
+        out = StringIO()
+
+        call_command('rebuild_related_content', '--kind', 'post', stdout=out)
+
+        assert 'post: wrote' in out.getvalue()
+        assert RelatedContent.objects.filter(kind='post').exists()
+
+
+def test_background_updates_leave_the_calling_thread(monkeypatch):
+    done, threads = threading.Event(), []
+
+    def record(kind, pks):
+        threads.append(threading.current_thread())
+        done.set()
+
+    monkeypatch.setattr('content.related.update_objects', record)
+    RelatedUpdateQueue(background=True, delay=0).add({('post', 1)})
+
+    assert done.wait(5)
+    assert threads[0] is not threading.current_thread()
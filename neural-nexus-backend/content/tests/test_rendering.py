@@ -0,0 +1,134 @@
+# content/tests/test_rendering.py
+from io import StringIO
+
+import pytest
+from django.core.management import call_command
+
+from content.models import BlogPost
+from content.rendering import render_post, sanitize_html
+from .factories import BlogPostFactory
+
+BODY = """# Getting started
+
+Intro with **bold** text and a [link](https://example.com).
+
+## Setup
+
+Install it.
+
+### Details
+
+More words here.
+
+## Usage
+
+Use it.
+"""
+
+
+class TestRenderPost:
+    def test_renders_markdown_and_table_of_contents(self):
+        rendered = render_post(BODY)
+
+        assert '<h2 id="setup">Setup</h2>' in rendered.html
+        assert '<a href="https://example.com">link</a>' in rendered.html
+        assert rendered.table_of_contents == [
+            {'level': 1, 'id': 'getting-started', 'title': 'Getting started', 'children': [
+                {'level': 2, 'id': 'setup', 'title': 'Setup', 'children': [
+                    {'level': 3, 'id': 'details', 'title': 'Details', 'children': []},
+                ]},
+                {'level': 2, 'id': 'usage', 'title': 'Usage', 'children': []},
+            ]},
+        ]
+
+    def test_counts_words_and_read_time(self):
+        rendered = render_post(' '.join(['word'] * 401))
+
+        assert rendered.word_count == 401
+        assert rendered.read_time == 3
+        assert render_post('').read_time == 0
+
+    def test_excerpt_is_plain_text_cut_at_a_word(self):
+        rendered = render_post('**Bold** start. ' + 'lorem ipsum ' * 100)
+
+        assert rendered.excerpt.startswith('Bold start. lorem')
+        assert rendered.excerpt.endswith('…')
+        assert len(rendered.excerpt) <= 301
+        assert '<' not in rendered.excerpt
+
+    @pytest.mark.parametrize('dirty', [
+        '<script>alert(1)</script>',
+        '<img src="x" onerror="alert(1)">',
+        '<a href="javascript:alert(1)">x</a>',
+        '<a href="java\tscript:alert(1)">x</a>',
+        '<iframe src="https://evil.example"></iframe>',
+        '<p style="background:url(x)" onclick="alert(1)">x</p>',
+    ])
+    def test_sanitizes_untrusted_html(self, dirty):
+        html, _ = sanitize_html(dirty)
+
+        assert 'alert' not in html
+        assert 'javascript' not in html
+        assert 'iframe' not in html
+        assert 'style' not in html
+
+    def test_escapes_text(self):
+        assert render_post('1 < 2 & 3').html == '<p>1 &lt; 2 &amp; 3</p>'
+
+
+@pytest.mark.django_db
+class TestBlogPostRenderedFields:
+    def test_fields_are_computed_on_save(self):
+        post = BlogPostFactory(content=BODY, excerpt='')
+
+        post.refresh_from_db()
+        assert post.content_html.startswith('<h1 id="getting-started">')
+        assert post.word_count == 19
+        assert post.estimated_read_time == 1
+        assert post.excerpt.startswith('Intro with bold text')
+        assert post.table_of_contents[0]['id'] == 'getting-started'
+
+    def test_generated_excerpt_follows_content(self):
+        post = BlogPostFactory(content='First version.', excerpt='')
+
+        post.content = 'Second version.'
+        post.save(update_fields=['content'])
+
+        post.refresh_from_db()
+        assert post.excerpt == 'Second version.'
+        assert post.content_html == '<p>Second version.</p>'
+
+    def test_hand_written_excerpt_is_kept(self):
+        post = BlogPostFactory(content='Body text.', excerpt='Written by hand')
+
+        post.content = 'New body.'
+        post.save()
+
+        assert BlogPost.objects.get(pk=post.pk).excerpt == 'Written by hand'
+
+    def test_list_omits_body(self, api_client):
+        post = BlogPostFactory(content=BODY)
+
+        listing = api_client.get('/api/content/posts/').data[0]
+        detail = api_client.get(f'/api/content/posts/{post.slug}/').data
+
+        assert 'content' not in listing and 'content_html' not in listing
+        assert listing['estimated_read_time'] == 1
+        assert detail['content_html'] == post.content_html
+        assert detail['table_of_contents'] == post.table_of_contents
+
+    def test_backfill_command(self):
+        post = BlogPostFactory(content=BODY)
+        BlogPost.objects.filter(pk=post.pk).update(
+            content_html='', word_count=0, estimated_read_time=0, rendered_hash=''
+        )
+        out = StringIO()
+
+        call_command('render_blog_posts', stdout=out)
+        call_command('render_blog_posts', stdout=out)
+
+        post.refresh_from_db()
+        assert post.word_count == 19
+        assert post.content_html
+        assert 'Rendered 1 blog posts' in out.getvalue()
+        assert 'Rendered 0 blog posts' in out.getvalue()
@@ -0,0 +1,91 @@
+# content/tests/test_response_cache.py
+from io import StringIO
+
+import pytest
+from django.core.cache import cache
+from django.core.management import call_command
+
+from content.counters import counter_buffer
+from content.models import BlogPost
+from content.views import BlogPostViewSet
+from core.response_cache import ResponseCacheStats
+from .factories import BlogPostFactory, TagFactory
+
+
+@pytest.fixture(autouse=True)
+def flush_counters(db):
+    """Write counted views before the test's database is rolled back."""
+    yield
+    counter_buffer.flush()
+
+
+@pytest.mark.django_db
+class TestResponseCache:
+    def test_list_is_served_from_cache_until_content_changes(
+        self, api_client, django_assert_num_queries
+    ):
+        BlogPostFactory(title='First')
+        assert api_client.get('/api/content/posts/')['X-Cache'] == 'MISS'
+
+        with django_assert_num_queries(0):
+            response = api_client.get('/api/content/posts/')
+        assert response['X-Cache'] == 'HIT'
+
+        BlogPostFactory(title='Second')
+        response = api_client.get('/api/content/posts/')
+        assert response['X-Cache'] == 'MISS'
+        assert {post['title'] for post in response.data} == {'First', 'Second'}
+
+    def test_query_params_are_normalised(self, api_client):
+        BlogPostFactory()
+        api_client.get('/api/content/posts/?ordering=-published_at&category=x')
+
+        response = api_client.get('/api/content/posts/?category=x&ordering=-published_at')
+
+        assert response['X-Cache'] == 'HIT'
+
+    def test_m2m_changes_invalidate(self, api_client):
+        post = BlogPostFactory()
+        api_client.get(f'/api/content/posts/{post.slug}/')
+
+        post.tags.add(TagFactory(name='Fresh'))
+        response = api_client.get(f'/api/content/posts/{post.slug}/')
+
+        assert response['X-Cache'] == 'MISS'
+        assert [tag['name'] for tag in response.data['tags']] == ['Fresh']
+
+    def test_cached_detail_still_counts_views(self, api_client):
+        post = BlogPostFactory()
+
+        api_client.get(f'/api/content/posts/{post.slug}/')
+        response = api_client.get(f'/api/content/posts/{post.slug}/')
+
+        assert response['X-Cache'] == 'HIT'
+        assert response.data['view_count'] == 2
+        counter_buffer.flush()
+        assert BlogPost.objects.get(pk=post.pk).view_count == 2
+
+    def test_stats_command(self, api_client):
+        BlogPostFactory()
+        call_command('response_cache_stats', '--reset', stdout=StringIO())
+        api_client.get('/api/content/posts/')
+        api_client.get('/api/content/posts/')
+
+        out = StringIO()
+        call_command('response_cache_stats', stdout=out)
+
+        assert 'content.views.BlogPostViewSet: 1 hits, 1 misses (50.0%)' in out.getvalue()
+
+    def test_stats_stay_in_process_until_flushed(self, api_client, settings):
+        settings.RESPONSE_CACHE = {'STATS_FLUSH_INTERVAL': 3600}
+        BlogPostFactory()
+        stats = BlogPostViewSet.cache_stats()
+        stats.reset()
+        ResponseCacheStats.flush()
+
+        api_client.get('/api/content/posts/')
+        api_client.get('/api/content/posts/')
+
+        assert cache.get(stats._key('hit')) is None
+        assert stats.read()['hits'] == 1
+        assert cache.get(stats._key('hit')) == 1
@@ -0,0 +1,110 @@
+# content/tests/test_search.py
+import pytest
+
+from content.models import BlogPost
+from content.search import get_search_backend
+from content.search.memory import InMemorySearchBackend, analyze
+from content.search.postgres import START_SEL, STOP_SEL, mark
+from .factories import BlogPostFactory, CaseStudyFactory, CategoryFactory
+
+
+@pytest.fixture(autouse=True)
+def fresh_index():
+    backend = get_search_backend()
+    assert isinstance(backend, InMemorySearchBackend)
+    backend.reset()
+    yield backend
+    backend.reset()
+
+
+def test_analyze_normalises_terms():
+    assert analyze('The Strategies of Data') == ['strategy', 'data']
+
+
+def test_postgres_headline_is_escaped_before_marking():
+    headline = f'<img src=x onerror=alert(1)> our {START_SEL}lakehouse{STOP_SEL} & more'
+
+    assert mark(headline) == (
+        '&lt;img src=x onerror=alert(1)&gt; our <mark>lakehouse</mark> &amp; more'
+    )
+    assert mark(None) == ''
+
+
+@pytest.mark.django_db
+class TestInMemorySearch:
+    def test_title_matches_rank_above_body_matches(self, fresh_index):
+        body = BlogPostFactory(title='Quarterly review', content='A note on data governance.')
+        title = BlogPostFactory(title='Data governance playbook', content='Start small.')
+
+        ranked = fresh_index.filter(BlogPost.objects.all(), 'governance')
+
+        assert list(ranked) == [title, body]
+
+    def test_all_terms_must_match(self, fresh_index):
+        BlogPostFactory(title='Data strategy', content='Notes.')
+        BlogPostFactory(title='Data quality', content='Notes.')
+        assert fresh_index.filter(BlogPost.objects.all(), 'data strategy').count() == 1
+
+    def test_index_follows_saves_and_deletes(self, fresh_index):
+        post = BlogPostFactory(title='Forecasting')
+        assert fresh_index.filter(BlogPost.objects.all(), 'forecasting').count() == 1
+
+        post.title = 'Budgeting'
+        post.save()
+        assert fresh_index.filter(BlogPost.objects.all(), 'forecasting').count() == 0
+        assert fresh_index.filter(BlogPost.objects.all(), 'budgeting').count() == 1
+
+        post.delete()
+        assert fresh_index.filter(BlogPost.objects.all(), 'budgeting').count() == 0
+
+    def test_category_rename_reindexes_posts(self, fresh_index):
+        category = CategoryFactory(name='Analytics')
+        BlogPostFactory(category=category, title='Weekly notes')
+        assert fresh_index.filter(BlogPost.objects.all(), 'analytics').count() == 1
+
+        category.name = 'Machine Learning'
+        category.save()
+        assert fresh_index.filter(BlogPost.objects.all(), 'machine learning').count() == 1
+
+
+@pytest.mark.django_db
+class TestSearchEndpoints:
+    def test_post_list_search_is_ranked(self, api_client):
+        BlogPostFactory(title='Intro', content='We cover pipelines briefly.')
+        BlogPostFactory(title='Pipelines in depth', content='Pipelines everywhere.')
+        BlogPostFactory(title='Pipelines draft', status='DRAFT')
+
+        response = api_client.get('/api/content/posts/?search=pipelines')
+
+        assert [post['title'] for post in response.data] == ['Pipelines in depth', 'Intro']
+
+    def test_case_study_search(self, api_client):
+        match = CaseStudyFactory(solution='Migrated the warehouse to a lakehouse.')
+        CaseStudyFactory(solution='Trained the analysts.')
+
+        response = api_client.get('/api/content/case-studies/?search=lakehouse')
+
+        assert [case['slug'] for case in response.data['results']] == [match.slug]
+
+    def test_search_view_returns_snippets(self, api_client):
+        post = BlogPostFactory(content='Our <b>lakehouse</b> migration took a quarter.')
+
+        response = api_client.get('/api/content/search/?q=lakehouse&type=posts')
+
+        assert response.status_code == 200
+        [hit] = response.data['results']['posts']
+        assert hit['slug'] == post.slug
+        assert '<mark>' in hit['snippet']
+        assert '<b>' not in hit['snippet']
+
+    @pytest.mark.parametrize('limit', ['-1', '0'])
+    def test_search_view_clamps_limit(self, api_client, limit):
+        post = BlogPostFactory(title='Lakehouse migration')
+
+        response = api_client.get(f'/api/content/search/?q=lakehouse&type=posts&limit={limit}')
+
+        assert response.status_code == 200
+        assert [hit['id'] for hit in response.data['results']['posts']] == [post.pk]
+
+    def test_search_view_requires_query(self, api_client):
+        assert api_client.get('/api/content/search/').status_code == 400
@@ -0,0 +1,143 @@
+# content/tests/test_sitemaps.py
+from datetime import timedelta
+from xml.etree import ElementTree
+
+import pytest
+
+from content.models import BlogPost
+from .factories import BlogPostFactory, CaseStudyFactory, ResourceFactory
+
+SITEMAP = '{http://www.sitemaps.org/schemas/sitemap/0.9}'
+ATOM = '{http://www.w3.org/2005/Atom}'
+
+
+@pytest.fixture(autouse=True)
+def sitemap_settings(settings, tmp_path):
+    settings.SITEMAPS = {'SITE_URL': 'https://example.com', 'CACHE_DIR': str(tmp_path)}
+    return settings
+
+
+def fetch(client, url, **headers):
+    response = client.get(url, **headers)
+    body = b''.join(response.streaming_content) if response.streaming else response.content
+    return response, body
+
+
+def locations(body, tag):
+    return [node.text for node in ElementTree.fromstring(body).iter(f'{SITEMAP}{tag}')]
+
+
+@pytest.mark.django_db
+class TestSitemaps:
+    def test_index_lists_sections_with_content(self, client):
+        BlogPostFactory()
+        CaseStudyFactory()
+
+        response, body = fetch(client, '/sitemap.xml')
+
+        assert response.status_code == 200
+        assert response['Content-Type'].startswith('application/xml')
+        assert locations(body, 'loc') == [
+            'http://testserver/sitemap-posts-1.xml',
+            'http://testserver/sitemap-case-studies-1.xml',
+        ]
+
+    def test_section_lists_published_urls_with_lastmod(self, client):
+        post = BlogPostFactory()
+        BlogPostFactory(status='DRAFT')
+
+        response, body = fetch(client, '/sitemap-posts-1.xml')
+
+        assert locations(body, 'loc') == [f'https://example.com/blog/{post.slug}']
+        assert locations(body, 'lastmod') == [post.updated_at.replace(microsecond=0).isoformat()]
+        assert response['Last-Modified']
+
+    def test_sections_are_paginated(self, client, sitemap_settings):
+        sitemap_settings.SITEMAPS = {**sitemap_settings.SITEMAPS, 'URLS_PER_SITEMAP': 2}
+        posts = ResourceFactory.create_batch(3)
+
+        _, index = fetch(client, '/sitemap.xml')
+        _, second = fetch(client, '/sitemap-resources-2.xml')
+
+        assert len(locations(index, 'loc')) == 2
+        assert locations(second, 'loc') == [f'https://example.com/resources/{posts[2].slug}']
+        assert client.get('/sitemap-resources-3.xml').status_code == 404
+
+    def test_cached_copy_served_until_content_changes(
+        self, client, tmp_path, django_assert_num_queries
+    ):
+        post = BlogPostFactory()
+        _, first = fetch(client, '/sitemap-posts-1.xml')
+
+        # Only the aggregate; the rows are not read again.
+        with django_assert_num_queries(1):
+            _, cached = fetch(client, '/sitemap-posts-1.xml')
+        assert cached == first
+        assert len(list(tmp_path.glob('sitemap-posts-1.*.xml'))) == 1
+
+        BlogPost.objects.filter(pk=post.pk).update(slug='renamed')
+        BlogPost.objects.get(pk=post.pk).save()
+        _, changed = fetch(client, '/sitemap-posts-1.xml')
+
+        assert b'/blog/renamed' in changed
+        assert len(list(tmp_path.glob('sitemap-posts-1.*.xml'))) == 1
+
+    def test_deletion_regenerates(self, client):
+        keep, gone = BlogPostFactory.create_batch(2)
+        fetch(client, '/sitemap-posts-1.xml')
+
+        gone.delete()
+        _, body = fetch(client, '/sitemap-posts-1.xml')
+
+        assert locations(body, 'loc') == [f'https://example.com/blog/{keep.slug}']
+
+    def test_revalidation_is_not_modified(self, client):
+        BlogPostFactory()
+        response, _ = fetch(client, '/sitemap-posts-1.xml')
+
+        again = client.get('/sitemap-posts-1.xml', HTTP_IF_NONE_MATCH=response['ETag'])
+
+        assert again.status_code == 304
+
+    def test_unknown_section_is_404(self, client):
+        assert client.get('/sitemap-drafts-1.xml').status_code == 404
+
+
+@pytest.mark.django_db
+class TestFeeds:
+    def test_rss_feed(self, client):
+        post = BlogPostFactory(title='Scaling <AI>', content='# Heading\n\nBody text.')
+
+        response, body = fetch(client, '/feeds/posts.rss')
+
+        assert response['Content-Type'].startswith('application/rss+xml')
+        channel = ElementTree.fromstring(body).find('channel')
+        item = channel.find('item')
+        assert item.find('title').text == 'Scaling <AI>'
+        assert item.find('link').text == f'https://example.com/blog/{post.slug}'
+        assert 'Body text.' in item.find('{http://purl.org/rss/1.0/modules/content/}encoded').text
+
+    def test_atom_feed_orders_newest_first(self, client, sitemap_settings):
+        sitemap_settings.SITEMAPS = {**sitemap_settings.SITEMAPS, 'FEED_ITEMS': 1}
+        older = CaseStudyFactory()
+        newer = CaseStudyFactory(published_at=older.published_at + timedelta(days=1))
+
+        _, body = fetch(client, '/feeds/case-studies.atom')
+
+        entries = ElementTree.fromstring(body).findall(f'{ATOM}entry')
+        assert [entry.find(f'{ATOM}id').text for entry in entries] == [
+            f'https://example.com/case-studies/{newer.slug}'
+        ]
+
+    def test_query_string_shares_the_cached_feed(self, client, sitemap_settings, tmp_path):
+        BlogPostFactory()
+
+        _, body = fetch(client, '/feeds/posts.atom?utm_source=newsletter')
+        fetch(client, '/feeds/posts.atom?utm_source=social')
+
+        feed = ElementTree.fromstring(body)
+        assert feed.find(f'{ATOM}id').text == 'http://testserver/feeds/posts.atom'
+        assert len(list(tmp_path.iterdir())) == 1
+
+    def test_services_have_no_feed(self, client):
+        assert client.get('/feeds/services.rss').status_code == 404
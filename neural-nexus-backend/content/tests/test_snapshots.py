@@ -0,0 +1,86 @@
+# content/tests/test_snapshots.py
+import json
+from io import StringIO
+
+import pytest
+from django.core.management import call_command
+
+from content.models import BlogPost
+from content.snapshots import SnapshotBuilder
+from .factories import BlogPostFactory, CaseStudyFactory, ResourceFactory
+
+
+def _manifest(output_dir):
+    return json.loads((output_dir / 'manifest.json').read_text())
+
+
+@pytest.mark.django_db
+class TestSnapshotBuilder:
+    def test_renders_published_content_with_hashed_names(self, tmp_path):
+        post = BlogPostFactory()
+        BlogPostFactory(status='DRAFT')
+        CaseStudyFactory(status='PUBLISHED')
+        ResourceFactory()
+
+        stats = SnapshotBuilder(tmp_path, workers=1).build()
+
+        manifest = _manifest(tmp_path)
+        assert stats['posts']['rendered'] == 1
+        assert list(manifest['kinds']['posts']) == [post.slug]
+        entry = manifest['kinds']['posts'][post.slug]
+        assert entry['file'].startswith(f'posts/{post.slug}.')
+        assert entry['file'].endswith(f".{entry['sha256'][:12]}.json")
+        data = json.loads((tmp_path / entry['file']).read_text())
+        assert data['title'] == post.title
+        assert len(manifest['kinds']['case-studies']) == 1
+        assert len(manifest['kinds']['resources']) == 1
+
+    def test_only_changed_objects_are_rendered(self, tmp_path):
+        post, other = BlogPostFactory.create_batch(2)
+        builder = SnapshotBuilder(tmp_path, workers=1)
+        builder.build()
+        old_file = _manifest(tmp_path)['kinds']['posts'][post.slug]['file']
+        unchanged_file = _manifest(tmp_path)['kinds']['posts'][other.slug]['file']
+
+        post.title = 'Retitled'
+        post.save()
+        stats = builder.build()
+
+        manifest = _manifest(tmp_path)
+        assert stats['posts'] == {'rendered': 1, 'unchanged': 1, 'removed': 0}
+        assert manifest['kinds']['posts'][post.slug]['file'] != old_file
+        assert manifest['kinds']['posts'][other.slug]['file'] == unchanged_file
+        assert not (tmp_path / old_file).exists()
+
+    def test_removed_objects_are_pruned(self, tmp_path):
+        post = BlogPostFactory()
+        builder = SnapshotBuilder(tmp_path, workers=1)
+        builder.build()
+        stale = tmp_path / _manifest(tmp_path)['kinds']['posts'][post.slug]['file']
+
+        BlogPost.objects.filter(pk=post.pk).update(status='DRAFT')
+        stats = builder.build()
+
+        assert stats['posts']['removed'] == 1
+        assert _manifest(tmp_path)['kinds']['posts'] == {}
+        assert not stale.exists()
+
+    def test_missing_files_are_rebuilt(self, tmp_path):
+        post = BlogPostFactory()
+        builder = SnapshotBuilder(tmp_path, workers=1)
+        builder.build()
+        (tmp_path / _manifest(tmp_path)['kinds']['posts'][post.slug]['file']).unlink()
+
+        assert builder.build()['posts']['rendered'] == 1
+
+    def test_command(self, tmp_path):
+        BlogPostFactory()
+        out = StringIO()
+
+        call_command(
+            'build_content_snapshots', '--output', str(tmp_path), '--workers', '1',
+            '--kind', 'posts', stdout=out,
+        )
+
+        assert 'posts: 1 rendered, 0 unchanged, 0 removed' in out.getvalue()
+        assert list(_manifest(tmp_path)['kinds']) == ['posts']
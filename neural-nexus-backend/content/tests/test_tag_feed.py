@@ -0,0 +1,76 @@
+# content/tests/test_tag_feed.py
+from datetime import timedelta
+
+import pytest
+from django.core.cache import cache
+from django.utils import timezone
+
+from .factories import BlogPostFactory, CaseStudyFactory, ResourceFactory, TagFactory
+
+
+@pytest.fixture(autouse=True)
+def clear_cache():
+    cache.clear()
+    yield
+    cache.clear()
+
+
+@pytest.fixture
+def tagged_feed(db):
+    tag = TagFactory(slug='ml')
+    now = timezone.now()
+    items = []
+    for hours in range(7):
+        moment = now - timedelta(hours=hours)
+        factory = [BlogPostFactory, CaseStudyFactory][hours % 2]
+        item = factory(published_at=moment)
+        item.tags.add(tag)
+        items.append(item.title)
+    resource = ResourceFactory()
+    resource.tags.add(tag)
+    BlogPostFactory(status='DRAFT').tags.add(tag)
+    return tag, [resource.title] + items
+
+
+@pytest.mark.django_db
+class TestTagFeed:
+    url = '/api/content/tags/ml/content/'
+
+    def collect(self, client, url, **params):
+        titles, pages = [], 0
+        response = client.get(url, params)
+        while True:
+            pages += 1
+            titles += [item['title'] for item in response.data['results']]
+            if not response.data['next']:
+                return titles, pages
+            response = client.get(response.data['next'])
+
+    def test_pages_merge_all_types_newest_first(self, api_client, tagged_feed):
+        _, expected = tagged_feed
+
+        titles, pages = self.collect(api_client, self.url, page_size=3)
+
+        assert titles == expected
+        assert pages == 3
+
+    def test_items_are_compact(self, api_client, tagged_feed):
+        item = api_client.get(self.url).data['results'][1]
+
+        assert set(item) == {'id', 'type', 'slug', 'title', 'excerpt', 'featured_image', 'published_at'}
+
+    def test_pages_are_cached_until_tagged_content_changes(
+        self, api_client, tagged_feed, django_assert_num_queries
+    ):
+        tag, _ = tagged_feed
+        api_client.get(self.url)
+        with django_assert_num_queries(1):  # the tag lookup
+            api_client.get(self.url)
+
+        post = BlogPostFactory(title='Fresh')
+        post.tags.add(tag)
+
+        assert api_client.get(self.url).data['results'][0]['title'] == 'Fresh'
+
+    def test_invalid_cursor(self, api_client, tagged_feed):
+        assert api_client.get(self.url, {'cursor': 'nope'}).status_code == 404
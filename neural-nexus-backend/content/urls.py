@@ -5,8 +5,11 @@ from rest_framework.routers import DefaultRouter
 from . import views
 from .views import (
     ABTestViewSet,
+    AutocompleteView,
     CampaignViewSet,  # Add TrackingView import
+    ContentSearchView,
     LandingPageViewSet,
+    TrackingBatchView,
     TrackingView,
 )
 
@@ -21,8 +24,14 @@ router.register(r"campaigns", CampaignViewSet)
 router.register(r"landing-pages", LandingPageViewSet, basename="landingpage")
 router.register(r"ab-tests", ABTestViewSet)
 router.register(r"case-studies", views.CaseStudyViewSet, basename="casestudy")
+router.register(
+    r"case-study-categories", views.CaseStudyCategoryViewSet, basename="casestudycategory"
+)
 
 # Add the tracking view to urlpatterns
 urlpatterns = router.urls + [
     path("tracking/", TrackingView.as_view(), name="tracking"),
+    path("tracking/batch/", TrackingBatchView.as_view(), name="tracking-batch"),
+    path("search/", ContentSearchView.as_view(), name="content-search"),
+    path("autocomplete/", AutocompleteView.as_view(), name="content-autocomplete"),
 ]
@@ -1,22 +1,35 @@
 # content/views.py
 
 import logging
-from typing import Any, Dict
 
 import django_filters
-from django.core.exceptions import ValidationError
-from django.db.models import F, Q
+from django.db import transaction
+from django.db.models import F, Q, Subquery
+from django.http import Http404, StreamingHttpResponse
+from django.shortcuts import get_object_or_404
+from django.urls import reverse
 from django.utils import timezone
+from django.utils.cache import patch_vary_headers
+from django.views.decorators.http import require_GET
 from django_filters.rest_framework import DateTimeFilter, DjangoFilterBackend, FilterSet
 
-# Add this import if not already present
-from leads.models import NewsletterSubscription
+from core.conditional import ConditionalGetMixin, conditional_response, set_validators
+from core.response_cache import ResponseCacheMixin
 from rest_framework import filters, status, viewsets
 from rest_framework.decorators import action
+from rest_framework.exceptions import NotFound
 from rest_framework.pagination import PageNumberPagination
+from rest_framework.parsers import JSONParser
 from rest_framework.response import Response
+from rest_framework.utils.urls import remove_query_param, replace_query_param
 from rest_framework.views import APIView
 
+from . import ab_results, autocomplete, sitemaps
+from .ab_testing import ABTestConfig, assign_variant, get_visitor_id, set_visitor_cookie
+from .counters import counter_buffer
+from .counts import annotate_published_case_counts
+from .ingest import IngestQueueFull, tracking_buffer, variant_visit_buffer
+from .landing_pages import PayloadResponse, get_payload
 from .models import (
     ABTest,
     BlogAnalytics,
@@ -30,12 +43,21 @@ from .models import (
     Resource,
     ResourceDownload,
     Tag,
+    TrackingEvent,
     Variant,
     VariantVisit,
 )
+from .pagination import KeysetPagination, KeysetPaginationMixin
+from .parsers import NDJSONParser
+from .query_planner import QueryPlannerMixin
+from .related import RelatedContentMixin
+from .search import get_search_backend
+from .search.filters import FullTextSearchFilter
+from .tag_feed import InvalidFeedCursor, TagFeed
 from .serializers import (
     ABTestSerializer,
     BlogAnalyticsSerializer,
+    BlogPostListSerializer,
     BlogPostSerializer,
     CampaignSerializer,
     CaseStudyCategorySerializer,  # Add this line
@@ -45,13 +67,30 @@ from .serializers import (
     LeadMagnetSerializer,
     ResourceSerializer,
     TagSerializer,
+    TrackingEventSerializer,
 )
 
 
-class CategoryViewSet(viewsets.ReadOnlyModelViewSet):
+def count_view(response, model):
+    """Count a detail view and add this worker's unflushed views to the response.
+
+    Runs on cache hits as well as misses, so cached detail responses still
+    count every view. ``304`` answers are counted by ``object_not_modified``.
+    """
+    if response.status_code != 200:
+        return response
+    pk = response.data["id"]
+    counter_buffer.increment(model, pk, "view_count")
+    pending = counter_buffer.pending(model, pk, "view_count")
+    response.data = {**response.data, "view_count": response.data["view_count"] + pending}
+    return response
+
+
+class CategoryViewSet(ResponseCacheMixin, viewsets.ReadOnlyModelViewSet):
     queryset = Category.objects.all()
     serializer_class = CategorySerializer
     lookup_field = "slug"
+    cache_models = [Category]
 
 
 class BlogPostFilterSet(FilterSet):
@@ -75,8 +114,6 @@ def get_queryset(self):
     category_slug = self.request.query_params.get("category")
     if category_slug:
         queryset = queryset.filter(category__slug=category_slug)
-        print(f"Filtering by category: {category_slug}")  # Debug print
-        print(f"Found {queryset.count()} posts in category")  # Debug print
 
     # Handle search filtering
     search_query = self.request.query_params.get("search", None)
@@ -87,14 +124,11 @@ def get_queryset(self):
             | Q(excerpt__icontains=search_query)
             | Q(category__name__icontains=search_query)
         )
-        print(f"Search query: {search_query}")  # Debug print
-        print(f"Found {queryset.count()} matching posts")  # Debug print
 
     return queryset.order_by("-published_at")
 
     def list(self, request, *args, **kwargs):
         queryset = self.get_queryset()
-        print(f"Found {queryset.count()} published blog posts")  # Debug print
         serializer = self.get_serializer(queryset, many=True)
         return Response(serializer.data)
 
@@ -102,15 +136,29 @@ def get_queryset(self):
 # Add this after BlogPostFilterSet class in views.py
 
 
-class BlogPostViewSet(viewsets.ReadOnlyModelViewSet):
+class BlogPostViewSet(
+    ResponseCacheMixin,
+    ConditionalGetMixin,
+    RelatedContentMixin,
+    KeysetPaginationMixin,
+    QueryPlannerMixin,
+    viewsets.ReadOnlyModelViewSet,
+):
     serializer_class = BlogPostSerializer
     lookup_field = "slug"
-    filter_backends = [DjangoFilterBackend, filters.SearchFilter, filters.OrderingFilter]
+    cache_models = [BlogPost, Category, Tag, BlogAnalytics]
+    related_kind = "post"
+    filter_backends = [DjangoFilterBackend, filters.OrderingFilter]
     filterset_class = BlogPostFilterSet
-    search_fields = ["^title", "content", "excerpt", "category__name"]
     ordering_fields = ["published_at", "created_at", "view_count"]
     ordering = ["-published_at"]
 
+    def get_serializer_class(self):
+        # Lists ship the precomputed excerpt, never the body.
+        if self.action in ("list", "related"):
+            return BlogPostListSerializer
+        return super().get_serializer_class()
+
     def get_queryset(self):
         queryset = BlogPost.objects.filter(status="PUBLISHED")
 
@@ -118,34 +166,48 @@ class BlogPostViewSet(viewsets.ReadOnlyModelViewSet):
         category_slug = self.request.query_params.get("category")
         if category_slug:
             queryset = queryset.filter(category__slug=category_slug)
-            print(f"Filtering by category: {category_slug}")  # Debug print
-            print(f"Found {queryset.count()} posts in category")  # Debug print
 
-        # Handle search filtering
-        search_query = self.request.query_params.get("search", None)
+        # Handle search filtering; matches come back ranked by relevance
+        search_query = self.request.query_params.get("search", "").strip()
         if search_query:
-            queryset = queryset.filter(
-                Q(title__icontains=search_query)
-                | Q(content__icontains=search_query)
-                | Q(excerpt__icontains=search_query)
-                | Q(category__name__icontains=search_query)
-            )
-            print(f"Search query: {search_query}")  # Debug print
-            print(f"Found {queryset.count()} matching posts")  # Debug print
+            return self.plan_queryset(get_search_backend().filter(queryset, search_query))
 
-        return queryset.order_by("-published_at")
+        return self.plan_queryset(queryset.order_by("-published_at"))
 
     def list(self, request, *args, **kwargs):
         """
-        List blog posts and verify count
+        List published blog posts.
+
+        Returns the full list unless keyset pagination is requested with
+        ``?pagination=cursor`` (or a ``cursor`` from a previous page).
         """
-        queryset = self.get_queryset()
-        print(f"Found {queryset.count()} published blog posts")  # Debug print
+        return self.cached_response(request, lambda: self.conditional_list(self._build_list))
+
+    def get_list_queryset(self):
+        # The list applies its own category and search filters only.
+        return self.get_queryset()
+
+    def _build_list(self):
+        if self.use_keyset_pagination():
+            page = self.paginate_queryset(self.get_list_queryset())
+            serializer = self.get_serializer(page, many=True)
+            return self.get_paginated_response(serializer.data)
+
+        queryset = self.get_list_queryset()
         serializer = self.get_serializer(queryset, many=True)
         return Response(serializer.data)
 
+    def retrieve(self, request, *args, **kwargs):
+        """Count the view through the write-behind buffer and include pending views."""
+        response = super().retrieve(request, *args, **kwargs)
+        return count_view(response, BlogPost)
 
-class ResourceViewSet(viewsets.ReadOnlyModelViewSet):
+    def object_not_modified(self, pk):
+        counter_buffer.increment(BlogPost, pk, "view_count")
+
+
+class ResourceViewSet(ConditionalGetMixin, QueryPlannerMixin, viewsets.ReadOnlyModelViewSet):
+    cache_models = [Resource, Tag]
     queryset = Resource.objects.all()
     serializer_class = ResourceSerializer
     lookup_field = "slug"
@@ -153,7 +215,7 @@ class ResourceViewSet(viewsets.ReadOnlyModelViewSet):
 
     @action(detail=True, methods=["post"])
     def download(self, request, slug=None):
-        resource = self.get_object()
+        resource = get_object_or_404(Resource.objects.only("pk", "file_url", "is_gated"), slug=slug)
         email = request.data.get("email")
 
         if resource.is_gated and not email:
@@ -162,60 +224,56 @@ class ResourceViewSet(viewsets.ReadOnlyModelViewSet):
             )
 
         if email:
-            # Create or update subscriber using the leads app model
-            subscriber, created = NewsletterSubscription.objects.get_or_create(
-                email=email,
-                defaults={
-                    "first_name": request.data.get("first_name", ""),
-                    "source": "CONTENT_END",
-                },
-            )
-
-            # Create download record
-            download = ResourceDownload.objects.create(
-                resource=resource,
-                email=email,
+            # Repeat downloads by the same address are not recorded or counted again
+            created, _ = ResourceDownload.objects.record(
+                resource.pk,
+                email,
                 first_name=request.data.get("first_name", ""),
                 company=request.data.get("company", ""),
                 source_url=request.META.get("HTTP_REFERER", ""),
             )
-
-            # Update resource download count
-            resource.download_count = (resource.download_count or 0) + 1
-            resource.save(update_fields=["download_count"])
-
             return Response({"download_url": resource.file_url, "subscriber_created": created})
 
         # For non-gated resources
-        resource.download_count = (resource.download_count or 0) + 1
-        resource.save(update_fields=["download_count"])
+        Resource.objects.filter(pk=resource.pk).update(download_count=F("download_count") + 1)
         return Response({"download_url": resource.file_url})
 
 
-class LeadMagnetViewSet(viewsets.ReadOnlyModelViewSet):
+class LeadMagnetViewSet(ResponseCacheMixin, QueryPlannerMixin, viewsets.ReadOnlyModelViewSet):
     queryset = LeadMagnet.objects.filter(is_active=True)
     serializer_class = LeadMagnetSerializer
     lookup_field = "slug"
+    cache_models = [LeadMagnet, Resource, Tag]
 
 
-class TagViewSet(viewsets.ReadOnlyModelViewSet):
+class TagViewSet(ResponseCacheMixin, viewsets.ReadOnlyModelViewSet):
     queryset = Tag.objects.all()
     serializer_class = TagSerializer
     lookup_field = "slug"
+    cache_models = [Tag]
 
     @action(detail=True)
     def content(self, request, slug=None):
+        """Published posts, resources and case studies for the tag, newest first.
+
+        Keyset paginated with ``page_size`` and the ``cursor`` from ``next``.
+        """
         tag = self.get_object()
+        page_size = KeysetPagination().get_page_size(request)
+        cursor = request.query_params.get("cursor")
+        try:
+            page = TagFeed(tag, page_size).page(cursor)
+        except InvalidFeedCursor:
+            raise NotFound("Invalid cursor")
+
+        url = request.build_absolute_uri()
+        next_cursor = page["next_cursor"]
         return Response(
             {
-                "blog_posts": BlogPostSerializer(
-                    tag.blogpost_set.filter(status="PUBLISHED"),
-                    many=True,
-                    context={"request": request},
-                ).data,
-                "resources": ResourceSerializer(
-                    tag.resource_set.all(), many=True, context={"request": request}
-                ).data,
+                "tag": TagSerializer(tag).data,
+                "next": replace_query_param(url, "cursor", next_cursor) if next_cursor else None,
+                "first": remove_query_param(url, "cursor"),
+                "results": page["results"],
             }
         )
 
@@ -226,45 +284,47 @@ class BlogAnalyticsViewSet(viewsets.ModelViewSet):
     permission_classes = []  # Allow anonymous analytics tracking
 
     def create(self, request, *args, **kwargs):
+        """Fold a reading beacon into the post's running sums.
+
+        The sums are updated with a single atomic ``UPDATE``, so concurrent
+        beacons never overwrite each other. Averages are derived on read.
+        """
         blog_post_id = request.data.get("blog_post")
         try:
-            blog_post = BlogPost.objects.get(id=blog_post_id)
-            analytics, created = BlogAnalytics.objects.get_or_create(blog_post=blog_post)
-
-            time_on_page = request.data.get("time_on_page")
+            blog_post_id = int(blog_post_id)
+            time_on_page = float(request.data.get("time_on_page") or 0)
+        except (TypeError, ValueError):
+            return Response(
+                {"detail": "blog_post and time_on_page must be numbers."},
+                status=status.HTTP_400_BAD_REQUEST,
+            )
+        is_bounce = str(request.data.get("is_bounce", False)).lower() in ("true", "1")
+
+        if time_on_page and self._add_visit(blog_post_id, time_on_page, is_bounce):
+            created = False
+        else:
+            # No analytics row yet (or nothing to add); create it on first use.
+            if not BlogPost.objects.filter(id=blog_post_id).exists():
+                return Response({"detail": "Blog post not found."}, status=status.HTTP_404_NOT_FOUND)
+            _, created = BlogAnalytics.objects.get_or_create(blog_post_id=blog_post_id)
             if time_on_page:
-                # Calculate new average time on page
-                new_avg = (
-                    (
-                        (analytics.avg_time_on_page * analytics.return_visits + float(time_on_page))
-                        / (analytics.return_visits + 1)
-                    )
-                    if analytics.avg_time_on_page
-                    else float(time_on_page)
-                )
-
-                analytics.avg_time_on_page = new_avg
-                analytics.return_visits += 1
+                self._add_visit(blog_post_id, time_on_page, is_bounce)
 
-                is_bounce = request.data.get("is_bounce", False)
-                if is_bounce:
-                    analytics.bounce_rate = (
-                        (
-                            (analytics.bounce_rate * (analytics.return_visits - 1) + 1)
-                            / analytics.return_visits
-                        )
-                        if analytics.bounce_rate
-                        else 1
-                    )
+        analytics = BlogAnalytics.objects.get(blog_post_id=blog_post_id)
 
-                analytics.save()
+        serializer = self.get_serializer(analytics)
+        status_code = status.HTTP_201_CREATED if created else status.HTTP_200_OK
+        return Response(serializer.data, status=status_code)
 
-            serializer = self.get_serializer(analytics)
-            status_code = status.HTTP_201_CREATED if created else status.HTTP_200_OK
-            return Response(serializer.data, status=status_code)
-
-        except BlogPost.DoesNotExist:
-            return Response({"detail": "Blog post not found."}, status=status.HTTP_404_NOT_FOUND)
+    @staticmethod
+    def _add_visit(blog_post_id, time_on_page, is_bounce):
+        """Atomically add one visit; returns False if no analytics row exists yet."""
+        return BlogAnalytics.objects.filter(blog_post_id=blog_post_id).update(
+            return_visits=F("return_visits") + 1,
+            time_on_page_total=F("time_on_page_total") + time_on_page,
+            bounce_count=F("bounce_count") + int(is_bounce),
+            last_updated=timezone.now(),
+        ) > 0
 
 
 class CampaignViewSet(viewsets.ReadOnlyModelViewSet):
@@ -280,95 +340,108 @@ class CampaignViewSet(viewsets.ReadOnlyModelViewSet):
         return queryset
 
 
-class LandingPageViewSet(viewsets.ReadOnlyModelViewSet):
+class LandingPageViewSet(ConditionalGetMixin, QueryPlannerMixin, viewsets.ReadOnlyModelViewSet):
+    cache_models = [LandingPage, ABTest, Variant]
     serializer_class = LandingPageSerializer
     lookup_field = "slug"
 
     def get_queryset(self):
-        return LandingPage.objects.filter(is_active=True)
+        return self.plan_queryset(LandingPage.objects.filter(is_active=True))
 
     def retrieve(self, request, *args, **kwargs):
-        instance = self.get_object()
-        # Handle A/B test variant selection
-        variant = self._get_or_assign_variant(instance, request.session)
-
+        row = self.get_validator_row()
+        if row is None:
+            raise Http404
+
+        # Assignment is a hash of the visitor and test ids against cached
+        # test configuration, so it needs no queries and no session.
+        visitor_id, is_new_visitor = get_visitor_id(request)
+        variant = assign_variant(row["pk"], visitor_id)
         if variant:
-            # Track the visit
-            VariantVisit.objects.create(variant=variant, session_id=request.session.session_key)
-            # Use variant content
-            serializer = self.get_serializer(instance)
-            data = serializer.data
-            data["content"] = variant.content
-            return Response(data)
-
-        # No A/B test, return normal content
-        serializer = self.get_serializer(instance)
-        return Response(serializer.data)
-
-    def _get_or_assign_variant(self, landing_page, session):
-        active_test = ABTest.objects.filter(
-            landing_page=landing_page,
-            is_active=True,
-            start_date__lte=timezone.now(),
-            end_date__isnull=True,
-        ).first()
-
-        if not active_test:
-            return None
-
-        # Check if variant is already assigned to this session
-        session_key = f"ab_test_{active_test.id}"
-        variant_id = session.get(session_key)
-
-        if variant_id:
+            # The visit is saved now so a conversion posted to any worker finds
+            # it; only its hourly rollup count is buffered.
+            visit = VariantVisit.objects.create(variant_id=variant.id, session_id=visitor_id)
             try:
-                return Variant.objects.get(id=variant_id)
-            except Variant.DoesNotExist:
-                pass
-
-        # Assign new variant based on traffic distribution
-        variants = list(active_test.variants.all())
-        if not variants:
-            return None
-
-        # Simple random distribution based on traffic_percentage
-        import random
-
-        total = sum(v.traffic_percentage for v in variants)
-        r = random.uniform(0, total)
-        cumulative = 0
-        for variant in variants:
-            cumulative += variant.traffic_percentage
-            if r <= cumulative:
-                session[session_key] = variant.id
-                return variant
-
-        return variants[0]  # Fallback to first variant
-
-
-class ABTestViewSet(viewsets.ReadOnlyModelViewSet):
+                variant_visit_buffer.submit(visit)
+            except IngestQueueFull:
+                with transaction.atomic():
+                    ab_results.add_visits([visit])
+
+        # The variant decides the content, so it is part of the ETag. Variants
+        # change without touching the page, so no Last-Modified is sent.
+        variant_id = variant.id if variant else None
+        etag, _ = self.get_detail_validators(row, variant_id)
+        response = conditional_response(request, etag)
+        if response is None:
+            payload = get_payload(row["pk"], variant_id)
+            if payload is None:
+                raise Http404
+            response = set_validators(PayloadResponse(payload), etag)
+        patch_vary_headers(response, ["Cookie", "X-Visitor-Id"])
+        if is_new_visitor:
+            set_visitor_cookie(response, visitor_id)
+        return response
+
+
+class ABTestViewSet(QueryPlannerMixin, viewsets.ReadOnlyModelViewSet):
     queryset = ABTest.objects.filter(is_active=True)
     serializer_class = ABTestSerializer
 
+    def get_queryset(self):
+        # Results stay readable after a test is switched off.
+        if self.action == "results":
+            return self.plan_queryset(ABTest.objects.all())
+        return super().get_queryset()
+
     @action(detail=True, methods=["post"])
     def record_conversion(self, request, pk=None):
         test = self.get_object()
-        variant_id = request.session.get(f"ab_test_{test.id}")
+        visitor_id, is_new_visitor = get_visitor_id(request)
+        variant = None if is_new_visitor else ABTestConfig.from_instance(test).assign(visitor_id)
 
-        if not variant_id:
+        if not variant:
             return Response({"error": "No variant assigned"}, status=status.HTTP_400_BAD_REQUEST)
 
-        visit = VariantVisit.objects.filter(
-            variant_id=variant_id, session_id=request.session.session_key, converted=False
-        ).first()
-
-        if visit:
-            visit.converted = True
-            visit.conversion_timestamp = timezone.now()
-            visit.save()
+        converted_at = timezone.now()
+        with transaction.atomic():
+            converted = self._convert_latest_visit(variant.id, visitor_id, converted_at)
+            if converted:
+                ab_results.add_conversion(variant.id, converted_at)
 
+        if not converted:
+            return Response(
+                {"error": "No unconverted visit for this visitor"},
+                status=status.HTTP_404_NOT_FOUND,
+            )
         return Response({"status": "conversion recorded"})
 
+    @action(detail=True, methods=["get"])
+    def results(self, request, pk=None):
+        """Per-variant visits, conversions, rates and significance vs. the control."""
+        try:
+            alpha = float(request.query_params.get("alpha", ab_results.DEFAULT_ALPHA))
+        except ValueError:
+            alpha = None
+        if alpha is None or not 0 < alpha < 1:
+            return Response(
+                {"error": "alpha must be between 0 and 1"}, status=status.HTTP_400_BAD_REQUEST
+            )
+        return Response(ab_results.summarize_test(self.get_object(), alpha=alpha))
+
+    @staticmethod
+    def _convert_latest_visit(variant_id, visitor_id, converted_at):
+        """Mark the visitor's latest unconverted visit converted in one UPDATE."""
+        latest = (
+            VariantVisit.objects.filter(
+                variant_id=variant_id, session_id=visitor_id, converted=False
+            )
+            .order_by("-timestamp", "-id")
+            .values("pk")[:1]
+        )
+        return VariantVisit.objects.filter(pk__in=Subquery(latest)).update(
+            converted=True, conversion_timestamp=converted_at
+        )
+
 
 class CaseStudyFilterSet(FilterSet):
     created_after = DateTimeFilter(field_name="created_at", lookup_expr="gte")
@@ -400,19 +473,34 @@ class CaseStudyCategoryViewSet(viewsets.ReadOnlyModelViewSet):
 
     def get_queryset(self):
         """Only return active categories that have published cases."""
-        return CaseStudyCategory.objects.filter(
-            is_active=True, case_studies__status="PUBLISHED"
-        ).distinct()
+        return (
+            annotate_published_case_counts(CaseStudyCategory.objects.filter(is_active=True))
+            .filter(published_case_count__gt=0)
+            .order_by("name")
+        )
 
 
-class CaseStudyViewSet(viewsets.ReadOnlyModelViewSet):
-    """ViewSet for case studies with enhanced filtering."""
+class CaseStudyViewSet(
+    ResponseCacheMixin,
+    ConditionalGetMixin,
+    RelatedContentMixin,
+    KeysetPaginationMixin,
+    QueryPlannerMixin,
+    viewsets.ReadOnlyModelViewSet,
+):
+    """ViewSet for case studies with enhanced filtering.
+
+    Uses page-number pagination by default; ``?pagination=cursor`` switches to
+    keyset pagination ordered on ``(published_at, id)``.
+    """
+
+    cache_models = [CaseStudy, CaseStudyCategory, Tag]
+    related_kind = "case-study"
 
     serializer_class = CaseStudySerializer
     lookup_field = "slug"
     pagination_class = CaseStudyPagination
-    filter_backends = [DjangoFilterBackend, filters.SearchFilter, filters.OrderingFilter]
-    search_fields = ["title", "client_name", "challenge", "solution", "industry"]
+    filter_backends = [DjangoFilterBackend, filters.OrderingFilter, FullTextSearchFilter]
     ordering_fields = ["published_at", "created_at", "view_count"]
     ordering = ["-published_at"]
 
@@ -434,73 +522,264 @@ class CaseStudyViewSet(viewsets.ReadOnlyModelViewSet):
         if is_featured:
             queryset = queryset.filter(is_featured=True)
 
-        return queryset
+        return self.plan_queryset(queryset)
 
     def retrieve(self, request, *args, **kwargs):
-        """Increment view count on retrieve."""
-        instance = self.get_object()
-        instance.view_count = F("view_count") + 1
-        instance.save(update_fields=["view_count"])
-        return super().retrieve(request, *args, **kwargs)
+        """Count the view through the write-behind buffer and include pending views."""
+        response = super().retrieve(request, *args, **kwargs)
+        return count_view(response, CaseStudy)
 
+    def object_not_modified(self, pk):
+        counter_buffer.increment(CaseStudy, pk, "view_count")
 
-logger = logging.getLogger(__name__)
 
-class TrackingView(APIView):
+class ContentSearchView(APIView):
     """
-    API View for handling analytics tracking events.
-    Accepts POST requests with tracking data and logs them appropriately.
+    Ranked full-text search over published blog posts and case studies.
+
+    Query parameters:
+        q: Search terms (required)
+        type: Restrict to "posts" or "case-studies"
+        limit: Maximum hits per type (default 10, max 50)
     """
 
-    def validate_tracking_data(self, data: Dict[str, Any]) -> bool:
-        """
-        Validate the tracking event data structure.
-        """
-        required_fields = ['eventName', 'timestamp', 'identity']
-        return all(field in data for field in required_fields)
+    search_models = {
+        "posts": BlogPost,
+        "case-studies": CaseStudy,
+    }
+
+    def get(self, request):
+        query = request.query_params.get("q", "").strip()
+        if not query:
+            return Response(
+                {"detail": "Query parameter 'q' is required."}, status=status.HTTP_400_BAD_REQUEST
+            )
 
-    def post(self, request):
         try:
-            # Get the tracking data
-            tracking_data = request.data
+            limit = max(1, min(int(request.query_params.get("limit", 10)), 50))
+        except ValueError:
+            limit = 10
 
-            # Validate the tracking data structure
-            if not self.validate_tracking_data(tracking_data):
+        requested = request.query_params.get("type")
+        if requested and requested not in self.search_models:
+            return Response(
+                {"detail": f"Unknown type '{requested}'."}, status=status.HTTP_400_BAD_REQUEST
+            )
+
+        backend = get_search_backend()
+        results = {}
+        for name, model in self.search_models.items():
+            if requested and name != requested:
+                continue
+            published = model.objects.filter(status="PUBLISHED")
+            hits = backend.search(published, query, limit=limit)
+            rows = published.in_bulk([hit.pk for hit in hits])
+            results[name] = [
+                {
+                    "id": hit.pk,
+                    "slug": rows[hit.pk].slug,
+                    "title": rows[hit.pk].title,
+                    "excerpt": rows[hit.pk].excerpt,
+                    "published_at": rows[hit.pk].published_at,
+                    "rank": hit.rank,
+                    "snippet": hit.snippet,
+                }
+                for hit in hits
+                if hit.pk in rows
+            ]
+
+        return Response({"query": query, "results": results})
+
+
+class AutocompleteView(APIView):
+    """
+    Typeahead suggestions from the in-memory prefix index.
+
+    Query parameters:
+        q: Text typed so far (required)
+        kind: Comma-separated kinds to include (service, feature, post,
+            case-study, tag); all by default
+        limit: Maximum suggestions (default 8, max 20)
+    """
+
+    def get(self, request):
+        query = request.query_params.get("q", "").strip()
+        if not query:
+            return Response({"query": query, "results": []})
+
+        try:
+            limit = int(request.query_params.get("limit", 8))
+        except ValueError:
+            limit = 8
+
+        kinds = None
+        if request.query_params.get("kind"):
+            kinds = set(request.query_params["kind"].split(","))
+            unknown = kinds - set(autocomplete.KINDS)
+            if unknown:
                 return Response(
-                    {"error": "Invalid tracking data structure"},
-                    status=status.HTTP_400_BAD_REQUEST
+                    {"detail": f"Unknown kind '{sorted(unknown)[0]}'."},
+                    status=status.HTTP_400_BAD_REQUEST,
                 )
 
-            # Log the tracking event with structured data
-            logger.info(
-                "Tracking event received",
-                extra={
-                    "event_name": tracking_data.get("eventName"),
-                    "timestamp": tracking_data.get("timestamp"),
-                    "identity": tracking_data.get("identity"),
-                    "source": tracking_data.get("source"),
-                    "path": tracking_data.get("path"),
-                    "properties": tracking_data.get("properties", {})
-                }
+        suggestions = autocomplete.suggest(query, limit=limit, kinds=kinds)
+        return Response(
+            {
+                "query": query,
+                "results": [
+                    {"text": suggestion.text, "kind": suggestion.kind, "slug": suggestion.slug}
+                    for suggestion in suggestions
+                ],
+            }
+        )
+
+
+logger = logging.getLogger(__name__)
+
+class TrackingView(APIView):
+    """
+    API View for handling analytics tracking events.
+
+    Valid events are queued on the worker's ingest buffer and written in
+    batches, so the response only confirms the event was accepted. When the
+    buffer is full the view answers 429 with ``Retry-After`` instead of
+    waiting for the database.
+    """
+
+    def post(self, request):
+        serializer = TrackingEventSerializer(data=request.data)
+        if not serializer.is_valid():
+            return Response(
+                {"error": "Invalid tracking data structure", "details": serializer.errors},
+                status=status.HTTP_400_BAD_REQUEST,
+            )
+
+        try:
+            tracking_buffer.submit(TrackingEvent(**serializer.validated_data))
+        except IngestQueueFull as exc:
+            logger.warning("Tracking ingest queue full; rejecting event")
+            return Response(
+                {"error": "Too many tracking events, retry later"},
+                status=status.HTTP_429_TOO_MANY_REQUESTS,
+                headers={"Retry-After": str(exc.retry_after)},
             )
 
-            # Here you could also store the tracking data in your database
-            # or send it to an external analytics service
+        return Response(
+            {"status": "success", "message": "Tracking event accepted"},
+            status=status.HTTP_202_ACCEPTED,
+        )
+
+
+class TrackingBatchView(APIView):
+    """
+    Accepts many tracking events in one request.
+
+    The body is a JSON array or ``application/x-ndjson`` with one event per
+    line. Events are validated together, one field at a time across the
+    batch (see ``TrackingEventSerializer.validate_batch``); valid events are
+    stored together in a single transaction and invalid ones are reported by
+    their position in the batch. A batch with no valid events is rejected
+    with 400.
+    """
 
-            return Response({
-                "status": "success",
-                "message": "Tracking event recorded successfully"
-            }, status=status.HTTP_200_OK)
+    parser_classes = [JSONParser, NDJSONParser]
+    max_batch_size = 500
 
-        except ValidationError as e:
-            logger.error(f"Validation error in tracking data: {str(e)}")
+    def post(self, request):
+        events = request.data
+        if not isinstance(events, list):
             return Response(
-                {"error": str(e)},
-                status=status.HTTP_400_BAD_REQUEST
+                {"error": "Expected a JSON array or NDJSON body of events"},
+                status=status.HTTP_400_BAD_REQUEST,
             )
-        except Exception as e:
-            logger.error(f"Error processing tracking event: {str(e)}")
+        if len(events) > self.max_batch_size:
             return Response(
-                {"error": "Internal server error"},
-                status=status.HTTP_500_INTERNAL_SERVER_ERROR
+                {"error": f"At most {self.max_batch_size} events per batch"},
+                status=status.HTTP_413_REQUEST_ENTITY_TOO_LARGE,
             )
+
+        valid, errors = TrackingEventSerializer.validate_batch(events)
+        accepted = [TrackingEvent(**attrs) for attrs in valid.values()]
+        rejected = [{"index": index, "errors": errors[index]} for index in sorted(errors)]
+
+        if not accepted and events:
+            return Response(
+                {"accepted": 0, "rejected": rejected}, status=status.HTTP_400_BAD_REQUEST
+            )
+
+        with transaction.atomic():
+            TrackingEvent.objects.bulk_create(accepted, batch_size=self.max_batch_size)
+
+        return Response({"accepted": len(accepted), "rejected": rejected}, status=status.HTTP_200_OK)
+
+
+def _xml_response(request, name, parts, last_modified, generate, content_type):
+    """Stream an XML document from the disk cache, or answer 304."""
+    etag = sitemaps.document_etag(name, parts)
+    not_modified = conditional_response(request, etag, last_modified)
+    if not_modified is not None:
+        return not_modified
+    response = StreamingHttpResponse(
+        sitemaps.cached_stream(name, parts, generate), content_type=content_type
+    )
+    return set_validators(response, etag, last_modified)
+
+
+@require_GET
+def sitemap_index(request):
+    """Sitemap index listing every child sitemap."""
+    stamps = {section.name: section.stamp() for section in sitemaps.SECTIONS}
+    last_modified = max((stamp for stamp, _ in stamps.values() if stamp), default=None)
+
+    def sitemap_url(section, page):
+        return request.build_absolute_uri(reverse("sitemap-section", args=[section, page]))
+
+    return _xml_response(
+        request,
+        "sitemap",
+        (stamps, request.build_absolute_uri("/")),
+        last_modified,
+        lambda: sitemaps.sitemap_index(stamps, sitemap_url),
+        "application/xml; charset=utf-8",
+    )
+
+
+@require_GET
+def sitemap_section(request, section, page):
+    """One page of the sitemap of a content section."""
+    section = sitemaps.SECTIONS_BY_NAME.get(section)
+    if section is None:
+        raise Http404
+    last_modified, count = section.stamp()
+    if not 1 <= page <= sitemaps.page_count(count):
+        raise Http404
+    site_url = sitemaps.get_site_url(request)
+    return _xml_response(
+        request,
+        f"sitemap-{section.name}-{page}",
+        (last_modified, count, site_url),
+        last_modified,
+        lambda: sitemaps.sitemap_page(section, page, site_url),
+        "application/xml; charset=utf-8",
+    )
+
+
+@require_GET
+def content_feed(request, section, format):
+    """RSS or Atom feed of the newest entries of a content section."""
+    section = sitemaps.SECTIONS_BY_NAME.get(section)
+    if section is None or not section.feed:
+        raise Http404
+    last_modified, count = section.stamp()
+    site_url = sitemaps.get_site_url(request)
+    # Without the query string, so tracking parameters share one cached document.
+    feed_url = request.build_absolute_uri(reverse(f"feed-{format}", args=[section.name]))
+    writer = sitemaps.FEED_WRITERS[format]
+    return _xml_response(
+        request,
+        f"feed-{section.name}-{format}",
+        (last_modified, count, site_url, feed_url),
+        last_modified,
+        lambda: writer(section, last_modified, site_url, feed_url),
+        sitemaps.FEED_FORMATS[format],
+    )
@@ -0,0 +1,79 @@
+# core/cache.py
+
+"""Shared cache helpers.
+
+:class:`CacheVersion` is a version stamp kept in Django's cache. Code that
+caches derived data in process memory records the version it was built
+against and rebuilds when the stamp moves; signal handlers call
+:meth:`CacheVersion.bump` when the underlying rows change.
+
+The stamp is only shared between worker processes when the cache backend is
+shared (Redis, Memcached, database). With the default per-process
+``LocMemCache`` a bump is seen only by the worker that made it, so callers
+should also bound how long they trust an in-process copy.
+
+Typical usage example:
+    from core.cache import CacheVersion
+
+    catalog_version = CacheVersion('services.catalog')
+    catalog_version.bump()
+"""
+
+import time
+
+from django.core.cache import caches
+
+
+class CacheVersion:
+    """Monotonic version stamp stored under ``version:<name>`` in a cache.
+
+    Attributes:
+        name (str): Identifier of the data the version describes
+        alias (str): Cache alias holding the stamp
+    """
+
+    key_prefix = 'version'
+
+    def __init__(self, name, alias='default'):
+        self.name = name
+        self.alias = alias
+
+    @property
+    def key(self):
+        return f'{self.key_prefix}:{self.name}'
+
+    @property
+    def cache(self):
+        return caches[self.alias]
+
+    def get(self):
+        """Return the current version, initialising it if the cache lost it."""
+        version = self.cache.get(self.key)
+        if version is None:
+            # Seed from the clock so a stamp evicted from the cache never
+            # comes back with a value an old copy was built against.
+            self.cache.add(self.key, time.time_ns() // 1000, timeout=None)
+            version = self.cache.get(self.key)
+        return version
+
+    @staticmethod
+    def get_many(versions):
+        """Return the current values of ``versions`` with one cache read.
+
+        All stamps must live in the same cache alias.
+        """
+        if not versions:
+            return []
+        values = versions[0].cache.get_many([version.key for version in versions])
+        return [
+            values[version.key] if version.key in values else version.get()
+            for version in versions
+        ]
+
+    def bump(self):
+        """Invalidate everything built against the current version."""
+        try:
+            return self.cache.incr(self.key)
+        except ValueError:
+            self.get()
+            return self.cache.incr(self.key)
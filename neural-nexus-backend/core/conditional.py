@@ -0,0 +1,163 @@
+# core/conditional.py
+
+"""Conditional GET support (``ETag``/``Last-Modified``) for read-only viewsets.
+
+:class:`ConditionalGetMixin` computes validators without serializing
+anything: one ``MAX(updated_at)``/``COUNT(*)`` aggregate over the queryset
+``list`` returns (:meth:`ConditionalGetMixin.get_list_queryset`) and one indexed lookup of ``(pk, updated_at)`` for
+``retrieve``. When the request's ``If-None-Match`` or ``If-Modified-Since``
+matches, the view answers ``304 Not Modified`` straight away; otherwise the
+normal response is built and carries the validators.
+
+``updated_at`` does not move when related rows change (a renamed tag, a tag
+added to a post), so ETags also fold in the :func:`core.response_cache.model_version`
+of every model in the viewset's ``cache_models``. ``Last-Modified`` only
+reflects the viewset's own rows and has one second resolution; clients that
+send ``If-None-Match`` get the ETag comparison, which takes precedence.
+
+ETags are weak: the JSON and browsable API renderings of the same data are
+equivalent but not byte-identical.
+
+Typical usage example:
+    class ResourceViewSet(ConditionalGetMixin, viewsets.ReadOnlyModelViewSet):
+        cache_models = [Resource, Tag]
+"""
+
+import hashlib
+
+from django.db.models import Count, Max
+from django.http import HttpResponse
+from django.utils.cache import get_conditional_response
+from django.utils.http import http_date, parse_http_date_safe, quote_etag
+from rest_framework.response import Response
+
+from .response_cache import model_version, track_model
+
+
+def set_validators(response, etag, last_modified=None):
+    """Add ``ETag`` and, when known, ``Last-Modified`` headers to ``response``."""
+    response['ETag'] = etag
+    if last_modified is not None:
+        response['Last-Modified'] = http_date(last_modified.timestamp())
+    return response
+
+
+def conditional_response(request, etag, last_modified=None, response=None):
+    """Evaluate the request's preconditions against the given validators.
+
+    Args:
+        request: Incoming request
+        etag (str): Quoted ETag of the current representation
+        last_modified (datetime): Last modification time, if known
+        response: Response to convert; validator headers are copied onto
+            the ``304`` answer. Built from the validators when omitted.
+
+    Returns:
+        A ``304``/``412`` response, or ``None`` when the full response is due.
+    """
+    if response is None:
+        response = set_validators(HttpResponse(), etag, last_modified)
+    timestamp = int(last_modified.timestamp()) if last_modified is not None else None
+    result = get_conditional_response(
+        request, etag=etag, last_modified=timestamp, response=response
+    )
+    return None if result is response else result
+
+
+class ConditionalGetMixin:
+    """Viewset mixin answering revalidations without serializing the payload.
+
+    Attributes:
+        cache_models (list): Models whose versions are folded into ETags
+        last_modified_field (str): Timestamp field maintained on every save
+    """
+
+    cache_models = ()
+    last_modified_field = 'updated_at'
+
+    def __init_subclass__(cls, **kwargs):
+        super().__init_subclass__(**kwargs)
+        for model in cls.cache_models:
+            track_model(model)
+
+    def list(self, request, *args, **kwargs):
+        build = super().list
+        return self.conditional_list(lambda: build(request, *args, **kwargs))
+
+    def retrieve(self, request, *args, **kwargs):
+        build = super().retrieve
+        return self.conditional_retrieve(lambda: build(request, *args, **kwargs))
+
+    def conditional_list(self, build):
+        """Answer a list request with ``304`` or ``build()`` plus validators."""
+        etag, last_modified = self.get_list_validators()
+        not_modified = conditional_response(self.request, etag, last_modified)
+        if not_modified is not None:
+            return not_modified
+        return set_validators(build(), etag, last_modified)
+
+    def conditional_retrieve(self, build):
+        """Answer a detail request with ``304`` or ``build()`` plus validators."""
+        row = self.get_validator_row()
+        if row is None:
+            # Let the normal lookup raise its 404.
+            return build()
+        etag, last_modified = self.get_detail_validators(row)
+        not_modified = conditional_response(self.request, etag, last_modified)
+        if not_modified is not None:
+            self.object_not_modified(row['pk'])
+            return not_modified
+        return set_validators(build(), etag, last_modified)
+
+    def object_not_modified(self, pk):
+        """Hook run when a detail request is answered with ``304``."""
+
+    def finalize_response(self, request, response, *args, **kwargs):
+        # Responses that already carry validators (e.g. served from the
+        # response cache) can still be answered with a 304.
+        response = super().finalize_response(request, response, *args, **kwargs)
+        if (
+            isinstance(response, Response)
+            and response.status_code == 200
+            and response.has_header('ETag')
+        ):
+            last_modified = parse_http_date_safe(response.get('Last-Modified', ''))
+            return get_conditional_response(
+                request, etag=response['ETag'], last_modified=last_modified, response=response
+            )
+        return response
+
+    def get_list_queryset(self):
+        """Return the queryset ``list`` serializes; list validators aggregate it."""
+        return self.filter_queryset(self.get_queryset())
+
+    def get_list_validators(self):
+        queryset = self.get_list_queryset().prefetch_related(None).order_by()
+        aggregate = queryset.aggregate(
+            last_modified=Max(self.last_modified_field), count=Count('pk')
+        )
+        params = self.request.query_params
+        query = sorted((key, value) for key in params for value in params.getlist(key))
+        etag = self.make_etag(
+            self.request.path, query, aggregate['last_modified'], aggregate['count']
+        )
+        return etag, aggregate['last_modified']
+
+    def get_validator_row(self):
+        """Return ``{'pk', <last_modified_field>}`` for the requested object, or ``None``."""
+        lookup_url_kwarg = self.lookup_url_kwarg or self.lookup_field
+        queryset = self.filter_queryset(self.get_queryset()).prefetch_related(None)
+        rows = queryset.filter(**{self.lookup_field: self.kwargs[lookup_url_kwarg]}).values(
+            'pk', self.last_modified_field
+        )[:1]
+        return next(iter(rows), None)
+
+    def get_detail_validators(self, row, *extra):
+        last_modified = row[self.last_modified_field]
+        return self.make_etag(row['pk'], last_modified, *extra), last_modified
+
+    def make_etag(self, *parts):
+        """Return a weak ETag for ``parts`` and the cache model versions."""
+        versions = [model_version(model).get() for model in self.cache_models]
+        raw = repr((type(self).__name__, versions, parts))
+        return 'W/' + quote_etag(hashlib.sha256(raw.encode()).hexdigest()[:32])
@@ -0,0 +1,46 @@
+# core/merge_patch.py
+
+"""JSON Merge Patch (RFC 7396) helpers.
+
+A merge patch is an object mirroring the document it modifies: keys map to
+replacement values, nested objects are merged recursively and ``null``
+removes a key. Anything other than an object replaces the target outright.
+
+Merge patches cannot set a value to ``null``; :func:`make_merge_patch` drops
+such keys instead.
+
+Typical usage example:
+    patch = make_merge_patch(base, changed)
+    assert apply_merge_patch(base, patch) == changed
+"""
+
+import copy
+
+
+def apply_merge_patch(target, patch):
+    """Return ``target`` with ``patch`` applied; neither argument is modified."""
+    if not isinstance(patch, dict):
+        return copy.deepcopy(patch)
+    result = copy.deepcopy(target) if isinstance(target, dict) else {}
+    for key, value in patch.items():
+        if value is None:
+            result.pop(key, None)
+        else:
+            result[key] = apply_merge_patch(result.get(key), value)
+    return result
+
+
+def make_merge_patch(source, target):
+    """Return the smallest merge patch turning ``source`` into ``target``."""
+    if not isinstance(source, dict) or not isinstance(target, dict):
+        return copy.deepcopy(target)
+    patch = {key: None for key in source if key not in target}
+    for key, value in target.items():
+        if value is None:
+            if key in source:
+                patch[key] = None
+        elif key not in source:
+            patch[key] = copy.deepcopy(value)
+        elif source[key] != value:
+            patch[key] = make_merge_patch(source[key], value)
+    return patch
@@ -0,0 +1,178 @@
+# core/prefix_index.py
+
+"""In-memory prefix index for typeahead suggestions.
+
+:class:`PrefixIndex` keeps one sorted list of keys per indexed word: the
+normalized text from that word to the end. A query is normalized the same way
+and located with :func:`bisect.bisect_left`; every key that starts with it
+follows contiguously. So "data str" finds "Enterprise Data Strategy" without
+scanning the other entries.
+
+:class:`SharedPrefixIndex` builds the index at most once per
+:class:`~core.cache.CacheVersion` and shares it between workers through
+Django's cache. Each worker keeps its own copy and checks the version at most
+every ``check_interval`` seconds, so most lookups touch neither the cache nor
+the database. Built indexes are also keyed by a ``max_age`` time window: with
+a per-process cache such as ``LocMemCache`` a bump only reaches the worker
+that made it, and the others still rebuild once the window ends.
+
+Typical usage example:
+    index = SharedPrefixIndex('content.autocomplete', build=load_suggestions)
+    index.get().search('data str', limit=5)
+"""
+
+import heapq
+import re
+import threading
+import time
+import unicodedata
+from bisect import bisect_left
+from dataclasses import dataclass
+
+from django.core.cache import caches
+
+from .cache import CacheVersion
+
+NON_WORD_RE = re.compile(r'[^\w]+')
+
+
+def normalize(text):
+    """Casefold ``text``, strip accents and collapse punctuation to spaces."""
+    decomposed = unicodedata.normalize('NFKD', text or '')
+    stripped = ''.join(char for char in decomposed if not unicodedata.combining(char))
+    return ' '.join(NON_WORD_RE.sub(' ', stripped.casefold()).split())
+
+
+@dataclass(frozen=True)
+class Suggestion:
+    """One suggestable string.
+
+    Attributes:
+        kind (str): What the suggestion refers to (``post``, ``tag``, ...)
+        text (str): Text shown to the user
+        slug (str): Identifier of the referenced object
+        weight (float): Higher ranks first among equally good matches
+    """
+
+    kind: str
+    text: str
+    slug: str
+    weight: float = 0
+
+
+class PrefixIndex:
+    """Sorted word-suffix keys over a fixed list of suggestions.
+
+    Attributes:
+        suggestions (list): Indexed suggestions
+        max_scan (int): Matching keys examined per query at most
+    """
+
+    def __init__(self, suggestions, max_scan=500):
+        self.suggestions = list(suggestions)
+        self.max_scan = max_scan
+        keys = []
+        for number, suggestion in enumerate(self.suggestions):
+            words = normalize(suggestion.text).split()
+            for position in range(len(words)):
+                keys.append((' '.join(words[position:]), position, number))
+        keys.sort()
+        self.keys = [key for key, _, _ in keys]
+        self.positions = [position for _, position, _ in keys]
+        self.numbers = [number for _, _, number in keys]
+
+    def __len__(self):
+        return len(self.suggestions)
+
+    def search(self, query, limit=10, kinds=None):
+        """Return up to ``limit`` suggestions with a word starting with ``query``.
+
+        Suggestions whose text starts with the query come first, then higher
+        weights, then shorter texts.
+        """
+        prefix = normalize(query)
+        if not prefix:
+            return []
+        ranks = {}
+        start = bisect_left(self.keys, prefix)
+        for offset in range(start, min(start + self.max_scan, len(self.keys))):
+            if not self.keys[offset].startswith(prefix):
+                break
+            number = self.numbers[offset]
+            suggestion = self.suggestions[number]
+            if kinds and suggestion.kind not in kinds:
+                continue
+            rank = (
+                self.positions[offset] > 0,
+                -suggestion.weight,
+                len(suggestion.text),
+                suggestion.text,
+                number,
+            )
+            if number not in ranks or rank < ranks[number]:
+                ranks[number] = rank
+        best = heapq.nsmallest(limit, ranks.values())
+        return [self.suggestions[rank[-1]] for rank in best]
+
+
+class SharedPrefixIndex:
+    """A :class:`PrefixIndex` rebuilt when its version moves, shared via the cache.
+
+    Attributes:
+        name (str): Version and cache key name
+        build: Callable returning the suggestions to index
+        check_interval (float): Seconds a worker trusts its copy without
+            looking at the version
+        timeout (int): Cache timeout of a built index
+        max_age (int): Seconds an index is used at most, even if its
+            version did not move; ``0`` disables the bound
+    """
+
+    def __init__(
+        self, name, build, check_interval=1.0, timeout=24 * 60 * 60, max_age=300, alias='default'
+    ):
+        self.name = name
+        self.build = build
+        self.check_interval = check_interval
+        self.timeout = timeout
+        self.max_age = max_age
+        self.alias = alias
+        self.version = CacheVersion(name, alias=alias)
+        self._index = None
+        self._index_version = None
+        self._checked_at = 0.0
+        self._lock = threading.Lock()
+
+    def _key(self, version):
+        return f'prefix-index:{self.name}:{version[0]}:{version[1]}'
+
+    def _current_version(self):
+        window = int(time.time() // self.max_age) if self.max_age else 0
+        return self.version.get(), window
+
+    def get(self):
+        """Return the current index, loading or building it when stale."""
+        if self._index is not None and time.monotonic() - self._checked_at < self.check_interval:
+            return self._index
+        with self._lock:
+            version = self._current_version()
+            if self._index is None or version != self._index_version:
+                cache = caches[self.alias]
+                index = cache.get(self._key(version))
+                if index is None:
+                    index = PrefixIndex(self.build())
+                    cache.set(self._key(version), index, timeout=self.timeout)
+                self._index, self._index_version = index, version
+            self._checked_at = time.monotonic()
+            return self._index
+
+    def invalidate(self):
+        """Make every worker rebuild or reload the index on its next lookup."""
+        self.version.bump()
+        self._checked_at = 0.0
+
+    def clear(self):
+        with self._lock:
+            self._index = None
+            self._index_version = None
+            self._checked_at = 0.0
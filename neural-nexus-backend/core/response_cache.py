@@ -0,0 +1,237 @@
+# core/response_cache.py
+
+"""Signal-invalidated response cache for read-only viewsets.
+
+:class:`ResponseCacheMixin` stores the data of successful ``list`` and
+``retrieve`` responses in Django's cache. Keys combine the viewset, host,
+path, the sorted query parameters and the current version of every model in
+the viewset's ``cache_models``. Saving, deleting or changing a many-to-many
+relation of one of those models bumps its version through the signal
+handlers connected by :func:`track_model`, so every cached response that
+depends on it misses on the next request.
+
+Versions and entries live in the ``ALIAS`` cache, which must be shared by
+all workers for a bump to reach them; production uses the Redis cache
+configured from ``REDIS_URL`` in ``core/settings_prod.py``, so a hit costs
+two cache round trips (all versions in one ``get_many``, then the entry) and
+no database query. With a per-process ``LocMemCache`` (the development
+default) only the worker that saved sees the bump, and the others serve
+their entries for at most ``TIMEOUT`` seconds.
+
+Writes made with ``QuerySet.update()`` (buffered view counters, analytics
+sums) send no signals and show up once cached entries expire after
+``TIMEOUT`` seconds.
+
+The ``ETag`` and ``Last-Modified`` headers set by
+:class:`core.conditional.ConditionalGetMixin` are cached with the data, so a
+hit can still be answered with ``304 Not Modified``.
+
+Hits and misses are counted per viewset in process memory and added to
+shared counters in the cache at most every ``STATS_FLUSH_INTERVAL`` seconds
+(and at exit), so requests do not write to the cache; ``manage.py
+response_cache_stats`` reports the shared counters, which lag busy workers
+by up to that interval. Responses carry ``X-Cache: HIT`` or
+``X-Cache: MISS``.
+
+Options come from the ``RESPONSE_CACHE`` setting (``ENABLED``, ``ALIAS``,
+``TIMEOUT``, ``STATS_FLUSH_INTERVAL``).
+
+Typical usage example:
+    class CategoryViewSet(ResponseCacheMixin, viewsets.ReadOnlyModelViewSet):
+        cache_models = [Category]
+"""
+
+import atexit
+import hashlib
+import threading
+import time
+from collections import Counter
+
+from django.conf import settings
+from django.core.cache import caches
+from django.db.models.signals import m2m_changed, post_delete, post_save
+from rest_framework.response import Response
+
+from .cache import CacheVersion
+
+DEFAULTS = {
+    'ENABLED': True,
+    'ALIAS': 'default',
+    'TIMEOUT': 300,
+    'STATS_FLUSH_INTERVAL': 30,
+}
+
+_tracked_models = set()
+cached_viewsets = {}
+CACHED_HEADERS = ('ETag', 'Last-Modified')
+
+
+def get_option(name):
+    return {**DEFAULTS, **getattr(settings, 'RESPONSE_CACHE', {})}[name]
+
+
+def get_cache():
+    return caches[get_option('ALIAS')]
+
+
+def model_version(model):
+    return CacheVersion(f'model.{model._meta.label_lower}', alias=get_option('ALIAS'))
+
+
+def _bump_sender(sender, raw=False, **kwargs):
+    if not raw:
+        model_version(sender).bump()
+
+
+def _bump_m2m(sender, instance, action, model, **kwargs):
+    if action in ('post_add', 'post_remove', 'post_clear'):
+        for changed in (type(instance), model):
+            if changed in _tracked_models:
+                model_version(changed).bump()
+
+
+def track_model(model):
+    """Bump ``model``'s version whenever its rows or relations change."""
+    if model in _tracked_models:
+        return
+    _tracked_models.add(model)
+    uid = f'response_cache:{model._meta.label_lower}'
+    post_save.connect(_bump_sender, sender=model, weak=False, dispatch_uid=uid)
+    post_delete.connect(_bump_sender, sender=model, weak=False, dispatch_uid=uid)
+    for field in model._meta.many_to_many:
+        m2m_changed.connect(
+            _bump_m2m,
+            sender=field.remote_field.through,
+            weak=False,
+            dispatch_uid=f'{uid}:{field.name}',
+        )
+
+
+class ResponseCacheStats:
+    """Hit and miss counters for one cached viewset, shared through the cache.
+
+    :meth:`record` only touches process memory; the counts of every viewset
+    are added to the cache by :meth:`flush`.
+    """
+
+    _pending = Counter()
+    _lock = threading.Lock()
+    _last_flush = time.monotonic()
+
+    def __init__(self, name):
+        self.name = name
+
+    @staticmethod
+    def _key_for(name, outcome):
+        return f'response_cache:stats:{name}:{outcome}'
+
+    def _key(self, outcome):
+        return self._key_for(self.name, outcome)
+
+    def record(self, outcome):
+        cls = type(self)
+        with cls._lock:
+            cls._pending[self.name, outcome] += 1
+            due = time.monotonic() - cls._last_flush >= get_option('STATS_FLUSH_INTERVAL')
+        if due:
+            cls.flush()
+
+    @classmethod
+    def flush(cls):
+        """Add this process's counts to the shared counters."""
+        with cls._lock:
+            pending, cls._pending = cls._pending, Counter()
+            cls._last_flush = time.monotonic()
+        cache = get_cache()
+        for (name, outcome), count in pending.items():
+            key = cls._key_for(name, outcome)
+            if not cache.add(key, count, timeout=None):
+                try:
+                    cache.incr(key, count)
+                except ValueError:
+                    cache.add(key, count, timeout=None)
+
+    def read(self):
+        type(self).flush()
+        values = get_cache().get_many([self._key('hit'), self._key('miss')])
+        hits = values.get(self._key('hit'), 0)
+        misses = values.get(self._key('miss'), 0)
+        total = hits + misses
+        return {'hits': hits, 'misses': misses, 'hit_rate': hits / total if total else 0.0}
+
+    def reset(self):
+        cls = type(self)
+        with cls._lock:
+            for outcome in ('hit', 'miss'):
+                cls._pending.pop((self.name, outcome), None)
+        get_cache().delete_many([self._key('hit'), self._key('miss')])
+
+
+atexit.register(ResponseCacheStats.flush)
+
+
+class ResponseCacheMixin:
+    """Viewset mixin serving ``list`` and ``retrieve`` from the response cache.
+
+    Viewsets that override ``list`` or ``retrieve`` should build their
+    response inside :meth:`cached_response` themselves.
+
+    Attributes:
+        cache_models (list): Models whose changes invalidate cached responses
+    """
+
+    cache_models = ()
+
+    def __init_subclass__(cls, **kwargs):
+        super().__init_subclass__(**kwargs)
+        for model in cls.cache_models:
+            track_model(model)
+        if cls.cache_models:
+            cached_viewsets[cls.cache_name()] = cls
+
+    @classmethod
+    def cache_name(cls):
+        return f'{cls.__module__}.{cls.__name__}'
+
+    @classmethod
+    def cache_stats(cls):
+        return ResponseCacheStats(cls.cache_name())
+
+    def list(self, request, *args, **kwargs):
+        build = super().list
+        return self.cached_response(request, lambda: build(request, *args, **kwargs))
+
+    def retrieve(self, request, *args, **kwargs):
+        build = super().retrieve
+        return self.cached_response(request, lambda: build(request, *args, **kwargs))
+
+    def response_cache_key(self, request):
+        versions = CacheVersion.get_many([model_version(model) for model in self.cache_models])
+        params = request.query_params
+        query = sorted((key, value) for key in params for value in params.getlist(key))
+        raw = repr((request.get_host(), request.path, query, versions))
+        return f'response_cache:{self.cache_name()}:{hashlib.sha256(raw.encode()).hexdigest()}'
+
+    def cached_response(self, request, build):
+        """Return the cached response for ``request`` or ``build()`` and store it."""
+        if not get_option('ENABLED') or request.method not in ('GET', 'HEAD'):
+            return build()
+
+        cache = get_cache()
+        key = self.response_cache_key(request)
+        stats = self.cache_stats()
+        entry = cache.get(key)
+        if entry is not None:
+            stats.record('hit')
+            data, headers = entry
+            response = Response(data, headers=headers)
+            response['X-Cache'] = 'HIT'
+            return response
+
+        stats.record('miss')
+        response = build()
+        if response.status_code == 200:
+            headers = {name: response[name] for name in CACHED_HEADERS if response.has_header(name)}
+            cache.set(key, (response.data, headers), get_option('TIMEOUT'))
+        response['X-Cache'] = 'MISS'
+        return response
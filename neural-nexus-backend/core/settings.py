@@ -136,8 +136,8 @@ CORS_ALLOWED_ORIGINS = [
 CORS_ALLOW_CREDENTIALS = True
 CORS_ALLOW_ALL_ORIGINS = True  # Keep this false for security
 CORS_ALLOW_METHODS = ["GET", "POST", "OPTIONS"]
-CORS_ALLOW_HEADERS = ["Content-Type"]
-CORS_EXPOSE_HEADERS = ["content-type", "content-length"]
+CORS_ALLOW_HEADERS = ["Content-Type", "X-Visitor-Id"]  # X-Visitor-Id: A/B test visitor
+CORS_EXPOSE_HEADERS = ["content-type", "content-length", "x-visitor-id"]
 CORS_PREFLIGHT_MAX_AGE = 86400  # 24 hours
 CORS_ALLOW_CREDENTIALS = True
 
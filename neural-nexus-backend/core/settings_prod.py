@@ -16,6 +16,33 @@ import dj_database_url
 
 DATABASES = {"default": dj_database_url.config(default=os.getenv("DATABASE_URL"), conn_max_age=600)}
 
+# Cache Configuration
+# Version stamps, cached responses and counters must be seen by every gunicorn
+# worker and are read on every request, so production shares one Redis
+# instance (Railway's Redis plugin sets REDIS_URL). Without it the database
+# cache table keeps workers consistent, at the price of a query per read.
+if os.getenv("REDIS_URL"):
+    CACHES = {
+        "default": {
+            "BACKEND": "django.core.cache.backends.redis.RedisCache",
+            "LOCATION": os.getenv("REDIS_URL"),
+        }
+    }
+else:
+    CACHES = {
+        "default": {
+            "BACKEND": "django.core.cache.backends.db.DatabaseCache",
+            "LOCATION": "django_cache",
+        }
+    }
+
+# Sitemaps
+# Generated sitemaps and feeds are cached on disk. Set SITEMAP_CACHE_DIR to a
+# mounted volume to keep them across deploys; they are regenerated on demand.
+SITEMAPS = {
+    "CACHE_DIR": os.getenv("SITEMAP_CACHE_DIR", os.path.join(BASE_DIR, "cache", "sitemaps")),
+}
+
 # Static Files
 STATIC_URL = "/static/"
 STATIC_ROOT = os.path.join(BASE_DIR, "staticfiles")
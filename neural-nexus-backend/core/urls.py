@@ -13,6 +13,7 @@ URLs structure:
     /api/schema/ - OpenAPI schema
     /api/docs/ - Swagger UI documentation
     /api/redoc/ - ReDoc documentation interface
+    /sitemap.xml, /feeds/ - Sitemaps and RSS/Atom feeds of published content
 
 Note:
     All API endpoints are prefixed with '/api/' for clear separation from admin routes
@@ -95,6 +96,7 @@ urlpatterns = [
     path("api/schema/", SpectacularAPIView.as_view(), name="schema"),
     path("api/docs/", SpectacularSwaggerView.as_view(url_name="schema"), name="swagger-ui"),
     path("api/redoc/", SpectacularRedocView.as_view(url_name="schema"), name="redoc"),
+    path("", include("content.sitemap_urls")),
     path("health", health_check, name="health_check_no_slash"),
     path("health/", health_check, name="health_check"),
 ]
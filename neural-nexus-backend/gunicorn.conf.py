@@ -16,3 +16,13 @@ def post_fork(server, worker):
     import django
 
     django.setup()
+
+
+def worker_exit(server, worker):
+    """Flush buffered view counters, tracking events and A/B visits before a worker shuts down."""
+    from content.counters import counter_buffer
+    from content.ingest import tracking_buffer, variant_visit_buffer
+
+    counter_buffer.flush()
+    tracking_buffer.flush()
+    variant_visit_buffer.flush()
@@ -9,7 +9,8 @@ from .models import (
     LeadScore,
     NewsletterSubscription,  # Add this import
     Identity, IdentityEmail,
-    IdentityDevice
+    IdentityDevice,
+    EmailOutbox
 )
 
 
@@ -258,3 +259,12 @@ class IdentityDeviceAdmin(admin.ModelAdmin):
     def get_queryset(self, request):
         """Optimize admin queries"""
         return super().get_queryset(request).select_related('identity')
+
+
+@admin.register(EmailOutbox)
+class EmailOutboxAdmin(admin.ModelAdmin):
+    list_display = ('subject', 'status', 'attempts', 'next_attempt_at', 'created_at', 'sent_at')
+    list_filter = ('status', ('created_at', DateRangeFilter))
+    search_fields = ('subject', 'last_error')
+    ordering = ('-created_at',)
+    readonly_fields = ('created_at', 'sent_at', 'attempts', 'last_error')
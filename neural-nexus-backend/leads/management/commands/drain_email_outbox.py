@@ -0,0 +1,46 @@
+# neural-nexus-backend/leads/management/commands/drain_email_outbox.py
+
+import time
+
+from django.core.management.base import BaseCommand
+from leads.services.email_outbox import EmailOutboxService
+
+
+class Command(BaseCommand):
+    help = 'Send queued notification emails from the email outbox'
+
+    def add_arguments(self, parser):
+        parser.add_argument(
+            '--batch-size',
+            type=int,
+            help='Rows sent per connection (defaults to EMAIL_OUTBOX["BATCH_SIZE"])',
+        )
+        parser.add_argument(
+            '--loop',
+            action='store_true',
+            help='Keep draining until interrupted instead of exiting when the outbox is empty',
+        )
+        parser.add_argument(
+            '--interval',
+            type=float,
+            default=5.0,
+            help='Seconds to wait between polls of an empty outbox with --loop',
+        )
+
+    def handle(self, *args, **options):
+        totals = {'sent': 0, 'retried': 0, 'failed': 0}
+        try:
+            while True:
+                stats = EmailOutboxService.drain(options['batch_size'])
+                for key, value in stats.items():
+                    totals[key] += value
+                if not any(stats.values()):
+                    if not options['loop']:
+                        break
+                    time.sleep(options['interval'])
+        except KeyboardInterrupt:
+            pass
+
+        self.stdout.write(
+            f'Sent: {totals["sent"]}, retried later: {totals["retried"]}, failed: {totals["failed"]}'
+        )
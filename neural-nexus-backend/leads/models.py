@@ -495,3 +495,40 @@ class IdentityDevice(models.Model):
         """Update the last_seen_at timestamp"""
         self.last_seen_at = timezone.now()
         self.save(update_fields=['last_seen_at'])
+
+
+class EmailOutbox(models.Model):
+    """
+    Outgoing email written in the same transaction as the change it reports.
+    Rows are delivered by ``manage.py drain_email_outbox``; see
+    leads.services.email_outbox.
+    """
+    STATUS_CHOICES = [
+        ('PENDING', 'Pending'),
+        ('SENT', 'Sent'),
+        ('FAILED', 'Failed'),
+    ]
+
+    subject = models.CharField(max_length=255)
+    body = models.TextField()
+    from_email = models.CharField(max_length=255)
+    recipients = models.JSONField(default=list, help_text="List of recipient addresses")
+    status = models.CharField(max_length=10, choices=STATUS_CHOICES, default='PENDING')
+    attempts = models.PositiveIntegerField(default=0)
+    next_attempt_at = models.DateTimeField(
+        default=timezone.now,
+        help_text="Earliest time the next delivery attempt may start"
+    )
+    last_error = models.TextField(blank=True)
+    created_at = models.DateTimeField(auto_now_add=True)
+    sent_at = models.DateTimeField(null=True, blank=True)
+
+    class Meta:
+        ordering = ['created_at']
+        indexes = [
+            models.Index(fields=['status', 'next_attempt_at']),
+        ]
+        verbose_name_plural = 'Email outbox'
+
+    def __str__(self):
+        return f"{self.subject} ({self.status})"
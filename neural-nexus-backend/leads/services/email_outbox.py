@@ -0,0 +1,150 @@
+# neural-nexus-backend/leads/services/email_outbox.py
+
+"""
+Transactional outbox for notification email.
+
+Views call EmailOutboxService.enqueue inside their transaction, so an email is
+queued exactly when the change it reports commits and no request waits on
+SMTP. ``manage.py drain_email_outbox`` delivers due rows in batches over one
+connection to the configured email backend. Failed rows are retried with
+exponential backoff until MAX_ATTEMPTS, then marked FAILED.
+
+In production ``drain_email_outbox --loop`` runs as its own Railway service
+configured by ``railway.worker.toml`` (``worker`` in the procfile). Without
+it, queued email is never sent.
+
+Options come from the EMAIL_OUTBOX setting (BATCH_SIZE, MAX_ATTEMPTS,
+BACKOFF, MAX_BACKOFF, LEASE).
+"""
+
+import logging
+from datetime import timedelta
+from typing import Dict, List, Optional
+
+from django.conf import settings
+from django.core.mail import EmailMessage, get_connection
+from django.db import transaction
+from django.db.models import F
+from django.utils import timezone
+
+from ..models import EmailOutbox
+
+logger = logging.getLogger(__name__)
+
+DEFAULTS = {
+    'BATCH_SIZE': 50,
+    'MAX_ATTEMPTS': 5,
+    'BACKOFF': 60,
+    'MAX_BACKOFF': 60 * 60,
+    # Seconds a claimed row stays invisible to other drainers.
+    'LEASE': 5 * 60,
+}
+
+
+def get_option(name):
+    return {**DEFAULTS, **getattr(settings, 'EMAIL_OUTBOX', {})}[name]
+
+
+class EmailOutboxService:
+    @staticmethod
+    def enqueue(
+        subject: str,
+        body: str,
+        recipients: List[str],
+        from_email: Optional[str] = None
+    ) -> EmailOutbox:
+        """
+        Queue an email. Call inside the transaction whose changes it reports.
+        """
+        return EmailOutbox.objects.create(
+            subject=subject,
+            body=body,
+            from_email=from_email or settings.DEFAULT_FROM_EMAIL,
+            recipients=list(recipients),
+        )
+
+    @staticmethod
+    def backoff(attempts: int) -> timedelta:
+        """Delay before retrying a row that has failed ``attempts`` times."""
+        seconds = get_option('BACKOFF') * 2 ** (attempts - 1)
+        return timedelta(seconds=min(seconds, get_option('MAX_BACKOFF')))
+
+    @staticmethod
+    def claim(batch_size: int) -> List[EmailOutbox]:
+        """
+        Lease up to ``batch_size`` due rows and count the attempt.
+        Concurrent drainers skip rows locked or leased by each other.
+        """
+        now = timezone.now()
+        with transaction.atomic():
+            rows = list(
+                EmailOutbox.objects.select_for_update(skip_locked=True)
+                .filter(status='PENDING', next_attempt_at__lte=now)
+                .order_by('next_attempt_at', 'pk')[:batch_size]
+            )
+            EmailOutbox.objects.filter(pk__in=[row.pk for row in rows]).update(
+                attempts=F('attempts') + 1,
+                next_attempt_at=now + timedelta(seconds=get_option('LEASE')),
+            )
+        for row in rows:
+            row.attempts += 1
+        return rows
+
+    @staticmethod
+    def drain(batch_size: Optional[int] = None) -> Dict[str, int]:
+        """
+        Send one batch of due rows over a single backend connection.
+        Returns counts of sent, retried and failed rows.
+        """
+        rows = EmailOutboxService.claim(batch_size or get_option('BATCH_SIZE'))
+        stats = {'sent': 0, 'retried': 0, 'failed': 0}
+        if not rows:
+            return stats
+
+        sent, errors = [], {}
+        connection = get_connection()
+        try:
+            connection.open()
+        except Exception as e:
+            logger.error(f"Failed to connect to the email backend: {str(e)}")
+            errors = {row.pk: str(e) for row in rows}
+        else:
+            try:
+                for row in rows:
+                    message = EmailMessage(
+                        subject=row.subject,
+                        body=row.body,
+                        from_email=row.from_email,
+                        to=row.recipients,
+                        connection=connection,
+                    )
+                    # One message per call so a rejected message is retried
+                    # alone; the connection stays open across the batch.
+                    try:
+                        connection.send_messages([message])
+                    except Exception as e:
+                        errors[row.pk] = str(e)
+                    else:
+                        sent.append(row.pk)
+            finally:
+                connection.close()
+
+        now = timezone.now()
+        EmailOutbox.objects.filter(pk__in=sent).update(status='SENT', sent_at=now, last_error='')
+        stats['sent'] = len(sent)
+        for row in rows:
+            if row.pk not in errors:
+                continue
+            logger.warning(f"Email outbox row {row.pk} failed attempt {row.attempts}: {errors[row.pk]}")
+            if row.attempts >= get_option('MAX_ATTEMPTS'):
+                EmailOutbox.objects.filter(pk=row.pk).update(
+                    status='FAILED', last_error=errors[row.pk]
+                )
+                stats['failed'] += 1
+            else:
+                EmailOutbox.objects.filter(pk=row.pk).update(
+                    next_attempt_at=now + EmailOutboxService.backoff(row.attempts),
+                    last_error=errors[row.pk],
+                )
+                stats['retried'] += 1
+        return stats
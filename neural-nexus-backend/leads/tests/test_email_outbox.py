@@ -0,0 +1,155 @@
+import smtplib
+from datetime import timedelta
+from io import StringIO
+
+import pytest
+from django.core import mail
+from django.core.mail.backends.locmem import EmailBackend
+from django.core.management import call_command
+from django.utils import timezone
+from rest_framework.test import APIClient
+
+from leads.models import Contact, EmailOutbox
+from leads.services.email_outbox import EmailOutboxService
+
+EMAIL_OUTBOX = {'BACKOFF': 60, 'MAX_BACKOFF': 600, 'MAX_ATTEMPTS': 3}
+
+
+class RejectingBackend(EmailBackend):
+    """locmem backend refusing messages to rejected@example.com."""
+
+    opened = 0
+
+    def open(self):
+        RejectingBackend.opened += 1
+        return super().open()
+
+    def send_messages(self, messages):
+        for message in messages:
+            if 'rejected@example.com' in message.to:
+                raise smtplib.SMTPRecipientsRefused({'rejected@example.com': (550, b'No')})
+        return super().send_messages(messages)
+
+
+class UnreachableBackend(EmailBackend):
+    def open(self):
+        raise ConnectionRefusedError('SMTP server unreachable')
+
+
+@pytest.fixture(autouse=True)
+def outbox_settings(settings):
+    settings.EMAIL_OUTBOX = EMAIL_OUTBOX
+    settings.EMAIL_BACKEND = 'django.core.mail.backends.locmem.EmailBackend'
+    RejectingBackend.opened = 0
+
+
+def make_due(*rows):
+    EmailOutbox.objects.filter(pk__in=[row.pk for row in rows]).update(
+        next_attempt_at=timezone.now() - timedelta(seconds=1)
+    )
+
+
+@pytest.mark.django_db
+class TestContactFormOutbox:
+    def test_contact_form_queues_email_without_sending(self):
+        response = APIClient().post('/api/leads/contact-form/', {
+            'firstName': 'Ada',
+            'lastName': 'Lovelace',
+            'email': 'Ada@Example.com',
+            'company': 'Engines',
+            'message': 'Tell me more',
+        }, format='json')
+
+        assert response.status_code == 201
+        assert mail.outbox == []
+        row = EmailOutbox.objects.get()
+        assert row.status == 'PENDING'
+        assert row.recipients == ['whitney.walters@gmail.com']
+        assert 'Ada Lovelace' in row.subject
+        assert 'Tell me more' in row.body
+
+    def test_outbox_row_rolls_back_with_the_transaction(self, monkeypatch):
+        def fail(*args, **kwargs):
+            raise RuntimeError('interaction failed')
+        monkeypatch.setattr('leads.views.Interaction.objects.create', fail)
+
+        response = APIClient().post('/api/leads/contact-form/', {
+            'firstName': 'Ada', 'lastName': 'Lovelace', 'email': 'ada@example.com',
+        }, format='json')
+
+        assert response.status_code == 400
+        assert not Contact.objects.exists()
+        assert not EmailOutbox.objects.exists()
+
+
+@pytest.mark.django_db
+class TestDrain:
+    def test_batch_sent_over_one_connection(self, settings):
+        settings.EMAIL_BACKEND = 'leads.tests.test_email_outbox.RejectingBackend'
+        rows = [
+            EmailOutboxService.enqueue(f'Subject {i}', 'Body', [f'user{i}@example.com'])
+            for i in range(3)
+        ]
+
+        stats = EmailOutboxService.drain()
+
+        assert stats == {'sent': 3, 'retried': 0, 'failed': 0}
+        assert RejectingBackend.opened == 1
+        assert [message.subject for message in mail.outbox] == [row.subject for row in rows]
+        assert set(EmailOutbox.objects.values_list('status', flat=True)) == {'SENT'}
+        assert EmailOutboxService.drain() == {'sent': 0, 'retried': 0, 'failed': 0}
+
+    def test_rejected_message_retried_with_backoff_then_failed(self, settings):
+        settings.EMAIL_BACKEND = 'leads.tests.test_email_outbox.RejectingBackend'
+        good = EmailOutboxService.enqueue('Good', 'Body', ['ok@example.com'])
+        bad = EmailOutboxService.enqueue('Bad', 'Body', ['rejected@example.com'])
+
+        before = timezone.now()
+        assert EmailOutboxService.drain() == {'sent': 1, 'retried': 1, 'failed': 0}
+        good.refresh_from_db()
+        bad.refresh_from_db()
+        assert good.status == 'SENT'
+        assert bad.status == 'PENDING'
+        assert bad.attempts == 1
+        assert 'rejected@example.com' in bad.last_error
+        assert bad.next_attempt_at >= before + timedelta(seconds=60)
+
+        # Not due yet.
+        assert EmailOutboxService.drain() == {'sent': 0, 'retried': 0, 'failed': 0}
+
+        make_due(bad)
+        EmailOutboxService.drain()
+        bad.refresh_from_db()
+        assert bad.next_attempt_at >= timezone.now() + timedelta(seconds=110)
+
+        make_due(bad)
+        assert EmailOutboxService.drain() == {'sent': 0, 'retried': 0, 'failed': 1}
+        bad.refresh_from_db()
+        assert bad.status == 'FAILED'
+        assert bad.attempts == 3
+        assert [message.subject for message in mail.outbox] == ['Good']
+
+    def test_unreachable_server_retries_whole_batch(self, settings):
+        settings.EMAIL_BACKEND = 'leads.tests.test_email_outbox.UnreachableBackend'
+        EmailOutboxService.enqueue('One', 'Body', ['a@example.com'])
+        EmailOutboxService.enqueue('Two', 'Body', ['b@example.com'])
+
+        assert EmailOutboxService.drain() == {'sent': 0, 'retried': 2, 'failed': 0}
+        assert set(EmailOutbox.objects.values_list('last_error', flat=True)) == {
+            'SMTP server unreachable'
+        }
+
+    def test_backoff_is_capped(self):
+        assert EmailOutboxService.backoff(1) == timedelta(seconds=60)
+        assert EmailOutboxService.backoff(3) == timedelta(seconds=240)
+        assert EmailOutboxService.backoff(10) == timedelta(seconds=600)
+
+    def test_command_drains_every_batch(self):
+        for i in range(5):
+            EmailOutboxService.enqueue(f'Subject {i}', 'Body', ['user@example.com'])
+        out = StringIO()
+
+        call_command('drain_email_outbox', '--batch-size', '2', stdout=out)
+
+        assert len(mail.outbox) == 5
+        assert 'Sent: 5, retried later: 0, failed: 0' in out.getvalue()
@@ -7,13 +7,13 @@ from rest_framework.response import Response
 from django.shortcuts import get_object_or_404
 from django.http import HttpResponse
 from django.db import transaction
-from django.core.mail import send_mail
 from .models import Contact, ROICalculation, Interaction, NewsletterSubscription
 from .calculator import ROICalculator
 from .serializers import ROICalculatorInputSerializer, ROICalculationSerializer, NewsletterSubscriptionSerializer
 from .exports import ROIReportGenerator
 from .services.contact_management import ContactManagementService
 from .services.device_tracking import DeviceTrackingService
+from .services.email_outbox import EmailOutboxService
 import logging
 
 logger = logging.getLogger(__name__)
@@ -58,27 +58,24 @@ class ContactFormView(APIView):
                     description=request.data.get('message', '')
                 )
 
-                # Send email notification
-                try:
-                    send_mail(
-                        subject=f'New Contact Form Submission: {contact.first_name} {contact.last_name}',
-                        message=f"""
-                        New contact form submission received:
-
-                        Name: {contact.first_name} {contact.last_name}
-                        Email: {contact.email}
-                        Company: {contact.company}
-                        Phone: {contact.phone}
-
-                        Message:
-                        {request.data.get('message', '')}
-                        """,
-                        from_email='noreply@neuralnexus.ai',
-                        recipient_list=['whitney.walters@gmail.com'],
-                        fail_silently=True,
-                    )
-                except Exception as e:
-                    logger.error(f"Failed to send email notification: {str(e)}")
+                # Queue the email notification; it is sent by drain_email_outbox
+                # once this transaction commits, so SMTP never blocks the request.
+                EmailOutboxService.enqueue(
+                    subject=f'New Contact Form Submission: {contact.first_name} {contact.last_name}',
+                    body=f"""
+                    New contact form submission received:
+
+                    Name: {contact.first_name} {contact.last_name}
+                    Email: {contact.email}
+                    Company: {contact.company}
+                    Phone: {contact.phone}
+
+                    Message:
+                    {request.data.get('message', '')}
+                    """,
+                    from_email='noreply@neuralnexus.ai',
+                    recipients=['whitney.walters@gmail.com'],
+                )
 
                 return Response({
                     'status': 'success',
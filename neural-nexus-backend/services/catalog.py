@@ -0,0 +1,377 @@
+# services/catalog.py
+
+"""Versioned, in-process snapshot of the service catalog.
+
+The catalog is small and changes rarely, but serializing it nests features
+and deliverables in services and services in categories. :func:`build_catalog`
+reads everything with three queries: categories, services, and features and
+deliverables together in one ``UNION ALL``. It then serializes every service
+and category once with the API serializers.
+
+Each worker keeps the built :class:`Catalog` in :data:`catalog_cache` and
+reuses it until :data:`catalog_version` moves (bumped by the signal handlers
+in :mod:`services.signals` after a catalog write commits) or ``TTL`` seconds
+pass. Services endpoints filter, search, sort and paginate the snapshot in
+memory instead of querying the database, and :meth:`Catalog.facets` counts
+the pricing page's filter values from it. Similar services are ranked once
+per build.
+
+Options come from the ``SERVICE_CATALOG`` setting (``TTL``,
+``PRICE_BUCKETS``, ``FACET_CACHE_SIZE``, ``SIMILAR_COUNT``,
+``SIMILAR_MIN_SCORE``, ``SIMILARITY_WEIGHTS``).
+"""
+
+import hashlib
+import re
+import threading
+import time
+from bisect import bisect_right
+from collections import Counter
+from decimal import Decimal, InvalidOperation
+
+from django.conf import settings
+from django.db.models import CharField, F, Value
+from django.utils.http import quote_etag
+from rest_framework.exceptions import ValidationError
+
+from core.cache import CacheVersion
+
+from .models import Service, ServiceCategory, ServiceDeliverable, ServiceFeature
+from .serializers import ServiceCategorySerializer, ServiceSerializer
+from .similarity import nearest_services
+
+DEFAULTS = {
+    'TTL': 300,
+    'PRICE_BUCKETS': (1000, 5000, 10000, 25000),
+    'FACET_CACHE_SIZE': 256,
+    'SIMILAR_COUNT': 3,
+    'SIMILAR_MIN_SCORE': 0.2,
+    'SIMILARITY_WEIGHTS': {'category': 0.35, 'price': 0.3, 'tier': 0.15, 'features': 0.2},
+}
+FACETS = ('category', 'package_type', 'price')
+FILTER_PARAMS = (
+    'category', 'package_type', 'package_type__in', 'base_price__gte', 'base_price__lte',
+    'is_active', 'search',
+)
+# Model fields first, then annotations, so both halves of the UNION line up.
+ITEM_FIELDS = (
+    'id', 'service_id', 'name', 'description', 'order', 'kind', 'highlighted', 'timeline_text',
+)
+SEARCH_SPLIT_RE = re.compile(r'[\s,]+')
+TRUE_VALUES = {'true', 'True', '1'}
+FALSE_VALUES = {'false', 'False', '0'}
+
+catalog_version = CacheVersion('services.catalog')
+
+
+def get_option(name):
+    return {**DEFAULTS, **getattr(settings, 'SERVICE_CATALOG', {})}[name]
+
+
+class Catalog:
+    """Serialized categories and services with lookup indexes.
+
+    Attributes:
+        version: :data:`catalog_version` the catalog was built against
+        categories (list): ``ServiceCategorySerializer`` data, by name
+        services (list): ``ServiceSerializer`` data for every service, in
+            the model's default ordering
+        prices (dict): ``base_price`` of every service as a ``Decimal``, by id
+        similar (dict): Nearest active services of every active service, by
+            id; see :mod:`services.similarity`
+    """
+
+    def __init__(self, version, categories, services, created_at):
+        self.version = version
+        self.categories = categories
+        self.services = services
+        self.active_services = [service for service in services if service['is_active']]
+        self.created_at = created_at
+        self.prices = {service['id']: Decimal(service['base_price']) for service in services}
+        self.services_by_slug = {service['slug']: service for service in self.active_services}
+        self.categories_by_slug = {category['slug']: category for category in categories}
+        self.categories_by_id = {category['id']: category for category in categories}
+        self.similar = nearest_services(
+            self.active_services,
+            self.prices,
+            count=get_option('SIMILAR_COUNT'),
+            weights=get_option('SIMILARITY_WEIGHTS'),
+            min_score=get_option('SIMILAR_MIN_SCORE'),
+        )
+        self._facets = {}
+
+    def etag(self, *parts):
+        raw = repr((self.version, parts))
+        return 'W/' + quote_etag(hashlib.sha256(raw.encode()).hexdigest()[:32])
+
+    def category_services(self, category_id):
+        return [s for s in self.active_services if s['category'] == category_id]
+
+    def get_filters(self, params):
+        """Translate the services list's filter and search parameters.
+
+        Mirrors the viewset's ``filterset_fields`` and ``search_fields``.
+
+        Returns:
+            dict: ``{group: predicate}``, where ``group`` is a facet name
+            (``category``, ``package_type``, ``price``) or ``is_active`` or
+            ``search``, and ``predicate`` takes a serialized service.
+
+        Raises:
+            ValidationError: A filter value is invalid.
+        """
+        filters = {}
+        errors = {}
+
+        if params.get('category'):
+            try:
+                category_id = int(params['category'])
+            except ValueError:
+                category_id = None
+            if category_id not in self.categories_by_id:
+                errors['category'] = [
+                    'Select a valid choice. That choice is not one of the available choices.'
+                ]
+            else:
+                filters['category'] = lambda s: s['category'] == category_id
+
+        package_types = {value for value, _ in Service.PACKAGE_TYPES}
+        requested_types = set(package_types)
+        for name, values in (
+            ('package_type', [params.get('package_type')]),
+            ('package_type__in', (params.get('package_type__in') or '').split(',')),
+        ):
+            if not params.get(name):
+                continue
+            if not set(values) <= package_types:
+                errors[name] = ['Select a valid choice.']
+            requested_types &= set(values)
+        if requested_types != package_types:
+            filters['package_type'] = lambda s: s['package_type'] in requested_types
+
+        bounds = {}
+        for name in ('base_price__gte', 'base_price__lte'):
+            if not params.get(name):
+                continue
+            try:
+                bounds[name] = Decimal(params[name])
+            except InvalidOperation:
+                errors[name] = ['Enter a number.']
+        if bounds:
+            low, high = bounds.get('base_price__gte'), bounds.get('base_price__lte')
+            filters['price'] = lambda s: (
+                (low is None or self.prices[s['id']] >= low)
+                and (high is None or self.prices[s['id']] <= high)
+            )
+
+        if params.get('is_active') in FALSE_VALUES:
+            filters['is_active'] = lambda s: False
+        elif params.get('is_active') and params['is_active'] not in TRUE_VALUES:
+            errors['is_active'] = ['Enter a valid boolean.']
+
+        if errors:
+            raise ValidationError(errors)
+
+        terms = _search_terms(params)
+        if terms:
+            filters['search'] = lambda s: all(term in _search_text(s) for term in terms)
+        return filters
+
+    def filter_services(self, params, ordering_fields, default_ordering):
+        """Apply the services list's filter, search and ordering parameters.
+
+        Invalid filter values raise ``ValidationError``.
+        """
+        filters = self.get_filters(params).values()
+        services = [s for s in self.active_services if all(keep(s) for keep in filters)]
+        return self.order(services, params.get('ordering'), ordering_fields, default_ordering)
+
+    def facets(self, params):
+        """Count active services per category, package type and price bucket.
+
+        Each facet's counts apply every filter in ``params`` except that
+        facet's own, so a client can show how many services selecting
+        another value would give. Everything is counted in one pass over
+        the snapshot, and results are kept per filter signature for the
+        life of the catalog.
+
+        Returns:
+            dict: ``total`` matching services, and ``category``,
+            ``package_type`` and ``price`` lists of values with ``count``
+        """
+        signature = tuple((name, params.get(name) or '') for name in FILTER_PARAMS)
+        facets = self._facets.get(signature)
+        if facets is None:
+            if len(self._facets) >= get_option('FACET_CACHE_SIZE'):
+                self._facets.clear()
+            facets = self._facets[signature] = self._count_facets(self.get_filters(params))
+        return facets
+
+    def _count_facets(self, filters):
+        bounds = sorted(Decimal(bound) for bound in get_option('PRICE_BUCKETS'))
+        total = 0
+        counts = {name: Counter() for name in FACETS}
+        for service in self.active_services:
+            failed = [name for name, keep in filters.items() if not keep(service)]
+            if len(failed) > 1:
+                continue
+            total += not failed
+            values = {
+                'category': service['category'],
+                'package_type': service['package_type'],
+                'price': bisect_right(bounds, self.prices[service['id']]),
+            }
+            for name in FACETS:
+                if not failed or failed == [name]:
+                    counts[name][values[name]] += 1
+
+        edges = [None, *bounds, None]
+        return {
+            'total': total,
+            'category': [
+                {
+                    'id': category['id'],
+                    'name': category['name'],
+                    'slug': category['slug'],
+                    'count': counts['category'][category['id']],
+                }
+                for category in self.categories
+            ],
+            'package_type': [
+                {'value': value, 'label': label, 'count': counts['package_type'][value]}
+                for value, label in Service.PACKAGE_TYPES
+            ],
+            # Buckets include ``min`` and exclude ``max``.
+            'price': [
+                {'min': edges[i], 'max': edges[i + 1], 'count': counts['price'][i]}
+                for i in range(len(bounds) + 1)
+            ],
+        }
+
+    def filter_categories(self, params, ordering_fields, default_ordering):
+        """Apply the category list's search and ordering parameters."""
+        categories = self.categories
+        terms = _search_terms(params)
+        if terms:
+            categories = [
+                c for c in categories
+                if all(term in f"{c['name']}\n{c['description']}".casefold() for term in terms)
+            ]
+        return self.order(categories, params.get('ordering'), ordering_fields, default_ordering)
+
+    def order(self, rows, ordering, ordering_fields, default_ordering):
+        """Sort ``rows`` like ``OrderingFilter`` would; unknown fields are ignored."""
+        requested = [field.strip() for field in (ordering or '').split(',') if field.strip()]
+        fields = [field for field in requested if field.lstrip('-') in ordering_fields]
+        rows = list(rows)
+        for field in reversed(fields or default_ordering):
+            name = field.lstrip('-')
+            rows.sort(key=lambda row: self._sort_value(row, name), reverse=field.startswith('-'))
+        return rows
+
+    def _sort_value(self, row, name):
+        if name == 'created_at':
+            return self.created_at[row['id']]
+        if name == 'base_price':
+            return self.prices[row['id']]
+        return row[name]
+
+
+def _search_terms(params):
+    # SearchFilter's splitting: whitespace and commas, every term must match.
+    return [term.casefold() for term in SEARCH_SPLIT_RE.split(params.get('search', '')) if term]
+
+
+def _search_text(service):
+    parts = [service['name'], service['description']]
+    for feature in service['features']:
+        parts.extend((feature['name'], feature['description']))
+    return '\n'.join(parts).casefold()
+
+
+def _catalog_items():
+    """Features and deliverables of every service in one ``UNION ALL`` query."""
+    features = ServiceFeature.objects.annotate(
+        kind=Value('feature'),
+        highlighted=F('is_highlighted'),
+        timeline_text=Value('', output_field=CharField()),
+    ).values_list(*ITEM_FIELDS)
+    deliverables = ServiceDeliverable.objects.annotate(
+        kind=Value('deliverable'),
+        highlighted=Value(False),
+        timeline_text=F('timeline'),
+    ).values_list(*ITEM_FIELDS)
+    return features.order_by().union(deliverables.order_by(), all=True)
+
+
+def build_catalog(version=None):
+    """Read and serialize the whole catalog with three queries."""
+    categories = list(ServiceCategory.objects.all())
+    services = list(Service.objects.all())
+    items = {service.pk: {'features': [], 'deliverables': []} for service in services}
+    for pk, service_id, name, description, order, kind, highlighted, timeline in _catalog_items():
+        if kind == 'feature':
+            item = ServiceFeature(
+                pk=pk, service_id=service_id, name=name, description=description,
+                order=order, is_highlighted=highlighted,
+            )
+        else:
+            item = ServiceDeliverable(
+                pk=pk, service_id=service_id, name=name, description=description,
+                order=order, timeline=timeline,
+            )
+        items[service_id][f'{kind}s'].append(item)
+
+    by_category = {}
+    for service in services:
+        # Same order as the models' Meta.ordering.
+        service._prefetched_objects_cache = {
+            name: sorted(related, key=lambda item: (item.order, item.name))
+            for name, related in items[service.pk].items()
+        }
+        by_category.setdefault(service.category_id, []).append(service)
+    for category in categories:
+        category._prefetched_objects_cache = {'services': by_category.get(category.pk, [])}
+
+    return Catalog(
+        version,
+        categories=ServiceCategorySerializer(categories, many=True).data,
+        services=ServiceSerializer(services, many=True).data,
+        created_at={service.pk: service.created_at for service in services},
+    )
+
+
+class CatalogCache:
+    """Per-process :class:`Catalog`, rebuilt when its version moves."""
+
+    def __init__(self):
+        self._catalog = None
+        self._loaded_at = 0.0
+        self._lock = threading.Lock()
+
+    def _is_stale(self):
+        if self._catalog is None:
+            return True
+        if time.monotonic() - self._loaded_at >= get_option('TTL'):
+            return True
+        return self._catalog.version != catalog_version.get()
+
+    def get(self):
+        if self._is_stale():
+            with self._lock:
+                if self._is_stale():
+                    self._catalog = build_catalog(catalog_version.get())
+                    self._loaded_at = time.monotonic()
+        return self._catalog
+
+    def clear(self):
+        with self._lock:
+            self._catalog = None
+            self._loaded_at = 0.0
+
+
+catalog_cache = CatalogCache()
+
+
+def get_catalog():
+    return catalog_cache.get()
@@ -0,0 +1,25 @@
+# services/signals.py
+
+"""Signal handlers invalidating the in-process service catalog."""
+
+from django.db import transaction
+from django.db.models.signals import post_delete, post_save
+from django.dispatch import receiver
+
+from .catalog import catalog_version
+from .models import Service, ServiceCategory, ServiceDeliverable, ServiceFeature
+
+
+@receiver(post_save, sender=ServiceCategory)
+@receiver(post_delete, sender=ServiceCategory)
+@receiver(post_save, sender=Service)
+@receiver(post_delete, sender=Service)
+@receiver(post_save, sender=ServiceFeature)
+@receiver(post_delete, sender=ServiceFeature)
+@receiver(post_save, sender=ServiceDeliverable)
+@receiver(post_delete, sender=ServiceDeliverable)
+def invalidate_catalog(sender, raw=False, **kwargs):
+    """Move the catalog version once a catalog write commits."""
+    if raw:
+        return
+    transaction.on_commit(catalog_version.bump)
@@ -0,0 +1,92 @@
+# services/similarity.py
+
+"""Precomputed similar services.
+
+Every pair of active services gets a score in ``[0, 1]``: a weighted sum of
+being in the same category, price closeness (``1 - |a - b| / max(a, b)``),
+package tier adjacency (``ESSENTIALS``, ``PROFESSIONAL``, ``ENTERPRISE``) and
+the Jaccard overlap of normalized feature names. The scores are computed for
+the whole catalog at once as ``N x N`` arrays, and each service keeps its
+best ``SIMILAR_COUNT`` neighbours scoring at least ``SIMILAR_MIN_SCORE``.
+
+:class:`services.catalog.Catalog` calls :func:`nearest_services` when it is
+built, so the lists are refreshed with the catalog after every write and
+``similar_services`` is served with a dictionary lookup.
+"""
+
+import numpy as np
+
+from core.prefix_index import normalize
+
+from .models import Service
+
+TIERS = {value: tier for tier, (value, _) in enumerate(Service.PACKAGE_TYPES)}
+
+
+def feature_matrix(services):
+    """Binary service x normalized feature name matrix."""
+    vocabulary = {}
+    rows = [
+        {vocabulary.setdefault(normalize(f['name']), len(vocabulary)) for f in s['features']}
+        for s in services
+    ]
+    matrix = np.zeros((len(services), len(vocabulary)), dtype=np.float64)
+    for row, columns in enumerate(rows):
+        matrix[row, list(columns)] = 1.0
+    return matrix
+
+
+def similarity_matrix(services, prices, weights):
+    """Score every pair of ``services``.
+
+    Args:
+        services (list): Serialized services
+        prices (dict): ``Decimal`` base price by service id
+        weights (dict): Weight of ``category``, ``price``, ``tier`` and
+            ``features``
+
+    Returns:
+        np.ndarray: ``N x N`` scores, with ``-inf`` on the diagonal
+    """
+    price = np.array([float(prices[s['id']]) for s in services])
+    larger = np.maximum.outer(price, price)
+    distance = np.abs(np.subtract.outer(price, price))
+    price_score = 1 - np.divide(distance, larger, out=np.zeros_like(distance), where=larger > 0)
+
+    tier = np.array([TIERS.get(s['package_type'], 0) for s in services], dtype=np.float64)
+    tier_score = 1 - np.abs(np.subtract.outer(tier, tier)) / max(len(TIERS) - 1, 1)
+
+    category = np.array([s['category'] for s in services])
+    category_score = np.equal.outer(category, category).astype(np.float64)
+
+    features = feature_matrix(services)
+    shared = features @ features.T
+    sizes = features.sum(axis=1)
+    union = np.add.outer(sizes, sizes) - shared
+    feature_score = np.divide(shared, union, out=np.zeros_like(shared), where=union > 0)
+
+    scores = (
+        weights['category'] * category_score
+        + weights['price'] * price_score
+        + weights['tier'] * tier_score
+        + weights['features'] * feature_score
+    )
+    np.fill_diagonal(scores, -np.inf)
+    return scores
+
+
+def nearest_services(services, prices, count, weights, min_score=0.0):
+    """Return ``{service_id: [serialized service, ...]}``, best match first.
+
+    Ties keep the order of ``services``.
+    """
+    if not services:
+        return {}
+    scores = similarity_matrix(services, prices, weights)
+    ranked = np.argsort(-scores, axis=1, kind='stable')[:, :count]
+    return {
+        service['id']: [
+            services[column] for column in ranked[row] if scores[row, column] >= min_score
+        ]
+        for row, service in enumerate(services)
+    }
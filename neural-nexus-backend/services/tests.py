@@ -1,3 +1,284 @@
-from django.test import TestCase
+# services/tests.py
+from decimal import Decimal
 
-# Create your tests here.
+import pytest
+from django.core.cache import cache
+from django.db import connection
+from django.test.utils import CaptureQueriesContext
+from rest_framework.test import APIClient
+
+from .catalog import build_catalog, catalog_cache, get_catalog
+from .models import Service, ServiceCategory, ServiceDeliverable, ServiceFeature
+from .similarity import nearest_services
+
+
+@pytest.fixture(autouse=True)
+def clear_catalog():
+    cache.clear()
+    catalog_cache.clear()
+    yield
+    catalog_cache.clear()
+
+
+@pytest.fixture
+def api_client():
+    return APIClient()
+
+
+@pytest.fixture
+def catalog(db):
+    strategy = ServiceCategory.objects.create(
+        name='Strategy', slug='strategy', description='Roadmaps'
+    )
+    training = ServiceCategory.objects.create(
+        name='Training', slug='training', description='Workshops'
+    )
+    services = {}
+    for category, name, package_type, price, active in (
+        (strategy, 'Data Strategy Sprint', 'ESSENTIALS', '1000', True),
+        (strategy, 'AI Roadmap', 'PROFESSIONAL', '1200', True),
+        (strategy, 'Enterprise Transformation', 'ENTERPRISE', '5000', True),
+        (training, 'AI Literacy Workshop', 'ESSENTIALS', '800', True),
+        (training, 'Retired Bootcamp', 'PROFESSIONAL', '900', False),
+    ):
+        services[name] = Service.objects.create(
+            category=category, name=name, slug=name.lower().replace(' ', '-'),
+            package_type=package_type, description=f'{name} engagement',
+            base_price=Decimal(price), duration='2 weeks', is_active=active,
+        )
+    sprint = services['Data Strategy Sprint']
+    ServiceFeature.objects.create(service=sprint, name='Maturity assessment', description='', order=2)
+    ServiceFeature.objects.create(
+        service=sprint, name='Governance review', description='Policies', order=1,
+        is_highlighted=True,
+    )
+    ServiceDeliverable.objects.create(
+        service=sprint, name='Roadmap deck', description='', timeline='Week 2', order=0
+    )
+    return services
+
+
+def names(rows):
+    return [row['name'] for row in rows]
+
+
+@pytest.mark.django_db
+class TestBuildCatalog:
+    def test_three_queries_and_serializer_shape(self, catalog, django_assert_num_queries):
+        with django_assert_num_queries(3):
+            built = build_catalog()
+
+        sprint = next(s for s in built.services if s['slug'] == 'data-strategy-sprint')
+        assert [f['name'] for f in sprint['features']] == ['Governance review', 'Maturity assessment']
+        assert sprint['features'][0]['is_highlighted'] is True
+        assert sprint['deliverables'] == [{
+            'id': ServiceDeliverable.objects.get().pk, 'name': 'Roadmap deck',
+            'description': '', 'timeline': 'Week 2', 'order': 0,
+        }]
+        assert names(built.categories) == ['Strategy', 'Training']
+        # Category payloads list inactive services too, like the serializer did.
+        assert len(built.categories_by_slug['training']['services']) == 2
+        assert 'retired-bootcamp' not in built.services_by_slug
+
+    def test_write_moves_version_after_commit(self, catalog, django_capture_on_commit_callbacks):
+        first = get_catalog()
+        assert get_catalog() is first
+
+        with django_capture_on_commit_callbacks(execute=True):
+            ServiceFeature.objects.filter(name='Governance review').get().save()
+
+        assert get_catalog() is not first
+
+
+@pytest.mark.django_db
+class TestServiceEndpoints:
+    def test_list_served_without_queries_once_warm(self, api_client, catalog):
+        api_client.get('/api/services/')
+
+        with CaptureQueriesContext(connection) as queries:
+            response = api_client.get('/api/services/')
+
+        assert response.status_code == 200
+        assert len(queries) == 0
+        assert response.data['count'] == 4
+        # Default ordering is base_price.
+        assert names(response.data['results']) == [
+            'AI Literacy Workshop', 'Data Strategy Sprint', 'AI Roadmap',
+            'Enterprise Transformation',
+        ]
+
+    @pytest.mark.parametrize('query, expected', [
+        ('category={strategy}&ordering=name',
+         ['AI Roadmap', 'Data Strategy Sprint', 'Enterprise Transformation']),
+        ('package_type=ESSENTIALS', ['AI Literacy Workshop', 'Data Strategy Sprint']),
+        ('package_type__in=PROFESSIONAL,ENTERPRISE', ['AI Roadmap', 'Enterprise Transformation']),
+        ('base_price__gte=1000&base_price__lte=1200', ['Data Strategy Sprint', 'AI Roadmap']),
+        ('search=governance', ['Data Strategy Sprint']),
+        ('search=ai workshop', ['AI Literacy Workshop']),
+        ('ordering=-base_price,name&is_active=true',
+         ['Enterprise Transformation', 'AI Roadmap', 'Data Strategy Sprint',
+          'AI Literacy Workshop']),
+        ('is_active=false', []),
+    ])
+    def test_list_filters(self, api_client, catalog, query, expected):
+        strategy = ServiceCategory.objects.get(slug='strategy')
+        response = api_client.get(f'/api/services/?{query.format(strategy=strategy.pk)}')
+
+        assert response.status_code == 200
+        assert names(response.data['results']) == expected
+
+    @pytest.mark.parametrize('query', [
+        'category=999', 'package_type=PLATINUM', 'base_price__gte=cheap', 'is_active=maybe',
+    ])
+    def test_invalid_filters(self, api_client, catalog, query):
+        assert api_client.get(f'/api/services/?{query}').status_code == 400
+
+    def test_conditional_get(self, api_client, catalog):
+        response = api_client.get('/api/services/data-strategy-sprint/')
+        assert response.status_code == 200
+        assert response.data['name'] == 'Data Strategy Sprint'
+
+        with CaptureQueriesContext(connection) as queries:
+            revalidated = api_client.get(
+                '/api/services/data-strategy-sprint/', HTTP_IF_NONE_MATCH=response['ETag']
+            )
+        assert revalidated.status_code == 304
+        assert len(queries) == 0
+
+    def test_missing_and_inactive_services_404(self, api_client, catalog):
+        assert api_client.get('/api/services/nope/').status_code == 404
+        assert api_client.get('/api/services/retired-bootcamp/').status_code == 404
+        assert api_client.get('/api/services/nope/similar_services/').status_code == 404
+
+    def test_similar_services(self, api_client, catalog):
+        response = api_client.get('/api/services/data-strategy-sprint/similar_services/')
+
+        assert response.status_code == 200
+        # Same category and close price first; inactive services never appear.
+        assert names(response.data) == [
+            'AI Roadmap', 'Enterprise Transformation', 'AI Literacy Workshop',
+        ]
+
+    def test_similar_services_use_feature_overlap(
+        self, api_client, catalog, django_capture_on_commit_callbacks
+    ):
+        with django_capture_on_commit_callbacks(execute=True):
+            ServiceFeature.objects.create(
+                service=catalog['AI Literacy Workshop'], name='Governance  Review!',
+                description='',
+            )
+        api_client.get('/api/services/data-strategy-sprint/similar_services/')
+
+        with CaptureQueriesContext(connection) as queries:
+            response = api_client.get('/api/services/data-strategy-sprint/similar_services/')
+
+        assert len(queries) == 0
+        assert names(response.data) == [
+            'AI Roadmap', 'AI Literacy Workshop', 'Enterprise Transformation',
+        ]
+
+    def test_by_category_and_metadata(self, api_client, catalog):
+        grouped = api_client.get('/api/services/by_category/').data
+        assert [group['category']['slug'] for group in grouped] == ['strategy', 'training']
+        assert names(grouped[1]['services']) == ['AI Literacy Workshop']
+
+        metadata = api_client.get('/api/services/metadata/').data
+        assert metadata['price_range'] == {
+            'min_price': Decimal('800.00'), 'max_price': Decimal('5000.00'),
+        }
+        assert metadata['package_types'] == ['ENTERPRISE', 'ESSENTIALS', 'PROFESSIONAL']
+
+
+@pytest.mark.django_db
+class TestCategoryEndpoints:
+    def test_list_search_and_ordering(self, api_client, catalog):
+        response = api_client.get('/api/services/categories/?ordering=-name')
+        assert names(response.data['results']) == ['Training', 'Strategy']
+
+        response = api_client.get('/api/services/categories/?search=workshops')
+        assert names(response.data['results']) == ['Training']
+
+    def test_retrieve_and_services(self, api_client, catalog):
+        response = api_client.get('/api/services/categories/strategy/')
+        # Model ordering: category, package_type, name.
+        assert names(response.data['services']) == [
+            'Enterprise Transformation', 'Data Strategy Sprint', 'AI Roadmap',
+        ]
+
+        response = api_client.get('/api/services/categories/training/services/')
+        assert names(response.data) == ['AI Literacy Workshop']
+        assert api_client.get('/api/services/categories/nope/services/').status_code == 404
+
+
+class TestNearestServices:
+    weights = {'category': 0.35, 'price': 0.3, 'tier': 0.15, 'features': 0.2}
+
+    def service(self, pk, category, package_type, features=()):
+        return {
+            'id': pk, 'category': category, 'package_type': package_type,
+            'features': [{'name': name} for name in features],
+        }
+
+    def test_min_score_count_and_free_services(self):
+        services = [
+            self.service(1, 1, 'ESSENTIALS', ['Audit']),
+            self.service(2, 1, 'ESSENTIALS', ['audit']),
+            self.service(3, 2, 'ENTERPRISE'),
+            self.service(4, 1, 'PROFESSIONAL'),
+        ]
+        prices = {1: Decimal('0'), 2: Decimal('0'), 3: Decimal('90000'), 4: Decimal('100')}
+
+        similar = nearest_services(services, prices, count=2, weights=self.weights, min_score=0.3)
+
+        assert [s['id'] for s in similar[1]] == [2, 4]
+        assert [s['id'] for s in similar[3]] == []
+        assert nearest_services([], {}, count=3, weights=self.weights) == {}
+
+
+@pytest.mark.django_db
+class TestFacets:
+    def counts(self, facets, name, key):
+        return {row[key]: row['count'] for row in facets[name]}
+
+    def test_counts_without_filters(self, catalog, django_assert_num_queries):
+        built = get_catalog()
+        with django_assert_num_queries(0):
+            facets = built.facets({})
+
+        assert facets['total'] == 4
+        assert self.counts(facets, 'category', 'slug') == {'strategy': 3, 'training': 1}
+        assert self.counts(facets, 'package_type', 'value') == {
+            'ESSENTIALS': 2, 'PROFESSIONAL': 1, 'ENTERPRISE': 1,
+        }
+        assert [row['count'] for row in facets['price']] == [1, 2, 1, 0, 0]
+        assert facets['price'][0]['min'] is None and facets['price'][-1]['max'] is None
+
+    def test_each_facet_ignores_its_own_filter(self, catalog):
+        strategy = ServiceCategory.objects.get(slug='strategy')
+        facets = get_catalog().facets({'category': str(strategy.pk), 'package_type': 'ESSENTIALS'})
+
+        assert facets['total'] == 1
+        # Other categories still show what picking them would give.
+        assert self.counts(facets, 'category', 'slug') == {'strategy': 1, 'training': 1}
+        assert self.counts(facets, 'package_type', 'value') == {
+            'ESSENTIALS': 1, 'PROFESSIONAL': 1, 'ENTERPRISE': 1,
+        }
+        assert [row['count'] for row in facets['price']] == [0, 1, 0, 0, 0]
+
+    def test_cached_per_signature_and_catalog(self, catalog, django_capture_on_commit_callbacks):
+        built = get_catalog()
+        facets = built.facets({'search': 'ai'})
+        assert built.facets({'search': 'ai', 'ordering': 'name'}) is facets
+        assert built.facets({'search': 'data'}) is not facets
+
+        with django_capture_on_commit_callbacks(execute=True):
+            Service.objects.filter(slug='ai-roadmap').update(is_active=False)
+            Service.objects.get(slug='enterprise-transformation').save()
+        assert get_catalog().facets({'search': 'ai'})['total'] == 1
+
+    def test_metadata_endpoint(self, api_client, catalog):
+        response = api_client.get('/api/services/metadata/?package_type=ENTERPRISE')
+        assert response.status_code == 200
+        assert response.data['facets']['total'] == 1
+
+        assert api_client.get('/api/services/metadata/?category=x').status_code == 400
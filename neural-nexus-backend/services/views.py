@@ -1,187 +1,188 @@
 # Path: neural-nexus-backend/services/views.py
 
-from django.db.models import Max, Min
-from django_filters.rest_framework import DjangoFilterBackend
-from rest_framework import filters, viewsets
+from content.autocomplete import suggest
+from core.conditional import conditional_response, set_validators
+from rest_framework import viewsets
 from rest_framework.decorators import action
+from rest_framework.exceptions import NotFound
 from rest_framework.response import Response
 
+from .catalog import get_catalog
 from .models import Service, ServiceCategory
 from .serializers import ServiceCategorySerializer, ServiceSerializer
 
 
-class ServiceViewSet(viewsets.ReadOnlyModelViewSet):
-    """ViewSet for handling service-related endpoints."""
+class CatalogResponseMixin:
+    """Builds responses from the in-process service catalog.
+
+    ETags come from the catalog version and the request, so revalidations are
+    answered without touching the database.
+    """
+
+    def catalog_response(self, build):
+        catalog = get_catalog()
+        params = self.request.query_params
+        query = sorted((key, value) for key in params for value in params.getlist(key))
+        etag = catalog.etag(type(self).__name__, self.request.path, query)
+        not_modified = conditional_response(self.request, etag)
+        if not_modified is not None:
+            return not_modified
+        return set_validators(build(catalog), etag)
+
+    def paginated(self, rows):
+        page = self.paginate_queryset(rows)
+        if page is None:
+            return Response(rows)
+        return self.get_paginated_response(page)
+
+
+class ServiceViewSet(CatalogResponseMixin, viewsets.ReadOnlyModelViewSet):
+    """ViewSet for handling service-related endpoints.
+
+    The list filters on ``category``, ``package_type`` (``exact``/``in``),
+    ``base_price`` (``gte``/``lte``) and ``is_active``, and searches service
+    names, descriptions and feature names and descriptions; see
+    :meth:`services.catalog.Catalog.filter_services`.
+    """
 
     queryset = Service.objects.filter(is_active=True)
     serializer_class = ServiceSerializer
     lookup_field = "slug"
-    filter_backends = [
-        DjangoFilterBackend,
-        filters.SearchFilter,
-        filters.OrderingFilter,
-    ]
-    filterset_fields = {
-        "category": ["exact"],
-        "package_type": ["exact", "in"],
-        "base_price": ["gte", "lte"],
-        "is_active": ["exact"],
-    }
-    search_fields = ["name", "description", "features__name", "features__description"]
     ordering_fields = ["name", "base_price", "created_at"]
     ordering = ["base_price"]
 
+    def list(self, request, *args, **kwargs):
+        return self.catalog_response(
+            lambda catalog: self.paginated(
+                catalog.filter_services(request.query_params, self.ordering_fields, self.ordering)
+            )
+        )
 
-def list(self, request, *args, **kwargs):
-    print("DEBUG: Received request in ServiceViewSet list method")
-    print(f"DEBUG: Request headers: {request.headers}")
-    try:
-        queryset = self.get_queryset()
-        print(f"DEBUG: Found {queryset.count()} active services")
-        response = super().list(request, *args, **kwargs)
-
-        # Add CORS headers
-        response["Access-Control-Allow-Origin"] = "https://nns-frontend-production.up.railway.app"
-        response["Access-Control-Allow-Methods"] = "GET, POST, OPTIONS"
-        response["Access-Control-Allow-Headers"] = "Content-Type, Authorization"
-        response["Access-Control-Allow-Credentials"] = "true"
+    def retrieve(self, request, slug=None, *args, **kwargs):
+        return self.catalog_response(lambda catalog: Response(self.get_service(catalog, slug)))
 
-        print("DEBUG: Response headers:", dict(response.headers))
-        return response
-    except Exception as e:
-        print(f"DEBUG: Error in list view: {str(e)}")
-        return Response({"error": str(e)}, status=500)
+    def get_service(self, catalog, slug):
+        service = catalog.services_by_slug.get(slug)
+        if service is None:
+            raise NotFound()
+        return service
 
     @action(detail=False, methods=["get"])
     def metadata(self, request):
-        """Provides metadata about available services for frontend filtering/display"""
-        try:
-            price_range = Service.objects.aggregate(
-                min_price=Min("base_price"), max_price=Max("base_price")
-            )
-
-            categories = ServiceCategory.objects.values("id", "name", "slug")
-            package_types = list(set(Service.objects.values_list("package_type", flat=True)))
-
-            return Response(
-                {
-                    "price_range": price_range,
-                    "categories": categories,
-                    "package_types": sorted(package_types),
-                    "example_queries": {
-                        "price_range": f'/api/services/?base_price_gte={price_range["min_price"]}&base_price_lte={price_range["max_price"]}',
-                        "search": "/api/services/?search=AI implementation",
-                        "category": "/api/services/?category=1",
-                        "package_type": "/api/services/?package_type=ENTERPRISE",
-                        "ordering": {
-                            "price_low_to_high": "/api/services/?ordering=base_price",
-                            "price_high_to_low": "/api/services/?ordering=-base_price",
-                            "name": "/api/services/?ordering=name",
-                        },
-                    },
-                }
-            )
-        except Exception as e:
-            print(f"DEBUG: Error in metadata view: {str(e)}")
-            return Response({"error": str(e)}, status=500)
+        """Provides metadata about available services for frontend filtering/display
+
+        ``facets`` counts the services matching the list filters in the query
+        string per category, package type and price bucket.
+        """
+        return self.catalog_response(lambda catalog: Response(self.describe(catalog)))
+
+    def describe(self, catalog):
+        prices = catalog.prices.values()
+        price_range = {
+            "min_price": min(prices, default=None),
+            "max_price": max(prices, default=None),
+        }
+
+        categories = [
+            {"id": category["id"], "name": category["name"], "slug": category["slug"]}
+            for category in catalog.categories
+        ]
+        package_types = list(set(service["package_type"] for service in catalog.services))
+
+        return {
+            "price_range": price_range,
+            "categories": categories,
+            "package_types": sorted(package_types),
+            "facets": catalog.facets(self.request.query_params),
+            "example_queries": {
+                "price_range": f'/api/services/?base_price_gte={price_range["min_price"]}&base_price_lte={price_range["max_price"]}',
+                "search": "/api/services/?search=AI implementation",
+                "category": "/api/services/?category=1",
+                "package_type": "/api/services/?package_type=ENTERPRISE",
+                "ordering": {
+                    "price_low_to_high": "/api/services/?ordering=base_price",
+                    "price_high_to_low": "/api/services/?ordering=-base_price",
+                    "name": "/api/services/?ordering=name",
+                },
+            },
+        }
 
     @action(detail=False, methods=["get"])
     def search_suggestions(self, request):
         """Provides search suggestions based on a query parameter"""
-        try:
-            query = request.query_params.get("q", "")
-            if len(query) < 2:
-                return Response([])
-
-            suggestions = Service.objects.filter(name__icontains=query).values_list(
-                "name", flat=True
-            )[:5]
+        query = request.query_params.get("q", "")
+        if len(query) < 2:
+            return Response([])
 
-            return Response(list(suggestions))
-        except Exception as e:
-            print(f"DEBUG: Error in search_suggestions view: {str(e)}")
-            return Response({"error": str(e)}, status=500)
+        # Served from the shared prefix index rather than a LIKE query
+        suggestions = suggest(query, limit=5, kinds={"service"})
+        return Response([suggestion.text for suggestion in suggestions])
 
     @action(detail=False, methods=["get"])
     def by_category(self, request):
         """Returns services grouped by category"""
-        try:
-            categories = ServiceCategory.objects.all()
-            response = []
-
-            for category in categories:
-                services = self.get_queryset().filter(category=category)
-                services_data = self.get_serializer(services, many=True).data
-                if services_data:  # Only include categories with active services
-                    response.append(
-                        {
-                            "category": {
-                                "id": category.id,
-                                "name": category.name,
-                                "slug": category.slug,
-                                "description": category.description,
-                            },
-                            "services": services_data,
-                        }
-                    )
-
-            return Response(response)
-        except Exception as e:
-            print(f"DEBUG: Error in by_category view: {str(e)}")
-            return Response({"error": str(e)}, status=500)
+        return self.catalog_response(lambda catalog: Response(self.group_by_category(catalog)))
+
+    def group_by_category(self, catalog):
+        response = []
+        for category in catalog.categories:
+            services_data = catalog.category_services(category["id"])
+            if services_data:  # Only include categories with active services
+                response.append(
+                    {
+                        "category": {
+                            "id": category["id"],
+                            "name": category["name"],
+                            "slug": category["slug"],
+                            "description": category["description"],
+                        },
+                        "services": services_data,
+                    }
+                )
+        return response
 
     @action(detail=True, methods=["get"])
     def similar_services(self, request, slug=None):
-        """Returns similar services based on category and price range"""
-        try:
-            service = self.get_object()
-            price_range = (service.base_price * 0.7, service.base_price * 1.3)
+        """Returns the nearest services by category, price, tier and features"""
+        return self.catalog_response(lambda catalog: Response(self.find_similar(catalog, slug)))
 
-            similar = Service.objects.filter(
-                category=service.category, base_price__range=price_range, is_active=True
-            ).exclude(id=service.id)[:3]
+    def find_similar(self, catalog, slug):
+        return catalog.similar[self.get_service(catalog, slug)["id"]]
 
-            return Response(self.get_serializer(similar, many=True).data)
-        except Exception as e:
-            print(f"DEBUG: Error in similar_services view: {str(e)}")
-            return Response({"error": str(e)}, status=500)
 
+class ServiceCategoryViewSet(CatalogResponseMixin, viewsets.ReadOnlyModelViewSet):
+    """ViewSet for handling service category endpoints.
 
-class ServiceCategoryViewSet(viewsets.ReadOnlyModelViewSet):
-    """ViewSet for handling service category endpoints."""
+    The list searches category names and descriptions.
+    """
 
     queryset = ServiceCategory.objects.all()
     serializer_class = ServiceCategorySerializer
     lookup_field = "slug"
-    filter_backends = [filters.SearchFilter, filters.OrderingFilter]
-    search_fields = ["name", "description"]
     ordering_fields = ["name"]
     ordering = ["name"]
 
     def list(self, request, *args, **kwargs):
-        print("DEBUG: Accessing ServiceCategoryViewSet list method")
-        try:
-            queryset = self.get_queryset()
-            print(f"DEBUG: Found {queryset.count()} categories")
-            response = super().list(request, *args, **kwargs)
-            response["Access-Control-Allow-Origin"] = (
-                "https://nns-frontend-production.up.railway.app"
+        return self.catalog_response(
+            lambda catalog: self.paginated(
+                catalog.filter_categories(request.query_params, self.ordering_fields, self.ordering)
             )
-            response["Access-Control-Allow-Methods"] = "GET, OPTIONS"
-            response["Access-Control-Allow-Headers"] = "Content-Type"
-            return response
-        except Exception as e:
-            print(f"DEBUG: Error in category list view: {str(e)}")
-            return Response({"error": str(e)}, status=500)
+        )
+
+    def retrieve(self, request, slug=None, *args, **kwargs):
+        return self.catalog_response(lambda catalog: Response(self.get_category(catalog, slug)))
+
+    def get_category(self, catalog, slug):
+        category = catalog.categories_by_slug.get(slug)
+        if category is None:
+            raise NotFound()
+        return category
 
     @action(detail=True, methods=["get"])
     def services(self, request, slug=None):
         """Returns all services for a specific category"""
-        try:
-            category = self.get_object()
-            services = Service.objects.filter(category=category, is_active=True)
-            serializer = ServiceSerializer(services, many=True)
-            return Response(serializer.data)
-        except Exception as e:
-            print(f"DEBUG: Error in category services view: {str(e)}")
-            return Response({"error": str(e)}, status=500)
+        return self.catalog_response(
+            lambda catalog: Response(
+                catalog.category_services(self.get_category(catalog, slug)["id"])
+            )
+        )
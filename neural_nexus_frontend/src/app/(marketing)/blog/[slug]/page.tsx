@@ -99,7 +99,7 @@ export default async function BlogPostPage({ params }: BlogPostPageProps) {
             <div
               className="prose prose-lg max-w-none prose-headings:text-gray-900 prose-a:text-primary-600"
               dangerouslySetInnerHTML={{
-                __html: formatContent(post.content),
+                __html: post.content_html || formatContent(post.content ?? ""),
               }}
             />
 
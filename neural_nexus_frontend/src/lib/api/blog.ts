@@ -7,6 +7,7 @@ import type {
   BlogListResponse,
   CategoryListResponse,
   ImageAsset,
+  TableOfContentsEntry,
 } from "@/types/blog";
 import { env } from "@/config/env";
 
@@ -23,7 +24,11 @@ interface ApiBlogPost {
     description: string;
   };
   tags: any[];
-  content: string;
+  // Detail responses only; lists carry the precomputed excerpt instead.
+  content?: string;
+  content_html?: string;
+  table_of_contents?: TableOfContentsEntry[];
+  word_count?: number;
   excerpt: string;
   featured_image: string;
   status: "DRAFT" | "PUBLISHED" | "ARCHIVED";
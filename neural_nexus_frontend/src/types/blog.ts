@@ -10,11 +10,21 @@ export interface ImageAsset {
   format?: "jpeg" | "png" | "webp" | "gif";
 }
 
+export interface TableOfContentsEntry {
+  level: number;
+  id: string;
+  title: string;
+  children: TableOfContentsEntry[];
+}
+
 export interface BlogPost {
   id: number;
   title: string;
   slug: string;
-  content: string;
+  content?: string;
+  content_html?: string;
+  table_of_contents?: TableOfContentsEntry[];
+  word_count?: number;
   excerpt: string;
   category: {
     id: number;